@@ -0,0 +1,30 @@
+import sys
+from flask import jsonify
+from utils.pdf_extraction import pdf_cache_info
+from utils.http_fetch import fetch_stats
+from utils.llm_cache import llm_cache_info
+from utils.singleflight import singleflight_info
+
+def job_profiles_info():
+    # Before the first scoring request the profile cache is empty; don't pull
+    # in scikit-learn (utils/resume_scorer.py) just to say so
+    resume_scorer = sys.modules.get('utils.resume_scorer')
+    return resume_scorer.job_profile_cache_info() if resume_scorer else {'hits': 0, 'misses': 0, 'size': 0, 'loaded': False}
+
+def embeddings_info():
+    resume_scorer = sys.modules.get('utils.resume_scorer')
+    return resume_scorer.semantic_cache_info() if resume_scorer else {'loaded': False}
+
+# Expose hit/miss counters of the in-process caches for monitoring
+def cache_stats():
+    try:
+        return jsonify({
+            'job_profiles': job_profiles_info(),
+            'embeddings': embeddings_info(),
+            'pdf_text': pdf_cache_info(),
+            'downloads': fetch_stats(),
+            'llm_responses': llm_cache_info(),
+            'coalesced_requests': singleflight_info()
+        }), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
@@ -1,5 +1,5 @@
 from flask import request, jsonify
-import pdfplumber
+from utils.pdf_document import Document
 
 def extract_text():
     try:
@@ -14,10 +14,7 @@ def extract_text():
         if not file.filename.endswith('.pdf'):
              return jsonify({'message': 'Only PDF files are allowed.'}), 400
 
-        text = ""
-        with pdfplumber.open(file) as pdf:
-            for page in pdf.pages:
-                text += page.extract_text() or ""
+        text = Document.from_file(file).text
         
         return jsonify({'text': text}), 200
 
@@ -1,21 +1,22 @@
 from flask import request, jsonify
 # from langchain_core.prompts import PromptTemplate
 from utils.vertexAIclient import get_vertex_client
-import pdfplumber
-import json
-import re
+from utils.pdf_document import Document
+from utils.event_stream import STREAM_FORMATS, stream_response, stream_llm_json
+from utils.llm_json import parse_json_object, LLMResponseError, MOCK_QUESTIONS_SCHEMA
 
 # Function to extract resume content from PDF
 def extract_resume_content(file):
-    resume_content = ""
-    with pdfplumber.open(file) as pdf:
-        for page in pdf.pages:
-            resume_content += page.extract_text()
-    return resume_content
+    return Document.from_file(file).text
 
 # Function to generate mock questions based on job description and resume
 def generate_mock_questions():
     try:
+        # Opt-in token streaming: stream=sse|ndjson form field or query parameter
+        stream_format = request.form.get('stream') or request.args.get('stream')
+        if stream_format and stream_format not in STREAM_FORMATS:
+            return jsonify({'error': f"Invalid stream format: {stream_format}"}), 400
+
         # Get the job description and role from the form data
         job_description = request.form.get('jobDescription')
         job_role = request.form.get('jobRole', 'General Role')
@@ -56,29 +57,28 @@ def generate_mock_questions():
         # Format the prompt with the job description and resume content
         prompt = prompt_template_str.format(job_description=job_description, resume_content=resume_content, job_role=job_role)
 
-        # Send the formatted prompt to Vertex AI to generate the questions
-        response_text = vertex_client.send_prompt(prompt)
+        if stream_format:
+            return stream_response(stream_llm_json(vertex_client, prompt, MOCK_QUESTIONS_SCHEMA), stream_format)
+
+        # Send the formatted prompt to Vertex AI to generate the questions (rate limited, retried)
+        response_text = vertex_client.send_prompts([prompt])[0].unwrap()
         
         # Log the raw response to inspect its structure
         # print(f"Raw Response from Vertex AI: {response_text}")
 
-        # Use regex to extract valid JSON from the response
-        json_match = re.search(r'\{.*\}', response_text.strip(), re.DOTALL)
-        
-        if not json_match:
-            raise ValueError("Valid JSON was not found in the response.")
-
-        # Extract the JSON string and parse it
-        response_json_str = json_match.group(0)
-
-        # Parse the response into a JSON object
-        response_json = json.loads(response_json_str)
+        # First JSON object of the reply, checked against the expected fields
+        response_json = parse_json_object(response_text, MOCK_QUESTIONS_SCHEMA)
         
         print("Json Formatted : ",response_json)
 
         # Return the JSON response
         return jsonify(response_json), 200
     
+    except LLMResponseError as e:
+        # The model answered, but not with the expected JSON
+        print(f"Error: {type(e).__name__}: {str(e)}")
+        return jsonify({'error': str(e), 'errorType': type(e).__name__}), 502
+
     except Exception as e:
         # Log the error for debugging purposes
         print(f"Error: {str(e)}")
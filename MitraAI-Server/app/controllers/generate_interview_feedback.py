@@ -1,8 +1,8 @@
 from flask import jsonify, request
 # from langchain_core.prompts import PromptTemplate
 from utils.vertexAIclient import get_vertex_client
-import json
-import re
+from utils.event_stream import STREAM_FORMATS, stream_response, stream_llm_json
+from utils.llm_json import parse_json_object, LLMResponseError, INTERVIEW_FEEDBACK_SCHEMA
 
 # Function to generate feedback and summary based on interview session input
 def generate_interview_feedback():
@@ -13,6 +13,11 @@ def generate_interview_feedback():
         if not data or "userName" not in data or "answers" not in data:
             return jsonify({"error": "Invalid input format. 'userName' and 'answers' fields are required."}), 400
 
+        # Opt-in token streaming: {"stream": "sse" | "ndjson"} or ?stream=...
+        stream_format = data.get("stream") or request.args.get("stream")
+        if stream_format and stream_format not in STREAM_FORMATS:
+            return jsonify({"error": f"Invalid stream format: {stream_format}"}), 400
+
         user_name = data["userName"]
         answers = data["answers"]
 
@@ -42,20 +47,22 @@ def generate_interview_feedback():
         # Build the final prompt
         prompt = prompt_template_str.format(user_name=user_name, answers_text=answers_text)
 
-        # Send the prompt to Vertex AI
-        response_text = vertex_client.send_prompt(prompt)
+        if stream_format:
+            return stream_response(stream_llm_json(vertex_client, prompt, INTERVIEW_FEEDBACK_SCHEMA), stream_format)
 
-        # Validate and extract JSON response
-        json_match = re.search(r'\{.*\}', response_text.strip(), re.DOTALL)
-        if not json_match:
-            raise ValueError("Valid JSON was not found in the response.")
+        # Send the prompt to Vertex AI (rate limited, retried)
+        response_text = vertex_client.send_prompts([prompt])[0].unwrap()
 
-        # Parse the JSON response
-        response_json = json.loads(json_match.group(0))
+        # Extract and validate the JSON response
+        response_json = parse_json_object(response_text, INTERVIEW_FEEDBACK_SCHEMA)
 
         # Return the parsed JSON as the response
         return jsonify(response_json), 200
 
+    except LLMResponseError as e:
+        # The model answered, but not with the expected JSON
+        return jsonify({"error": str(e), "errorType": type(e).__name__}), 502
+
     except Exception as e:
         # Handle and return errors
         return jsonify({"error": str(e)}), 500
\ No newline at end of file
@@ -1,23 +1,26 @@
-import requests
-import tempfile
-import pdfplumber
-import re
-import json  # For JSON parsing
+import os
+from collections import deque
 from flask import request, jsonify
 from langchain_core.prompts import PromptTemplate
 from utils.vertexAIclient import get_vertex_client
-from utils.evaluate_education import evaluate_education
-from utils.evaluate_achievements import evaluate_achievements
-from utils.evaluate_experience import evaluate_experience
-from utils.evaluate_project import evaluate_project
-from utils.evaluate_skills import evaluate_skills
+from utils.http_fetch import fetch_url
+from utils.pdf_document import Document
+from utils.resume_scorer import get_job_profile
+from utils.resume_segmenter import segment_resume
+from utils.llm_pool import submit_llm_call, LLM_MAX_IN_FLIGHT
+from utils.shortlist_pipeline import iter_extracted_resumes
+from utils.evaluate_education import evaluate_education, build_education_prompt, parse_education_response
+from utils.evaluate_achievements import evaluate_achievements, build_achievements_prompt, parse_achievements_response
+from utils.evaluate_experience import evaluate_experience, build_experience_prompt, parse_experience_response
+from utils.evaluate_project import evaluate_project, build_project_prompt, parse_project_response
+from utils.evaluate_skills import evaluate_skills, build_skills_prompt, parse_skills_response
+from utils.evaluate_combined import evaluate_combined
 
 # Function to download PDF from a URL
 def download_pdf(url):
     try:
-        response = requests.get(url, stream=True)
-        response.raise_for_status()  # Raise an error for bad status
-        return response.content
+        # Conditional GET against the cached copy, with timeout and negative cache
+        return fetch_url(url)
     except Exception as e:
         print(f"Error downloading PDF: {e}")
         return None
@@ -25,18 +28,116 @@ def download_pdf(url):
 # Function to extract resume content from PDF bytes
 def extract_resume_content_from_bytes(pdf_bytes):
     try:
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as temp_pdf:
-            temp_pdf.write(pdf_bytes)
-            temp_pdf.flush()
-            with pdfplumber.open(temp_pdf.name) as pdf:
-                resume_content = ""
-                for page in pdf.pages:
-                    resume_content += page.extract_text()
-        return resume_content.strip()
+        # Parsed in memory, once, through the shared extraction cache
+        return Document(pdf_bytes).text.strip()
     except Exception as e:
         print(f"Error extracting content from PDF: {e}")
         return ""
 
+# Criterion agents (section read, evaluator, prompt builder, response parser)
+CRITERIA = (
+    ("Skills", evaluate_skills, build_skills_prompt, parse_skills_response),
+    ("Experience", evaluate_experience, build_experience_prompt, parse_experience_response),
+    ("Projects", evaluate_project, build_project_prompt, parse_project_response),
+    ("Education", evaluate_education, build_education_prompt, parse_education_response),
+    ("Achievements", evaluate_achievements, build_achievements_prompt, parse_achievements_response),
+)
+
+# "per_criterion": one prompt per criterion agent
+# "combined": one prompt scoring all five criteria, retrying any it leaves out
+EVALUATION_MODES = ("per_criterion", "combined")
+EVALUATION_MODE = os.environ.get("MULTIAGENT_EVALUATION_MODE", "per_criterion")
+
+# Resumes whose agents are submitted but not yet collected; enough to keep the
+# LLM pool busy without queueing a whole batch behind it
+MULTIAGENT_WAVE_SIZE = int(os.environ.get("MULTIAGENT_WAVE_SIZE", str(max(1, 2 * LLM_MAX_IN_FLIGHT // len(CRITERIA)))))
+
+def criterion_error(section, error):
+    # How a failed criterion is reported next to the resume's score
+    return {"criterion": section, "errorType": type(error).__name__, "error": str(error)}
+
+# All five criteria from one prompt; missing ones are asked individually.
+# Returns ({criterion: score}, [criterion errors])
+def evaluate_criteria_combined(content, jobdescription, segments):
+    scores = evaluate_combined(content, jobdescription)
+    errors = []
+    for section, _, build, parse in CRITERIA:
+        if section not in scores:
+            print(f"Combined evaluation is missing {section}, retrying it alone")
+            try:
+                prompt = build(segments.span(section), jobdescription)
+                scores[section] = parse(get_vertex_client().send_prompts([prompt])[0].unwrap())
+            except Exception as e:
+                print(f"Error evaluating {section} ({type(e).__name__}): {e}")
+                errors.append(criterion_error(section, e))
+                scores[section] = 0
+    return scores, errors
+
+# Start the evaluation of one resume on the shared LLM pool
+def submit_resume_evaluation(content, jobdescription, segments=None, mode=None):
+    # Each agent only gets its own section (full text when it wasn't found)
+    segments = segments or segment_resume(content)
+    if (mode or EVALUATION_MODE) == "combined":
+        return [("Combined", None, submit_llm_call(evaluate_criteria_combined, content, jobdescription, segments))]
+
+    # Five prompts sent as one batch: concurrent, rate limited and retried
+    prompts = [build(segments.span(section), jobdescription) for section, _, build, _ in CRITERIA]
+    pending = get_vertex_client().submit_prompts(prompts)
+    return [(section, parse, item) for (section, _, _, parse), item in zip(CRITERIA, pending)]
+
+# Wait for a resume's agents and add up their scores; failed criteria score 0
+# and are appended to errors (when given) as criterion_error records
+def collect_resume_score(futures, errors=None):
+    failures = []
+    total_score = 0
+    for section, parse, pending in futures:
+        try:
+            if parse is None:
+                # The combined mode returns every criterion's score at once
+                scores, combined_errors = pending.result()
+                total_score += sum(scores.values())
+                failures.extend(combined_errors)
+            else:
+                total_score += parse(pending.result().unwrap())
+        except Exception as e:
+            print(f"Error evaluating {section} ({type(e).__name__}): {e}")
+            failures.append(criterion_error(section, e))
+
+    if errors is not None:
+        errors.extend(failures)
+
+    print("Total Score : ",total_score)
+    return total_score
+
+# Score one resume with all five criterion agents, run concurrently
+def evaluate_resume_content(content, jobdescription, segments=None, mode=None, errors=None):
+    return collect_resume_score(submit_resume_evaluation(content, jobdescription, segments, mode), errors)
+
+# Evaluate extracted resumes with at most wave_size of them in flight at once.
+# Yields (index, name, url, token report, score, criterion errors) in submission order
+def evaluate_in_waves(extracted, jobdescription, mode=None, wave_size=None):
+    wave_size = max(1, wave_size or MULTIAGENT_WAVE_SIZE)
+    in_flight = deque()
+
+    def collect():
+        index, name, url, report, futures = in_flight.popleft()
+        errors = []
+        return index, name, url, report, collect_resume_score(futures, errors), errors
+
+    for index, name, url, content in extracted:
+        # Split once; report how much smaller the five prompts got
+        segments = segment_resume(content)
+        report = segments.token_report()
+        print(f"{name}: evaluator prompt tokens {report['full_tokens']} -> {report['segmented_tokens']} "
+              f"({report['reduction']:.0%} saved, sections {report['sections_found']})")
+
+        if len(in_flight) >= wave_size:
+            yield collect()
+        in_flight.append((index, name, url, report, submit_resume_evaluation(content, jobdescription, segments, mode)))
+
+    while in_flight:
+        yield collect()
+
 def multiAgentEvaluation():
     try:
         # Get the Vertex AI client
@@ -47,54 +148,30 @@ def multiAgentEvaluation():
         count = data.get('count')
         resumes = data.get('resumes', [])
         jobdescription = data.get('jobdescription',[])
+        evaluation_mode = data.get('evaluationMode', EVALUATION_MODE)
 
         if not resumes or count <= 0:
             return jsonify({'error': "Invalid input: No resumes or invalid count."}), 400
+        if evaluation_mode not in EVALUATION_MODES:
+            return jsonify({'error': f"Invalid evaluationMode: {evaluation_mode}"}), 400
 
-        scored_resumes = []
-
-        for resume in resumes:
-            name = resume.get("name")
-            url = resume.get("resumeURL")  # Assuming the URL is provided
-
-            if not name or not url:
-                continue  # Skip invalid entries
-
-            # Download the resume content from the URL
-            pdf_bytes = download_pdf(url)
-
-            if not pdf_bytes:
-                continue  # Skip if the file couldn't be downloaded
-
-            # Extract resume content
-            content = extract_resume_content_from_bytes(pdf_bytes)
-
-            if not content:
-                continue  # Skip if no content could be extracted
-
-            # Calculate scores for each criterion
-            skills_score = evaluate_skills(content,jobdescription)
-            experience_score = evaluate_experience(content,jobdescription)
-            project_score = evaluate_project(content,jobdescription)
-            education_score = evaluate_education(content,jobdescription)
-            achievements_score = evaluate_achievements(content,jobdescription)
-
-            # Calculate total score (you can use the sum or average as needed)
-            total_score = (
-                skills_score +
-                experience_score +
-                project_score +
-                education_score +
-                achievements_score
-            )
-            
-            print("Total Score : ",total_score)
+        # Resolve the JD once through the shared profile cache (DEFAULT_JD if missing)
+        jobdescription = get_job_profile(jobdescription).raw_text
 
+        # Downloads and parsing overlap; each resume's five agents are submitted
+        # as soon as its text is ready, MULTIAGENT_WAVE_SIZE resumes at a time so
+        # late resumes don't wait out their LLM budget behind the whole batch
+        extracted = iter_extracted_resumes(resumes, download_pdf, extract_resume_content_from_bytes)
+        scored_resumes = []
+        evaluated = evaluate_in_waves(extracted, jobdescription, evaluation_mode)
+        for index, name, url, report, total_score, errors in sorted(evaluated, key=lambda item: item[0]):
             # Append to scored resumes
             scored_resumes.append({
                 "name": name,
                 "resumeUrl": url,
-                "score": total_score
+                "score": total_score,
+                "tokenReduction": report["reduction"],
+                "errors": errors
             })
 
         # Sort resumes by score in descending order and shortlist top `count`
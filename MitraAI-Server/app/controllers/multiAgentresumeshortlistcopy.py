@@ -1,6 +1,4 @@
 import requests
-import tempfile
-import pdfplumber
 import json
 from flask import request, jsonify
 from langchain.agents import initialize_agent, Tool
@@ -10,6 +8,7 @@ from langchain.agents import AgentType
 from langchain.memory import ConversationBufferMemory
 
 from utils.vertexAIclient import get_vertex_client
+from utils.pdf_document import Document
 from utils.evaluate_education import evaluate_education
 from utils.evaluate_achievements import evaluate_achievements
 from utils.evaluate_experience import evaluate_experience
@@ -27,14 +26,8 @@ def download_pdf(url):
 
 def extract_resume_content_from_bytes(pdf_bytes):
     try:
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as temp_pdf:
-            temp_pdf.write(pdf_bytes)
-            temp_pdf.flush()
-            with pdfplumber.open(temp_pdf.name) as pdf:
-                resume_content = ""
-                for page in pdf.pages:
-                    resume_content += page.extract_text()
-        return resume_content.strip()
+        # Parsed in memory, once, through the shared extraction cache
+        return Document(pdf_bytes).text.strip()
     except Exception as e:
         print(f"Error extracting content from PDF: {e}")
         return ""
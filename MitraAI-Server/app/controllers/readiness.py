@@ -0,0 +1,20 @@
+from flask import jsonify
+from utils.startup import is_ready, warm_up, startup_report
+
+# Load balancer / App Engine hooks; both must stay cheap to import
+
+def readiness():
+    # 503 until the scheduled warm-up (or preload) has finished
+    if not is_ready():
+        return jsonify({'ready': False}), 503
+    return jsonify({'ready': True}), 200
+
+def warmup():
+    # App Engine sends GET /_ah/warmup to a new instance before routing traffic to it
+    try:
+        warm_up()
+        report = startup_report()
+        return jsonify({'ready': is_ready(), 'rssMb': report['rss_mb'], 'modules': report['modules']}), 200
+    except Exception as e:
+        print(f"Error in warmup: {e}")
+        return jsonify({'error': str(e)}), 500
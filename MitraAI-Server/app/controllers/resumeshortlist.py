@@ -1,15 +1,31 @@
-import requests
-import tempfile
-import pdfplumber
+import os
 from flask import request, jsonify
-from utils.resume_scorer import score_resume
+from utils.pdf_document import Document
+from utils.http_fetch import fetch_url
+from utils.resume_scorer import score_resume, score_resume_batch, get_job_profile
+from utils.shortlist_pipeline import extract_resumes, iter_extracted_resumes
+from utils.resume_index import get_resume_index
+from utils.vector_store import get_resume_vectors, index_resumes
+from utils.singleflight import singleflight, content_key
+from utils.event_stream import STREAM_FORMATS, stream_response
+
+# Streaming mode: emit a running top-`count` snapshot after this many candidates
+STREAM_SNAPSHOT_EVERY = int(os.environ.get("SHORTLIST_SNAPSHOT_EVERY", "10"))
+
+# Retrieval prefilter: when > 0 only this many best index matches get full scoring
+# (non-streaming requests; streaming scores every resume as it arrives)
+RESUME_INDEX_CANDIDATES = int(os.environ.get("RESUME_INDEX_CANDIDATES", "0"))
+# How the prefilter ranks: "bm25" (inverted index) or "vector" (embedding matrix)
+RESUME_RETRIEVAL = os.environ.get("RESUME_RETRIEVAL", "bm25")
+RETRIEVAL_MODES = ("bm25", "vector")
+
+_shortlist_flight = singleflight("resumeshortlist")
 
 # Function to download PDF from a URL
 def download_pdf(url):
     try:
-        response = requests.get(url, stream=True)
-        response.raise_for_status()  # Raise an error for bad status
-        return response.content
+        # Conditional GET against the cached copy, with timeout and negative cache
+        return fetch_url(url)
     except Exception as e:
         print(f"Error downloading PDF: {e}")
         return None
@@ -17,18 +33,125 @@ def download_pdf(url):
 # Function to extract resume content from PDF bytes
 def extract_resume_content_from_bytes(pdf_bytes):
     try:
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as temp_pdf:
-            temp_pdf.write(pdf_bytes)
-            temp_pdf.flush()
-            with pdfplumber.open(temp_pdf.name) as pdf:
-                resume_content = ""
-                for page in pdf.pages:
-                    resume_content += page.extract_text()
-        return resume_content.strip()
+        # Served from the content-addressed cache when this PDF was seen before
+        return Document(pdf_bytes).text.strip()
     except Exception as e:
         print(f"Error extracting content from PDF: {e}")
         return ""
 
+def bm25_candidates(extracted, job_description, top_n):
+    index = get_resume_index()
+    for _, _, url, content in extracted:
+        index.add(url, content)
+
+    urls = {url for _, _, url, _ in extracted}
+    return {key for key, _ in index.query(job_description, top_n, keys=urls)}
+
+def vector_candidates(extracted, job_description, top_n):
+    store = get_resume_vectors()
+    if store is None:
+        # Semantic scoring is off (EMBEDDING_BACKEND=none): nothing to search with
+        return bm25_candidates(extracted, job_description, top_n)
+
+    # Only new or changed resumes are encoded, in one batch
+    index_resumes(store, [(url, content) for _, _, url, content in extracted])
+    urls = {url for _, _, url, _ in extracted}
+    return {key for key, _ in store.search(get_job_profile(job_description).embedding, top_n, keys=urls)}
+
+def prefilter_candidates(extracted, job_description, top_n, retrieval=RESUME_RETRIEVAL):
+    """
+    Keep only the top_n resumes by BM25 against the persistent resume index,
+    or by embedding similarity against the memory-mapped vector store.
+
+    Every resume is (re-)indexed under its URL first, which is a no-op when the
+    text has not changed since it was last seen. Request order is preserved.
+    """
+    if retrieval == "vector":
+        candidates = vector_candidates(extracted, job_description, top_n)
+    else:
+        candidates = bm25_candidates(extracted, job_description, top_n)
+    return [item for item in extracted if item[2] in candidates]
+
+def shortlist_score(analysis):
+    # Handle potential error if document is invalid, but for shortlisting we might just score it low
+    if "error" in analysis:
+        return 0
+    return analysis.get("final_score", 0)
+
+def top_candidates(scored, count):
+    # Highest score first, request order breaks ties (same as the stable sort below)
+    ranked = sorted(scored, key=lambda item: (-item[1]['score'], item[0]))
+    return [entry for _, entry in ranked[:count]]
+
+def stream_shortlist(resumes, count, job_description, stream_format):
+    """
+    Score resumes as soon as each one is parsed and stream the results.
+
+    Emits a "candidate" record per scored resume, a "snapshot" of the running
+    top `count` every STREAM_SNAPSHOT_EVERY candidates, and a "final" record
+    carrying the same `shortlisted` payload as the non-streaming response.
+    """
+    def records():
+        scored = []
+        try:
+            for index, name, url, content in iter_extracted_resumes(resumes, download_pdf, extract_resume_content_from_bytes):
+                entry = {
+                    "name": name,
+                    "resumeUrl": url,
+                    "score": shortlist_score(score_resume(content, job_description))
+                }
+                scored.append((index, entry))
+                yield {"type": "candidate", **entry}
+
+                if len(scored) % STREAM_SNAPSHOT_EVERY == 0:
+                    yield {
+                        "type": "snapshot",
+                        "processed": len(scored),
+                        "shortlisted": top_candidates(scored, count)
+                    }
+
+            yield {"type": "final", "shortlisted": top_candidates(scored, count)}
+        except Exception as e:
+            print(f"Error in streaming resumeshortlist: {e}")
+            yield {"type": "error", "error": str(e)}
+
+    return stream_response(records(), stream_format)
+
+def shortlist_resumes(resumes, count, job_description, candidates, retrieval=RESUME_RETRIEVAL):
+    """Download, parse and score resumes; returns the top `count` entries."""
+    scored_resumes = []
+
+    # Download and parse concurrently; results come back in request order
+    extracted = extract_resumes(resumes, download_pdf, extract_resume_content_from_bytes)
+
+    # Optional retrieval stage: full scoring only for the best BM25 or vector candidates
+    if candidates and candidates > 0:
+        extracted = prefilter_candidates(extracted, job_description, max(candidates, count), retrieval)
+
+    # Score the whole batch against the JD in one vectorized pass
+    analyses = score_resume_batch([content for _, _, _, content in extracted], job_description)
+
+    for (index, name, url, content), analysis in zip(extracted, analyses):
+        score = shortlist_score(analysis)
+
+        print(f"Scored {name}: {score}")
+
+        scored_resumes.append({
+            "name": name,
+            "resumeUrl": url,
+            "score": score
+        })
+
+    # Sort resumes by score in descending order and shortlist top `count`
+    shortlisted_resumes = sorted(scored_resumes, key=lambda x: x['score'], reverse=True)[:count]
+
+    # Print the shortlisted resumes and their scores for debugging
+    print("Shortlisted Resumes:")
+    for resume in shortlisted_resumes:
+        print(f"Name: {resume['name']}, Score: {resume['score']}")
+
+    return shortlisted_resumes
+
 def resumeshortlist():
     try:
         # Extract request data
@@ -40,51 +163,29 @@ def resumeshortlist():
         if not resumes or count <= 0:
             return jsonify({'error': "Invalid input: No resumes or invalid count."}), 400
 
-        scored_resumes = []
-
-        for resume in resumes:
-            name = resume.get("name")
-            url = resume.get("resumeURL")  # Assuming the URL is provided
-
-            if not name or not url:
-                continue  # Skip invalid entries
-
-            # Download the resume content from the URL
-            pdf_bytes = download_pdf(url)
-
-            if not pdf_bytes:
-                continue  # Skip if the file couldn't be downloaded
-
-            # Extract resume content
-            content = extract_resume_content_from_bytes(pdf_bytes)
-
-            if not content:
-                continue  # Skip if no content could be extracted
-
-            # Score the resume using the centralized scoring logic (with Embeddings)
-            analysis = score_resume(content, job_description)
-            
-            # Handle potential error if document is invalid, but for shortlisting we might just score it low
-            if "error" in analysis:
-                 score = 0
-            else:
-                 score = analysis.get("final_score", 0)
-
-            print(f"Scored {name}: {score}")
-
-            scored_resumes.append({
-                "name": name,
-                "resumeUrl": url,
-                "score": score
-            })
-
-        # Sort resumes by score in descending order and shortlist top `count`
-        shortlisted_resumes = sorted(scored_resumes, key=lambda x: x['score'], reverse=True)[:count]
-
-        # Print the shortlisted resumes and their scores for debugging
-        print("Shortlisted Resumes:")
-        for resume in shortlisted_resumes:
-            print(f"Name: {resume['name']}, Score: {resume['score']}")
+        try:
+            candidates = int(data.get('candidates', RESUME_INDEX_CANDIDATES))
+        except (TypeError, ValueError):
+            return jsonify({'error': f"Invalid candidates: {data.get('candidates')}"}), 400
+        retrieval = data.get('retrieval', RESUME_RETRIEVAL)
+        if retrieval not in RETRIEVAL_MODES:
+            return jsonify({'error': f"Invalid retrieval mode: {retrieval}"}), 400
+
+        # Opt-in streaming: {"stream": "ndjson" | "sse"} or ?stream=...
+        stream_format = data.get('stream') or request.args.get('stream')
+        if stream_format:
+            if stream_format not in STREAM_FORMATS:
+                return jsonify({'error': f"Invalid stream format: {stream_format}"}), 400
+            # The prefilter ranks the whole batch, so it can't run while streaming
+            if ('candidates' in data and candidates > 0) or 'retrieval' in data:
+                return jsonify({'error': "candidates and retrieval are not supported with stream"}), 400
+            return stream_shortlist(resumes, count, job_description, stream_format)
+
+        # Identical concurrent requests share one run (the list is read-only from here)
+        shortlisted_resumes = _shortlist_flight.do(
+            content_key(resumes, count, job_description, candidates, retrieval),
+            shortlist_resumes, resumes, count, job_description, candidates, retrieval
+        )
 
         # Return the shortlisted resumes
         return jsonify({'shortlisted': shortlisted_resumes}), 200
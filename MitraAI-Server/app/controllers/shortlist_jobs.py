@@ -0,0 +1,240 @@
+import os
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from flask import request, jsonify
+from utils.job_store import JobStore
+from utils.llm_pool import llm_call_context
+
+# main.py imports this module at startup for init_shortlist_jobs, so the
+# scoring controllers (scikit-learn, langchain) are imported where they are
+# used, keeping them off the cold start path
+
+# Background workers per gunicorn worker process
+SHORTLIST_JOB_WORKERS = int(os.environ.get("SHORTLIST_JOB_WORKERS", "2"))
+# A running job whose owner has not heartbeated for this long is taken over
+SHORTLIST_JOB_STALE_SECONDS = float(os.environ.get("SHORTLIST_JOB_STALE_SECONDS", "300"))
+
+JOB_MODES = ("ats", "multiagent")
+
+_store = JobStore()
+_app = None
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+# Jobs sitting in (or running on) this process's executor; never submitted twice
+_submitted = set()
+_submitted_lock = threading.Lock()
+
+
+def _owner():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _get_executor():
+    global _executor, _executor_pid
+    with _executor_lock:
+        if _executor is None or _executor_pid != os.getpid():
+            _executor = ThreadPoolExecutor(max_workers=max(1, SHORTLIST_JOB_WORKERS), thread_name_prefix="shortlist-job")
+            _executor_pid = os.getpid()
+        return _executor
+
+
+def init_shortlist_jobs(app):
+    """Remember the app for worker threads and pick up jobs left behind by dead workers."""
+    global _app
+    _app = app
+    # Queued jobs of a worker that died before starting them are only picked
+    # up here; while running, only a stale heartbeat marks a job as orphaned
+    resume_stale_jobs(include_queued=True)
+
+
+def submit_job(job_id):
+    """Queue a job on this process's executor unless it is already queued or running here."""
+    with _submitted_lock:
+        if job_id in _submitted:
+            return False
+        _submitted.add(job_id)
+    try:
+        _get_executor().submit(run_job, job_id)
+    except Exception:
+        with _submitted_lock:
+            _submitted.discard(job_id)
+        raise
+    return True
+
+
+def resume_stale_jobs(include_queued=False):
+    for job_id in _store.resumable(SHORTLIST_JOB_STALE_SECONDS, include_queued):
+        if submit_job(job_id):
+            print(f"Resuming shortlist job {job_id}")
+
+
+def _keep_alive(job_id, owner, stop):
+    # A single slow resume (multi-agent LLM calls) must not let the lease expire
+    while not stop.wait(SHORTLIST_JOB_STALE_SECONDS / 3):
+        if not _store.heartbeat(job_id, owner):
+            return
+
+
+def run_job(job_id):
+    try:
+        _run_job(job_id)
+    finally:
+        with _submitted_lock:
+            _submitted.discard(job_id)
+
+
+def _run_job(job_id):
+    from utils.resume_scorer import score_resume, get_job_profile
+    from utils.shortlist_pipeline import iter_extracted_resumes
+    from app.controllers.resumeshortlist import download_pdf, extract_resume_content_from_bytes, shortlist_score
+    from app.controllers.multiAgentresumeshortlist import evaluate_resume_content
+
+    owner = _owner()
+    if not _store.claim(job_id, owner, SHORTLIST_JOB_STALE_SECONDS):
+        return  # Someone else is working on it
+
+    stop = threading.Event()
+    try:
+        threading.Thread(target=_keep_alive, args=(job_id, owner, stop), name="shortlist-job-heartbeat", daemon=True).start()
+
+        # LLM calls of background jobs show up under their own cache stats
+        with _app.app_context(), llm_call_context(("shortlist_jobs", False)):
+            job = _store.get(job_id)
+            payload = job["payload"]
+            resumes = payload["resumes"]
+            jobdescription = payload.get("jobdescription", "")
+
+            # Only resumes without a checkpoint are processed
+            done = {row["index"] for row in _store.results(job_id)}
+            pending = [(index, resume) for index, resume in enumerate(resumes) if index not in done]
+
+            if job["mode"] == "multiagent":
+                jobdescription = get_job_profile(jobdescription).raw_text
+
+                def score(content):
+                    return evaluate_resume_content(content, jobdescription, mode=payload.get("evaluationMode"))
+            else:
+                def score(content):
+                    return shortlist_score(score_resume(content, jobdescription))
+
+            reported = set()
+            batch = [resume for _, resume in pending]
+            for k, name, url, content in iter_extracted_resumes(batch, download_pdf, extract_resume_content_from_bytes):
+                index = pending[k][0]
+                if not _store.record_result(job_id, owner, index, name, url, score(content), "scored"):
+                    print(f"Shortlist job {job_id} was taken over by another worker")
+                    return
+                reported.add(index)
+
+            # Invalid, undownloadable or empty resumes are checkpointed as skipped
+            for index, resume in pending:
+                if index not in reported:
+                    if not _store.record_result(
+                        job_id, owner, index, resume.get("name"), resume.get("resumeURL"), None, "skipped"
+                    ):
+                        print(f"Shortlist job {job_id} was taken over by another worker")
+                        return
+
+            _store.finish(job_id, owner, "done")
+            print(f"Shortlist job {job_id} finished")
+    except Exception as e:
+        print(f"Error in shortlist job {job_id}: {e}")
+        _store.finish(job_id, owner, "failed", str(e))
+    finally:
+        stop.set()
+
+
+def _ranked(job_id, count):
+    from app.controllers.resumeshortlist import top_candidates
+
+    scored = [
+        (row["index"], {"name": row["name"], "resumeUrl": row["url"], "score": row["score"]})
+        for row in _store.results(job_id) if row["status"] == "scored"
+    ]
+    return scored, top_candidates(scored, count)
+
+
+def create_shortlist_job():
+    from app.controllers.multiAgentresumeshortlist import EVALUATION_MODE, EVALUATION_MODES
+
+    try:
+        data = request.get_json()
+        count = data.get('count')
+        resumes = data.get('resumes', [])
+        mode = data.get('mode', 'ats')
+        evaluation_mode = data.get('evaluationMode', EVALUATION_MODE)
+
+        if not resumes or not count or count <= 0:
+            return jsonify({'error': "Invalid input: No resumes or invalid count."}), 400
+        if mode not in JOB_MODES:
+            return jsonify({'error': f"Invalid mode: {mode}"}), 400
+        if evaluation_mode not in EVALUATION_MODES:
+            return jsonify({'error': f"Invalid evaluationMode: {evaluation_mode}"}), 400
+
+        payload = {
+            'count': count,
+            'resumes': resumes,
+            'jobdescription': data.get('jobdescription', ''),
+            'evaluationMode': evaluation_mode
+        }
+        job_id = _store.create(mode, payload, len(resumes))
+        submit_job(job_id)
+
+        # Opportunistically pick up work orphaned by restarted workers
+        resume_stale_jobs()
+
+        return jsonify({
+            'jobId': job_id,
+            'status': 'queued',
+            'statusUrl': f"/api/shortlist/jobs/{job_id}",
+            'resultsUrl': f"/api/shortlist/jobs/{job_id}/results"
+        }), 202
+
+    except Exception as e:
+        print(f"Error in create_shortlist_job: {e}")
+        return jsonify({'error': str(e)}), 500
+
+
+def get_shortlist_job(job_id):
+    try:
+        job = _store.get(job_id)
+        if job is None:
+            return jsonify({'error': 'Job not found'}), 404
+
+        rows = _store.results(job_id)
+        return jsonify({
+            'jobId': job_id,
+            'mode': job['mode'],
+            'status': job['status'],
+            'total': job['total'],
+            'processed': len(rows),
+            'scored': sum(1 for row in rows if row['status'] == 'scored'),
+            'skipped': sum(1 for row in rows if row['status'] == 'skipped'),
+            'error': job['error']
+        }), 200
+
+    except Exception as e:
+        print(f"Error in get_shortlist_job: {e}")
+        return jsonify({'error': str(e)}), 500
+
+
+def get_shortlist_job_results(job_id):
+    try:
+        job = _store.get(job_id)
+        if job is None:
+            return jsonify({'error': 'Job not found'}), 404
+
+        scored, shortlisted = _ranked(job_id, job['payload']['count'])
+        return jsonify({
+            'jobId': job_id,
+            'status': job['status'],
+            'final': job['status'] == 'done',
+            'results': [entry for _, entry in scored],
+            'shortlisted': shortlisted
+        }), 200
+
+    except Exception as e:
+        print(f"Error in get_shortlist_job_results: {e}")
+        return jsonify({'error': str(e)}), 500
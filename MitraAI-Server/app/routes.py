@@ -1,12 +1,20 @@
 # routes.py
 from flask import Blueprint
 # from app.controllers.test import test_prompt
-from app.controllers.generateMockQuestions import generate_mock_questions
-from app.controllers.generate_interview_feedback import generate_interview_feedback
-from app.controllers.resumeshortlist import resumeshortlist
-# from app.controllers.multiAgentresumeshortlist import multiAgentEvaluation
-from app.controllers.analyze_resume import analyze_resume
-from app.controllers.extract_text import extract_text
+from utils.startup import lazy_view
+from app.controllers.readiness import readiness, warmup
+
+# Controllers are imported by their first request (see utils/startup.py)
+generate_mock_questions = lazy_view('app.controllers.generateMockQuestions', 'generate_mock_questions')
+generate_interview_feedback = lazy_view('app.controllers.generate_interview_feedback', 'generate_interview_feedback')
+resumeshortlist = lazy_view('app.controllers.resumeshortlist', 'resumeshortlist')
+# multiAgentEvaluation = lazy_view('app.controllers.multiAgentresumeshortlist', 'multiAgentEvaluation')
+analyze_resume = lazy_view('app.controllers.analyze_resume', 'analyze_resume')
+extract_text = lazy_view('app.controllers.extract_text', 'extract_text')
+cache_stats = lazy_view('app.controllers.cache_stats', 'cache_stats')
+create_shortlist_job = lazy_view('app.controllers.shortlist_jobs', 'create_shortlist_job')
+get_shortlist_job = lazy_view('app.controllers.shortlist_jobs', 'get_shortlist_job')
+get_shortlist_job_results = lazy_view('app.controllers.shortlist_jobs', 'get_shortlist_job_results')
 
 def initialize_routes(app):
     # Create a Blueprint for API routes
@@ -22,6 +30,14 @@ def initialize_routes(app):
     api_bp.add_url_rule('/resumeshortlist', view_func=resumeshortlist, methods=['POST'])
     api_bp.add_url_rule('/analyze_resume', view_func=analyze_resume, methods=['POST'])
     api_bp.add_url_rule('/extract_text', view_func=extract_text, methods=['POST'])
+    api_bp.add_url_rule('/cache_stats', view_func=cache_stats, methods=['GET'])
+    api_bp.add_url_rule('/shortlist/jobs', view_func=create_shortlist_job, methods=['POST'])
+    api_bp.add_url_rule('/shortlist/jobs/<job_id>', view_func=get_shortlist_job, methods=['GET'])
+    api_bp.add_url_rule('/shortlist/jobs/<job_id>/results', view_func=get_shortlist_job_results, methods=['GET'])
+    api_bp.add_url_rule('/ready', view_func=readiness, methods=['GET'])
     # Register the Blueprint with the Flask app
     app.register_blueprint(api_bp)
+
+    # App Engine warmup request (inbound_services: warmup in app.yaml)
+    app.add_url_rule('/_ah/warmup', view_func=warmup, methods=['GET'])
     
\ No newline at end of file
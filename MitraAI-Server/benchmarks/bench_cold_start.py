@@ -0,0 +1,94 @@
+"""
+Cold start: eager vs lazy controller imports.
+
+Usage (from MitraAI-Server/):
+    python -m benchmarks.bench_cold_start [--runs 3] [--warmup-delay 0]
+
+Boots the app in a fresh interpreter per run, served by werkzeug on a free
+port, and measures from process spawn to:
+  - the first byte of GET /api/cache_stats (a light endpoint), and
+  - the first response of POST /api/analyze_resume (needs scikit-learn),
+with LAZY_IMPORTS=0 (everything imported at startup, as before) and
+LAZY_IMPORTS=1, optionally with the background warm-up.
+"""
+import os
+import sys
+import json
+import time
+import socket
+import argparse
+import statistics
+import subprocess
+import urllib.request
+import urllib.error
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def serve(port):
+    from werkzeug.serving import make_server
+    import main
+    make_server("127.0.0.1", port, main.app, threaded=True).serve_forever()
+
+
+def request(port, path, payload=None):
+    data = json.dumps(payload).encode("utf-8") if payload is not None else None
+    req = urllib.request.Request(f"http://127.0.0.1:{port}{path}", data=data,
+                                 headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(req, timeout=60) as response:
+        response.read(1)
+
+
+def cold_start(env_overrides):
+    port = free_port()
+    env = dict(os.environ, PYTHONPATH=".", **env_overrides)
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, "-m", "benchmarks.bench_cold_start", "--serve", str(port)],
+                               env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        while True:
+            try:
+                request(port, "/api/cache_stats")
+                break
+            except (urllib.error.URLError, ConnectionError):
+                if process.poll() is not None:
+                    raise SystemExit("Server process exited during startup")
+                time.sleep(0.005)
+        first_byte = time.perf_counter() - start
+        request(port, "/api/analyze_resume", {"resume_text": "Experience\nEducation\nSkills python 20%",
+                                              "job_description": "python developer"})
+        first_analyze = time.perf_counter() - start
+    finally:
+        process.terminate()
+        process.wait()
+    return first_byte, first_analyze
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--warmup-delay", type=float, default=0)
+    parser.add_argument("--serve", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.serve)
+        return
+
+    modes = [
+        ("eager", {"LAZY_IMPORTS": "0"}),
+        ("lazy", {"LAZY_IMPORTS": "1"}),
+        (f"lazy+warm-up ({args.warmup_delay:g}s)", {"LAZY_IMPORTS": "1", "STARTUP_WARMUP_DELAY": str(args.warmup_delay)}),
+    ]
+    for label, overrides in modes:
+        runs = [cold_start(overrides) for _ in range(args.runs)]
+        print(f"{label:22s} first byte {statistics.median(r[0] for r in runs) * 1000:7.0f} ms   "
+              f"first analyze_resume {statistics.median(r[1] for r in runs) * 1000:7.0f} ms  (median of {args.runs})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Per-criterion vs combined multi-agent evaluation.
+
+Usage (from MitraAI-Server/):
+    python -m benchmarks.bench_evaluation_modes [--resumes 20] [--base-ms 300] [--ms-per-1k-tokens 150]
+
+Runs both evaluation modes over synthetic resumes against the configured LLM
+client (the mock client unless Vertex AI credentials are set up), with a
+simulated latency of base + per-token time per call. Reports LLM calls,
+prompt tokens, wall-clock latency and how closely the resume totals agree.
+"""
+import time
+import random
+import argparse
+import threading
+from benchmarks.synthetic_pdfs import resume_lines
+from utils.resume_segmenter import estimate_tokens
+from utils.resume_scorer import DEFAULT_JD
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--resumes", type=int, default=20)
+    parser.add_argument("--lines", type=int, default=70)
+    parser.add_argument("--base-ms", type=float, default=300)
+    parser.add_argument("--ms-per-1k-tokens", type=float, default=150)
+    args = parser.parse_args()
+
+    import main as server
+    from app.controllers.multiAgentresumeshortlist import submit_resume_evaluation, collect_resume_score
+
+    app = server.app
+    client = app.config["VERTEX_CLIENT"]
+    send_prompt = client.send_prompt
+    stats = {"calls": 0, "tokens": 0}
+    stats_lock = threading.Lock()
+
+    def timed_send_prompt(prompt):
+        tokens = estimate_tokens(prompt)
+        with stats_lock:
+            stats["calls"] += 1
+            stats["tokens"] += tokens
+        time.sleep((args.base_ms + args.ms_per_1k_tokens * tokens / 1000) / 1000)
+        return send_prompt(prompt)
+
+    client.send_prompt = timed_send_prompt
+
+    rng = random.Random(0)
+    resumes = ["Candidate\ncandidate@example.com\n" + "\n".join(resume_lines(rng, args.lines)) for _ in range(args.resumes)]
+
+    totals = {}
+    with app.app_context():
+        for mode in ("per_criterion", "combined"):
+            stats.update(calls=0, tokens=0)
+            start = time.perf_counter()
+            pending = [submit_resume_evaluation(text, DEFAULT_JD, mode=mode) for text in resumes]
+            totals[mode] = [collect_resume_score(futures) for futures in pending]
+            elapsed = time.perf_counter() - start
+            print(
+                f"{mode:14s} {stats['calls']:4d} calls  {stats['tokens']:8d} prompt tokens  "
+                f"{elapsed:6.2f} s  ({stats['tokens'] / len(resumes):7.0f} tokens/resume)"
+            )
+
+    diffs = [abs(a - b) for a, b in zip(totals["per_criterion"], totals["combined"])]
+    print(
+        f"score agreement: identical {sum(d == 0 for d in diffs)}/{len(diffs)}, "
+        f"mean |diff| {sum(diffs) / len(diffs):.1f}, max |diff| {max(diffs)} (out of 500)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Shared JSON reply parser vs the per-controller regex extraction.
+
+Usage (from MitraAI-Server/):
+    python -m benchmarks.bench_llm_json [--kb 4 64 1024] [--repeat 20] [--chunk 16]
+
+For model replies of increasing size, times:
+  - whole reply: re.search(r'\\{.*\\}', DOTALL) + json.loads against
+    parse_json_object on a clean fenced reply;
+  - streamed reply in chunks: re-running the regex on the accumulated text
+    after every chunk (the only way to notice completion without a scanner)
+    against JSONObjectScanner.feed;
+and checks both on a messy reply (braces in the prose around the object and
+a second object after it), where the regex captures the wrong span.
+"""
+import re
+import json
+import time
+import random
+import argparse
+from utils.llm_json import parse_json_object, JSONObjectScanner
+
+
+def regex_parse(text):
+    match = re.search(r'\{.*\}', text.strip(), re.DOTALL)
+    if not match:
+        raise ValueError("Valid JSON was not found in the response.")
+    return json.loads(match.group(0))
+
+
+def make_replies(rng, kb):
+    words = ["candidate", "python", "led", "team", "\"quoted\"", "scaled", "99%", "api", "{x}"]
+    size = kb * 1024
+    obj = {
+        "technical_questions": [" ".join(rng.choice(words) for _ in range(size // 32)) for _ in range(2)],
+        "behavioral_questions": ["Tell me about {a time} you failed."],
+    }
+    fenced = f"```json\n{json.dumps(obj, indent=2)}\n```\n"
+    prose = " ".join(rng.choice(words) for _ in range(size // 64))
+    messy = f"Here you go {{as requested}}:\n{fenced}Alternative: {{\"technical_questions\": []}}\n{prose}"
+    return fenced, messy, obj
+
+
+def timed(function, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat
+
+
+def regex_streamed(text, chunk):
+    buffer = ""
+    for pos in range(0, len(text), chunk):
+        buffer += text[pos:pos + chunk]
+        try:
+            regex_parse(buffer)
+        except ValueError:
+            pass
+
+
+def scanner_streamed(text, chunk):
+    scanner = JSONObjectScanner()
+    for pos in range(0, len(text), chunk):
+        scanner.feed(text[pos:pos + chunk])
+    return scanner.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--kb", type=int, nargs="+", default=[4, 64, 1024])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--chunk", type=int, default=16)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    for kb in args.kb:
+        clean, messy, expected = make_replies(rng, kb)
+        if regex_parse(clean) != expected or parse_json_object(clean) != expected:
+            raise SystemExit(f"Parser mismatch on the {kb} KB reply")
+
+        regex_time = timed(lambda: regex_parse(clean), args.repeat)
+        scan_time = timed(lambda: parse_json_object(clean), args.repeat)
+        print(f"{kb:5d} KB whole   regex+loads {regex_time * 1000:8.2f} ms   scanner {scan_time * 1000:8.2f} ms")
+
+        # The regex rescans are quadratic in the number of chunks
+        stream_repeat = max(1, args.repeat // 10)
+        regex_stream = timed(lambda: regex_streamed(clean, args.chunk), stream_repeat) if kb <= 256 else None
+        scan_stream = timed(lambda: scanner_streamed(clean, args.chunk), stream_repeat)
+        regex_label = f"{regex_stream * 1000:8.1f} ms" if regex_stream is not None else "skipped (quadratic)"
+        print(f"{kb:5d} KB stream  regex rescans {regex_label}   scanner {scan_stream * 1000:8.1f} ms "
+              f"({len(clean) // args.chunk} chunks)")
+
+        try:
+            regex_messy = "ok" if regex_parse(messy) == expected else "wrong object"
+        except ValueError as e:
+            regex_messy = f"fails ({type(e).__name__})"
+        scan_messy = "ok" if parse_json_object(messy) == expected and scanner_streamed(messy, args.chunk) == expected else "wrong"
+        print(f"{kb:5d} KB messy  regex+loads {regex_messy}   scanner {scan_messy}")
+
+if __name__ == "__main__":
+    main()
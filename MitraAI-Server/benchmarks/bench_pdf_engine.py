@@ -0,0 +1,62 @@
+"""
+Throughput of the process-pool PDF engine on a synthetic corpus.
+
+Usage (from MitraAI-Server/):
+    python -m benchmarks.bench_pdf_engine [--docs 48] [--pages 3] [--long-pages 40]
+
+Reports documents per second for the in-process parser and for the pool at
+1..cpu_count workers, plus the latency of a single long PDF parsed as
+parallel page ranges.
+"""
+import os
+import time
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from benchmarks.synthetic_pdfs import make_corpus, make_pdf
+from utils import pdf_engine
+
+
+def run_corpus(corpus, workers):
+    pdf_engine.shutdown_pool()
+    pdf_engine.PDF_WORKERS = workers
+    pdf_engine.parse_document(corpus[0])  # Warm the pool up outside the timing
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, workers) * 2) as dispatch:
+        list(dispatch.map(pdf_engine.parse_document, corpus))
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--docs", type=int, default=48)
+    parser.add_argument("--pages", type=int, default=3)
+    parser.add_argument("--long-pages", type=int, default=40)
+    args = parser.parse_args()
+
+    corpus = make_corpus(args.docs, max_pages=args.pages)
+    cpus = os.cpu_count() or 1
+    print(f"{args.docs} synthetic resumes, up to {args.pages} pages, {cpus} CPUs")
+
+    baseline = run_corpus(corpus, 0)
+    print(f"in-process      {args.docs / baseline:7.1f} docs/s")
+
+    worker_counts = sorted({1, 2, 4, cpus} & set(range(1, cpus + 1)))
+    for workers in worker_counts:
+        elapsed = run_corpus(corpus, workers)
+        print(f"{workers:2d} workers      {args.docs / elapsed:7.1f} docs/s  ({baseline / elapsed:4.2f}x)")
+
+    long_pdf = make_pdf(pages=args.long_pages, seed=99)
+    for workers in (0, cpus):
+        pdf_engine.shutdown_pool()
+        pdf_engine.PDF_WORKERS = workers
+        start = time.perf_counter()
+        result = pdf_engine.parse_document(long_pdf, max_pages=args.long_pages)
+        elapsed = time.perf_counter() - start
+        print(f"{args.long_pages}-page PDF, {workers} workers: {elapsed * 1000:7.1f} ms ({len(result['text'])} chars)")
+
+    pdf_engine.shutdown_pool()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+BM25 resume index: MaxScore-pruned queries against a full postings scan.
+
+Usage (from MitraAI-Server/):
+    python -m benchmarks.bench_resume_index [--docs 1000 4000 16000] [--top 20] [--queries 20]
+
+For pools of synthetic resumes (300 words drawn from a 20000-word vocabulary,
+3% of them from five common skill words that nearly every resume has), in a
+temporary directory, times:
+  - indexing the pool one resume at a time (ResumeIndex.add);
+  - top-N retrieval for a mixed rare/common JD and for a JD of common terms
+    only, against scoring every posting of the JD's terms;
+and checks that both return the same top-N scores. Also reports the index
+size on disk per resume.
+"""
+import os
+import math
+import time
+import heapq
+import random
+import shutil
+import argparse
+import tempfile
+from utils.resume_index import ResumeIndex, BM25_K1, BM25_B
+from utils.resume_scorer import get_job_profile
+
+VOCAB = [f"w{i}" for i in range(20000)]
+COMMON = "python java react aws docker".split()
+QUERIES = {
+    "mixed": "kubernetes python golang w17",
+    "common": "python java react",
+}
+
+
+def make_resume(rng):
+    return " ".join(rng.choice(COMMON) if rng.random() < 0.03 else rng.choice(VOCAB) for _ in range(300))
+
+
+def full_scan(index, job_text, top_n):
+    # Every posting of every query term, no pruning
+    conn = index._connect()
+    stats = dict(conn.execute("SELECT name, value FROM stats").fetchall())
+    doc_count, avg_length = stats["doc_count"], stats["total_length"] / stats["doc_count"]
+    scores = {}
+    for term, query_tf in get_job_profile(job_text).term_counts.items():
+        row = conn.execute("SELECT df FROM terms WHERE term = ?", (term,)).fetchone()
+        if row is None:
+            continue
+        idf = math.log(1 + (doc_count - row[0] + 0.5) / (row[0] + 0.5))
+        for doc_id, tf, length in conn.execute(
+            "SELECT p.doc_id, p.tf, d.length FROM postings p JOIN docs d ON d.doc_id = p.doc_id WHERE p.term = ?",
+            (term,),
+        ):
+            weight = tf * (BM25_K1 + 1) / (tf + BM25_K1 * (1 - BM25_B + BM25_B * length / avg_length))
+            scores[doc_id] = scores.get(doc_id, 0.0) + query_tf * idf * weight
+    return heapq.nlargest(top_n, scores.values())
+
+
+def timed(function, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = function()
+    return (time.perf_counter() - start) / repeat, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--docs", type=int, nargs="+", default=[1000, 4000, 16000])
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--queries", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+
+    for docs in args.docs:
+        directory = tempfile.mkdtemp(prefix="resume_index_")
+        try:
+            path = os.path.join(directory, "index.sqlite3")
+            index = ResumeIndex(path, max_docs=docs)
+            start = time.perf_counter()
+            for i in range(docs):
+                index.add(f"https://example.com/resume/{i}.pdf", make_resume(rng))
+            index_time = time.perf_counter() - start
+            index._connect().execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            size = sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+
+            timings = []
+            for name, job_text in QUERIES.items():
+                query_time, found = timed(lambda: index.query(job_text, args.top), args.queries)
+                scan_time, expected = timed(lambda: full_scan(index, job_text, args.top), args.queries)
+                if any(abs(a - b) > 1e-9 for a, b in zip([score for _, score in found], expected)):
+                    raise SystemExit(f"Top-{args.top} mismatch for the {name} query on {docs} resumes")
+                timings.append(f"{name} {query_time * 1000:6.1f} ms (scan {scan_time * 1000:6.1f} ms)")
+
+            print(f"{docs:6d} resumes  index {index_time:6.1f} s  {size / docs / 1024:5.1f} KB/resume  " + "  ".join(timings))
+        finally:
+            shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
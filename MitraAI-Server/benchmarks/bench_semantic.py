@@ -0,0 +1,72 @@
+"""
+Semantic similarity step vs the TF-IDF step of resume scoring.
+
+Usage (from MitraAI-Server/):
+    python -m benchmarks.bench_semantic [--resumes 20 200] [--lines 60] [--repeat 5]
+
+For a pool of synthetic resumes, times per resume:
+  - tfidf_similarities over the pool;
+  - semantic_similarities with a cold embedding cache (every resume encoded,
+    in one batch) and a warm one (every resume a text-hash hit);
+and checks that score_resume and score_resume_batch agree on every resume,
+semantic_match included.
+"""
+import time
+import random
+import argparse
+from benchmarks.synthetic_pdfs import resume_lines
+from utils import resume_scorer
+from utils.resume_scorer import (clean_text, get_job_profile, tfidf_similarities, semantic_similarities,
+                                 score_resume, score_resume_batch)
+from utils.embeddings import EmbeddingCache
+
+
+def timed(function, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--resumes", type=int, nargs="+", default=[20, 200])
+    parser.add_argument("--lines", type=int, default=60)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    if not resume_scorer.HAS_EMBEDDINGS:
+        raise SystemExit("Semantic scoring is disabled (EMBEDDING_BACKEND)")
+    backend = resume_scorer.semantic_backend
+    print(f"backend {backend.name}")
+
+    rng = random.Random(0)
+    profile = get_job_profile(None)
+    for count in args.resumes:
+        raw = ["\n".join(resume_lines(rng, args.lines)) + "\nemail phone work history" for _ in range(count)]
+        cleaned = [clean_text(text) for text in raw]
+
+        single = [score_resume(text) for text in raw]
+        if single != score_resume_batch(raw):
+            raise SystemExit(f"score_resume and score_resume_batch disagree on the {count}-resume pool")
+
+        tfidf = timed(lambda: tfidf_similarities(cleaned, profile), args.repeat)
+
+        def cold():
+            # A fresh cache every run: everything is encoded
+            resume_scorer.semantic_encoder = EmbeddingCache(backend)
+            semantic_similarities(cleaned, profile)
+
+        semantic_cold = timed(cold, args.repeat)
+        semantic_warm = timed(lambda: semantic_similarities(cleaned, profile), args.repeat)
+
+        scores = sorted(result["breakdown"]["semantic_match"] for result in single)
+        print(
+            f"{count:5d} resumes  per resume: tfidf {tfidf / count * 1000:6.3f} ms  "
+            f"semantic cold {semantic_cold / count * 1000:6.3f} ms  warm {semantic_warm / count * 1000:6.3f} ms  "
+            f"(semantic_match min/median/max {scores[0]}/{scores[len(scores) // 2]}/{scores[-1]})"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Fused single-pass text analyzer vs the per-keyword heuristics.
+
+Usage (from MitraAI-Server/):
+    python -m benchmarks.bench_text_analyzer [--lines 60 600 3000] [--repeat 50]
+
+For resumes of increasing length, times is_valid_resume + analyze_structure +
+analyze_impact (one substring scan per keyword plus METRICS_REGEX) against
+analyze_text, and checks that both produce identical results.
+"""
+import time
+import random
+import argparse
+from benchmarks.synthetic_pdfs import resume_lines
+from utils.resume_scorer import clean_text, is_valid_resume, analyze_structure, analyze_impact, analyze_text
+
+
+def per_keyword(text):
+    return (is_valid_resume(text),) + analyze_structure(text) + (analyze_impact(text),)
+
+
+def timed(function, text, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function(text)
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lines", type=int, nargs="+", default=[60, 600, 3000])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    for lines in args.lines:
+        text = clean_text("\n".join(resume_lines(rng, lines)) + "\nemail phone work history")
+        if per_keyword(text) != analyze_text(text):
+            raise SystemExit(f"Mismatch on a {lines}-line resume")
+
+        baseline = timed(per_keyword, text, args.repeat)
+        fused = timed(analyze_text, text, args.repeat)
+        print(
+            f"{lines:5d} lines ({len(text):7d} chars)  per-keyword {baseline * 1000:7.3f} ms  "
+            f"fused {fused * 1000:7.3f} ms  ({baseline / fused:4.2f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
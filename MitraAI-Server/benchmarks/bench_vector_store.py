@@ -0,0 +1,86 @@
+"""
+Memory-mapped vector store: append and top-k search at applicant-pool scale.
+
+Usage (from MitraAI-Server/):
+    python -m benchmarks.bench_vector_store [--rows 10000 100000] [--dim 512] [--queries 20]
+
+For pools of random unit vectors (the store does not care where they came
+from), in a temporary directory, times:
+  - appending the pool in chunks of 1000 rows (the file is only extended);
+  - opening the store in a fresh object (reads the id sidecar, maps the matrix);
+  - top-10 search over the whole pool, and restricted to 1000 keys, against
+    a per-row Python loop of dot products plus a full sort;
+and checks that the search returns the same keys as the brute-force ranking.
+"""
+import time
+import shutil
+import argparse
+import tempfile
+import numpy as np
+from utils.vector_store import VectorStore
+
+
+def timed(function, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = function()
+    return (time.perf_counter() - start) / repeat, result
+
+
+def per_row_loop(matrix, keys, query, k, subset=None):
+    scores = []
+    for row in (subset if subset is not None else range(len(keys))):
+        scores.append((float(np.dot(matrix[row], query)), keys[row]))
+    scores.sort(reverse=True)
+    return [key for _, key in scores[:k]]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--dim", type=int, default=512)
+    parser.add_argument("--queries", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    for rows in args.rows:
+        directory = tempfile.mkdtemp(prefix="vector_store_")
+        try:
+            vectors = rng.standard_normal((rows, args.dim), dtype=np.float32)
+            vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+            keys = [f"https://example.com/resume/{i}.pdf" for i in range(rows)]
+            hashes = [f"{i:064x}" for i in range(rows)]
+
+            store = VectorStore(directory, args.dim)
+            start = time.perf_counter()
+            for pos in range(0, rows, 1000):
+                store.append(keys[pos:pos + 1000], hashes[pos:pos + 1000], vectors[pos:pos + 1000])
+            append_time = time.perf_counter() - start
+
+            open_time, reopened = timed(lambda: VectorStore(directory, args.dim), 1)
+            start = time.perf_counter()
+            reopened.refresh()
+            open_time += time.perf_counter() - start
+
+            query = vectors[rng.integers(rows)] + 0.5 * rng.standard_normal(args.dim, dtype=np.float32)
+            query /= np.linalg.norm(query)
+            subset_rows = sorted(rng.choice(rows, 1000, replace=False))
+            subset_keys = [keys[i] for i in subset_rows]
+
+            search_time, found = timed(lambda: reopened.search(query, 10), args.queries)
+            subset_time, found_subset = timed(lambda: reopened.search(query, 10, keys=subset_keys), args.queries)
+            loop_time, expected = timed(lambda: per_row_loop(vectors, keys, query, 10), 1)
+            _, expected_subset = timed(lambda: per_row_loop(vectors, keys, query, 10, subset_rows), 1)
+            if [key for key, _ in found] != expected or [key for key, _ in found_subset] != expected_subset:
+                raise SystemExit(f"Top-k mismatch on the {rows}-row pool")
+
+            size_mb = rows * args.dim * 4 / (1024 * 1024)
+            print(f"{rows:7d} rows ({size_mb:5.0f} MB)  append {append_time * 1000:7.1f} ms  open {open_time * 1000:6.1f} ms  "
+                  f"top-10 {search_time * 1000:6.2f} ms  (1000 keys {subset_time * 1000:5.2f} ms)  "
+                  f"per-row loop {loop_time * 1000:7.1f} ms")
+        finally:
+            shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
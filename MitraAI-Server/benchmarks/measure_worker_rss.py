@@ -0,0 +1,127 @@
+"""
+Per-worker memory with and without preload-and-fork.
+
+Usage (from MitraAI-Server/, gunicorn from requirements.txt installed):
+    python -m benchmarks.measure_worker_rss [--workers 4] [--requests 40]
+
+Starts gunicorn twice on a free port:
+  - per-worker: every worker imports the controllers and builds the scoring
+    state itself (STARTUP_WARMUP_DELAY=0, so both runs end up fully loaded);
+  - preload: GUNICORN_PRELOAD=1, state built once in the master.
+Waits for /api/ready, sends some analyze_resume traffic, lets memory settle
+and reads /proc/<pid>/smaps_rollup of the master and every worker. RSS counts
+shared pages in every process; PSS splits them between the sharers, so the
+PSS total is what the instance really uses.
+"""
+import os
+import sys
+import json
+import time
+import socket
+import argparse
+import subprocess
+import urllib.request
+import urllib.error
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def memory(pid):
+    """RSS, PSS and private memory of a process in MB."""
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as rollup:
+        for line in rollup:
+            parts = line.split()
+            if len(parts) >= 3 and parts[1].isdigit():
+                fields[parts[0].rstrip(":")] = int(parts[1]) / 1024
+    private = fields.get("Private_Clean", 0) + fields.get("Private_Dirty", 0)
+    return {"rss": fields.get("Rss", 0), "pss": fields.get("Pss", 0), "private": private}
+
+
+def children(pid):
+    with open(f"/proc/{pid}/task/{pid}/children") as handle:
+        return [int(child) for child in handle.read().split()]
+
+
+def get(port, path, payload=None):
+    data = json.dumps(payload).encode("utf-8") if payload is not None else None
+    req = urllib.request.Request(f"http://127.0.0.1:{port}{path}", data=data,
+                                 headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(req, timeout=60) as response:
+        return response.status
+
+
+def wait_ready(port, process, timeout=120):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise SystemExit("gunicorn exited during startup")
+        try:
+            if get(port, "/api/ready") == 200:
+                return
+        except (urllib.error.URLError, ConnectionError):
+            pass
+        time.sleep(0.1)
+    raise SystemExit("Timed out waiting for /api/ready")
+
+
+def settle(pids, seconds=1.0, timeout=60):
+    # Workers warming up in the background keep growing; wait until they stop
+    deadline = time.time() + timeout
+    previous = None
+    while time.time() < deadline:
+        current = [round(memory(pid)["rss"]) for pid in pids]
+        if current == previous:
+            return
+        previous = current
+        time.sleep(seconds)
+
+
+def measure(label, env_overrides, args):
+    port = free_port()
+    env = dict(os.environ, PYTHONPATH=".", **env_overrides)
+    command = [sys.executable, "-m", "gunicorn", "-b", f"127.0.0.1:{port}", "-w", str(args.workers),
+               "--threads", "2", "main:app"]
+    process = subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_ready(port, process)
+        while len(children(process.pid)) < args.workers:
+            time.sleep(0.1)
+        workers = children(process.pid)
+        settle(workers)
+
+        payload = {"resume_text": "Experience\nEducation\nSkills\nPython, SQL, AWS; cut latency 30%",
+                   "job_description": ""}
+        for _ in range(args.requests):
+            get(port, "/api/analyze_resume", payload)
+        settle(workers)
+
+        master = memory(process.pid)
+        stats = [memory(pid) for pid in workers]
+    finally:
+        process.terminate()
+        process.wait()
+
+    avg = {key: sum(s[key] for s in stats) / len(stats) for key in ("rss", "pss", "private")}
+    total_pss = master["pss"] + sum(s["pss"] for s in stats)
+    print(f"{label:11s} master RSS {master['rss']:6.0f} MB | per worker RSS {avg['rss']:6.0f}  "
+          f"PSS {avg['pss']:6.0f}  private {avg['private']:6.0f} MB | total PSS {total_pss:6.0f} MB "
+          f"({args.workers} workers)")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=40)
+    args = parser.parse_args()
+
+    measure("per-worker", {"GUNICORN_PRELOAD": "0", "STARTUP_WARMUP_DELAY": "0"}, args)
+    measure("preload", {"GUNICORN_PRELOAD": "1"}, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+import random
+
+# Minimal PDF writer for benchmark corpora: Helvetica text lines plus an
+# optional link annotation, no third-party dependencies.
+
+WORDS = (
+    "python java javascript react node sql aws azure docker kubernetes git agile scrum "
+    "developed designed built led improved reduced increased migrated api rest graphql "
+    "microservices pipeline analytics dashboard team customers users latency revenue"
+).split()
+
+HEADINGS = ["SUMMARY", "EXPERIENCE", "EDUCATION", "SKILLS", "PROJECTS", "ACHIEVEMENTS"]
+
+
+def _escape(text):
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def _page_stream(lines):
+    ops = ["BT", "/F1 10 Tf", "12 TL", "50 760 Td"]
+    for line in lines:
+        ops.append(f"({_escape(line)}) Tj T*")
+    ops.append("ET")
+    return "\n".join(ops).encode("latin-1")
+
+
+def resume_lines(rng, lines_per_page):
+    lines = []
+    while len(lines) < lines_per_page:
+        lines.append(rng.choice(HEADINGS))
+        for _ in range(rng.randint(3, 8)):
+            line = " ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 14)))
+            if rng.random() < 0.3:
+                line += f" increased by {rng.randint(5, 90)}%"
+            lines.append(line)
+    return lines[:lines_per_page]
+
+
+def make_pdf(pages=1, seed=0, lines_per_page=55, link=None) -> bytes:
+    """Build a resume-like PDF with the given number of pages."""
+    rng = random.Random(seed)
+    objects = []
+
+    def add(body: bytes) -> int:
+        objects.append(body)
+        return len(objects)
+
+    catalog = add(b"")  # placeholders, filled in once the page ids are known
+    pages_id = add(b"")
+    font = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    page_ids = []
+    for number in range(pages):
+        stream = _page_stream(resume_lines(rng, lines_per_page))
+        content = add(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        annots = b""
+        if link and number == 0:
+            annot = add(
+                b"<< /Type /Annot /Subtype /Link /Rect [50 740 200 752] /Border [0 0 0]"
+                b" /A << /S /URI /URI (" + link.encode("latin-1") + b") >> >>"
+            )
+            annots = b" /Annots [%d 0 R]" % annot
+        page_ids.append(add(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 612 792] /Contents %d 0 R"
+            b" /Resources << /Font << /F1 %d 0 R >> >>%s >>" % (pages_id, content, font, annots)
+        ))
+
+    objects[catalog - 1] = b"<< /Type /Catalog /Pages %d 0 R >>" % pages_id
+    kids = b" ".join(b"%d 0 R" % page_id for page_id in page_ids)
+    objects[pages_id - 1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, len(page_ids))
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, catalog, xref)
+    return bytes(out)
+
+
+def make_corpus(count, max_pages=3, seed=0):
+    rng = random.Random(seed)
+    return [
+        make_pdf(pages=rng.randint(1, max_pages), seed=seed + i, link=f"https://linkedin.com/in/candidate{i}")
+        for i in range(count)
+    ]
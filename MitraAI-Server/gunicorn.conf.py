@@ -0,0 +1,21 @@
+# gunicorn settings; values given on the command line (app.yaml entrypoint) win.
+#
+# Preload-and-fork: GUNICORN_PRELOAD=1 imports main in the master, which then
+# builds the read-only scoring state once (see utils/startup.py) and forks the
+# workers, which share it copy-on-write. Threads, process pools and SQLite
+# connections are only created in the workers, from post_fork.
+#
+# Use GUNICORN_PRELOAD=1 rather than a bare --preload: the app has to know
+# before it is imported, and the config file is the only place that runs
+# early enough.
+import os
+
+preload_app = os.environ.get("GUNICORN_PRELOAD", "0") in ("1", "true", "True")
+if preload_app:
+    os.environ["PRELOAD_SHARED_STATE"] = "1"
+
+
+def post_fork(server, worker):
+    if os.environ.get("PRELOAD_SHARED_STATE") == "1":
+        import main
+        main.init_worker(main.app)
@@ -1,21 +1,54 @@
 import logging
-from flask import Flask
-from flask_cors import CORS
-from app.routes import initialize_routes
-from utils.vertexAIclient import start_vertex
+from utils.startup import (
+    profile_phase, startup_report, start_warmup, preload_shared_state, STARTUP_PROFILE, PRELOAD_SHARED_STATE
+)
+
+# STARTUP_PROFILE=1 prints what each phase of the cold start costs
+with profile_phase("import flask"):
+    from flask import Flask
+    from flask_cors import CORS
+with profile_phase("import routes and clients"):
+    from app.routes import initialize_routes
+    from app.controllers.shortlist_jobs import init_shortlist_jobs
+    from utils.vertexAIclient import start_vertex
 
 def create_app():
     app = Flask(__name__)
     CORS(app, resources={r"/api/*": {"origins": "*", "allow_headers": "*", "methods": ["GET", "POST", "OPTIONS"]}}, supports_credentials=True)
 
     # Initialize Vertex AI client before routes are initialized
-    start_vertex(app)
+    with profile_phase("start_vertex"):
+        start_vertex(app)
+
+    with profile_phase("initialize_routes"):
+        initialize_routes(app)
+
+    if PRELOAD_SHARED_STATE:
+        # Running in the gunicorn master: build what the workers can share and
+        # leave threads, pools and SQLite connections to init_worker after fork
+        preload_shared_state()
+    else:
+        init_worker(app)
 
-    initialize_routes(app)
+    if STARTUP_PROFILE:
+        report = startup_report()
+        print(f"[startup] app created: process age {report['process_age_s']} s, "
+              f"{report['rss_mb']} MB RSS, {report['modules']} modules loaded")
     
     return app
 
 
+def init_worker(app):
+    """Per-process start-up: called from create_app, or from gunicorn's post_fork under preload."""
+    # Background shortlist workers (also resumes jobs orphaned by a restart)
+    with profile_phase("init_shortlist_jobs"):
+        init_shortlist_jobs(app)
+
+    # Optional: import the lazy controllers in the background once we are up
+    if not PRELOAD_SHARED_STATE:
+        start_warmup()
+
+
 def initialize_logger(app):
     """Setup logging for debugging purposes."""
     # Create a logger
@@ -0,0 +1,24 @@
+from utils import evaluate_combined as combined
+from utils.llm_dispatch import BatchPromptMixin
+
+
+class CountingClient(BatchPromptMixin):
+    def __init__(self, reply):
+        self.reply = reply
+        self.prompts = []
+
+    def send_prompt(self, prompt):
+        self.prompts.append(prompt)
+        return self.reply
+
+
+def test_scores_come_through_the_batched_dispatch(monkeypatch):
+    client = CountingClient('Scores: {"skills": 80, "experience": "70", "projects": 101, "education": 60}')
+    monkeypatch.setattr(combined, "get_vertex_client", lambda: client)
+    sent = []
+    send_prompts = client.send_prompts
+    monkeypatch.setattr(client, "send_prompts", lambda prompts: sent.extend(prompts) or send_prompts(prompts))
+
+    scores = combined.evaluate_combined("Skills\nPython", "Python developer")
+    assert scores == {"Skills": 80, "Experience": 70, "Education": 60}
+    assert len(sent) == 1 and client.prompts == sent
@@ -0,0 +1,82 @@
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from utils import http_fetch
+from utils.disk_cache import DiskCache
+from utils.http_fetch import DownloadError, fetch_url
+
+
+class StandIn(BaseHTTPRequestHandler):
+    requests_seen = []
+
+    def do_GET(self):
+        self.requests_seen.append((self.path, self.headers.get("If-None-Match")))
+        if self.path == "/resume.pdf":
+            if self.headers.get("If-None-Match") == '"v1"':
+                self.send_response(304)
+                self.end_headers()
+                return
+            self._reply(200, b"%PDF-resume", {"ETag": '"v1"'})
+        elif self.path == "/gone.pdf":
+            self._reply(404, b"not found")
+        elif self.path == "/unavailable.pdf":
+            self._reply(503, b"try later")
+        elif self.path == "/slow.pdf":
+            time.sleep(1)
+            self._reply(200, b"%PDF-slow")
+        elif self.path == "/reset.pdf":
+            self.close_connection = True
+            self.connection.close()
+
+    def _reply(self, status, body, headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    monkeypatch.setattr(http_fetch, "_body_cache", DiskCache(str(tmp_path / "bodies.sqlite3"), 1024 * 1024))
+    monkeypatch.setattr(http_fetch, "_negative_cache", DiskCache(str(tmp_path / "negative.sqlite3"), 1024 * 1024,
+                                                                 default_ttl=60))
+    StandIn.requests_seen = []
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), StandIn)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def requests_for(path):
+    return [etag for seen, etag in StandIn.requests_seen if seen == path]
+
+
+def test_etag_revalidation_is_a_cache_hit(server):
+    hits = http_fetch.fetch_stats()["hits"]
+    assert fetch_url(f"{server}/resume.pdf") == b"%PDF-resume"
+    assert fetch_url(f"{server}/resume.pdf") == b"%PDF-resume"
+    assert requests_for("/resume.pdf") == [None, '"v1"']
+    assert http_fetch.fetch_stats()["hits"] == hits + 1
+
+
+def test_not_found_is_cached(server):
+    for _ in range(2):
+        with pytest.raises(DownloadError):
+            fetch_url(f"{server}/gone.pdf")
+    assert len(requests_for("/gone.pdf")) == 1
+
+
+@pytest.mark.parametrize("path, timeout", [("/unavailable.pdf", None), ("/slow.pdf", 0.2), ("/reset.pdf", None)])
+def test_transient_errors_are_not_cached(server, path, timeout):
+    for _ in range(2):
+        with pytest.raises(DownloadError):
+            fetch_url(f"{server}{path}", timeout=timeout)
+    assert len(requests_for(path)) == 2
@@ -0,0 +1,57 @@
+import time
+import asyncio
+import pytest
+from utils import llm_dispatch, llm_pool
+from utils.llm_dispatch import BatchPromptMixin, LLMDeadlineExceeded
+
+
+class SlowClient(BatchPromptMixin):
+    def __init__(self, seconds):
+        self.seconds = seconds
+
+    def send_prompt(self, prompt):
+        time.sleep(self.seconds)
+        return prompt.upper()
+
+
+@pytest.fixture
+def two_in_flight(monkeypatch):
+    # A private two-thread pool, so prompts beyond the second wait in its queue
+    monkeypatch.setattr(llm_pool, "LLM_MAX_IN_FLIGHT", 2)
+    monkeypatch.setattr(llm_pool, "_executor", None)
+    yield
+    llm_pool._get_executor().shutdown(wait=True)
+    monkeypatch.setattr(llm_pool, "_executor", None)
+
+
+def test_queue_time_does_not_count_against_the_deadline(two_in_flight):
+    prompts = [f"prompt {i}" for i in range(8)]
+    start = time.monotonic()
+    # Each call takes 0.1s of its 0.3s budget; the last pair waits 0.3s in the queue
+    results = SlowClient(0.1).send_prompts(prompts, timeout=0.3)
+    assert time.monotonic() - start >= 0.4
+    assert [result.unwrap() for result in results] == [prompt.upper() for prompt in prompts]
+
+
+def test_async_waiters_cover_queue_time(two_in_flight):
+    prompts = [f"prompt {i}" for i in range(6)]
+    results = asyncio.run(SlowClient(0.1).send_prompts_async(prompts, timeout=0.15))
+    assert all(result.ok for result in results)
+
+
+def test_running_call_still_has_a_deadline(two_in_flight):
+    result = SlowClient(0.5).send_prompts(["hung"], timeout=0.1)[0]
+    assert isinstance(result.error, LLMDeadlineExceeded)
+
+
+def test_prompts_queued_behind_hung_calls_are_cancelled(two_in_flight, monkeypatch):
+    monkeypatch.setattr(llm_dispatch, "LLM_QUEUE_TIMEOUT", 0.1)
+    calls = []
+    client = SlowClient(0.6)
+    send_prompt = client.send_prompt
+    client.send_prompt = lambda prompt: calls.append(prompt) or send_prompt(prompt)
+    results = client.send_prompts(["a", "b", "c", "d"], timeout=0.2)
+    assert all(isinstance(result.error, LLMDeadlineExceeded) for result in results)
+    assert "still queued" in str(results[2].error) and "still queued" in str(results[3].error)
+    time.sleep(0.6)
+    assert sorted(calls) == ["a", "b"]
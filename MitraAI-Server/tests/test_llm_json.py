@@ -0,0 +1,35 @@
+import pytest
+from utils.llm_json import (
+    JSONObjectScanner, MalformedJSONError, NoJSONFoundError, SchemaError, SCORE_SCHEMA, parse_json_object, parse_score
+)
+
+
+def test_first_object_without_schema():
+    assert parse_json_object('Here you go:\n```json\n{"score": 7}\n```\n{"score": 1}') == {"score": 7}
+    assert parse_json_object('Return it as {} like: {"score": 7}') == {}
+
+
+def test_schema_skips_objects_that_fail_validation():
+    assert parse_score('Return it as {} like: {"score": 7}') == 7
+    assert parse_score('{"note": "see {below}"} {"score": "high"} {"score": 4.5}') == 4.5
+
+
+def test_schema_error_when_no_object_validates():
+    with pytest.raises(SchemaError) as error:
+        parse_json_object('{} and {"score": true}', SCORE_SCHEMA)
+    assert error.value.field == "score"
+
+
+def test_no_json_and_malformed_json():
+    with pytest.raises(NoJSONFoundError):
+        parse_json_object("no object here", SCORE_SCHEMA)
+    with pytest.raises(MalformedJSONError):
+        parse_json_object('{"score": 7', SCORE_SCHEMA)
+
+
+def test_scanner_with_schema_on_chunks():
+    scanner = JSONObjectScanner(SCORE_SCHEMA)
+    text = 'Use {} as the shape: {"score": 9} and nothing else'
+    results = [scanner.feed(text[i:i + 3]) for i in range(0, len(text), 3)]
+    assert scanner.close() == {"score": 9}
+    assert results[-1] == {"score": 9}
@@ -0,0 +1,34 @@
+import time
+from app.controllers import multiAgentresumeshortlist as multiagent
+from utils.llm_dispatch import BatchPromptMixin
+
+
+class ScoreClient(BatchPromptMixin):
+    def send_prompt(self, prompt):
+        time.sleep(0.01)
+        return '{"score": 7}'
+
+
+def test_batch_larger_than_one_wave(monkeypatch):
+    monkeypatch.setattr(multiagent, "get_vertex_client", lambda: ScoreClient())
+    submitted, collected, peak = [], [], [0]
+    submit, collect = multiagent.submit_resume_evaluation, multiagent.collect_resume_score
+
+    def counting_submit(*args):
+        submitted.append(args[0])
+        peak[0] = max(peak[0], len(submitted) - len(collected))
+        return submit(*args)
+
+    def counting_collect(futures, errors=None):
+        collected.append(futures)
+        return collect(futures, errors)
+
+    monkeypatch.setattr(multiagent, "submit_resume_evaluation", counting_submit)
+    monkeypatch.setattr(multiagent, "collect_resume_score", counting_collect)
+
+    extracted = [(i, f"Candidate {i}", f"https://example.com/{i}.pdf", f"Skills\nPython {i}") for i in range(7)]
+    results = list(multiagent.evaluate_in_waves(iter(extracted), "Python developer", "per_criterion", wave_size=2))
+
+    assert peak[0] == 2
+    assert [index for index, *_ in results] == list(range(7))
+    assert all(score == 35 and errors == [] for *_, score, errors in results)
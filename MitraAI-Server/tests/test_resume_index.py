@@ -0,0 +1,27 @@
+from utils.resume_index import ResumeIndex
+
+
+def test_oldest_resumes_are_evicted_beyond_max_docs(tmp_path):
+    index = ResumeIndex(str(tmp_path / "index.sqlite3"), max_docs=3)
+    for i in range(5):
+        index.add(f"resume-{i}", f"python developer number{i}")
+    assert len(index) == 3
+
+    found = dict(index.query("python developer", 10))
+    assert sorted(found) == ["resume-2", "resume-3", "resume-4"]
+    assert index.query("number0", 10) == []
+
+    # Postings and document frequencies of evicted resumes are gone too
+    conn = index._connect()
+    assert conn.execute("SELECT df FROM terms WHERE term = 'python'").fetchone()[0] == 3
+    assert conn.execute("SELECT COUNT(DISTINCT doc_id) FROM postings").fetchone()[0] == 3
+
+
+def test_reindexed_resume_counts_as_new(tmp_path):
+    index = ResumeIndex(str(tmp_path / "index.sqlite3"), max_docs=2)
+    index.add("a", "python")
+    index.add("b", "java")
+    assert index.add("a", "python") is False
+    index.add("a", "python golang")
+    index.add("c", "rust")
+    assert sorted(key for key, _ in index.query("python java rust golang", 10)) == ["a", "c"]
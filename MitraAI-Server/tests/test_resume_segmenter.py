@@ -0,0 +1,79 @@
+from utils import resume_segmenter
+from utils.resume_segmenter import segment_resume, _heading_section
+
+RESUME = """Jane Doe
+jane.doe@example.com | +1 555 0100 | linkedin.com/in/janedoe
+
+Summary
+Full stack engineer with 8 years of experience building web platforms.
+
+Experience
+Technical Lead
+Acme Corp, Bangalore | 2020 - Present
+- Led a team of 6 engineers rebuilding the billing platform on Kubernetes.
+- Cut p95 API latency by 40% by moving hot paths to Go.
+Full Stack Developer
+Globex Inc | 2016 - 2020
+- Built React dashboards and Django REST APIs used by 20,000 customers.
+
+Education
+Master of Science
+Computer Science, State University, 2016
+Bachelor of Technology, Information Technology, 2014
+
+Skills
+Languages: Python, Java, Go
+Frameworks: Django, React, Spring Boot
+Tools: Docker, Kubernetes, Terraform, AWS
+
+Projects
+Open-source rate limiter for Flask with Redis-backed token buckets.
+
+Achievements
+Winner, Acme internal hackathon 2021 for a realtime fraud detector.
+"""
+
+
+def test_job_titles_and_degrees_are_not_headings():
+    for line in ("Technical Lead", "Full Stack Developer", "Master of Science", "Languages: Python, Java, Go",
+                 "Frameworks: Django, React, Spring Boot"):
+        assert _heading_section(line) == (None, ""), line
+
+
+def test_heading_phrases_and_title_case_keyword_headings():
+    assert _heading_section("Experience") == ("Experience", "")
+    assert _heading_section("WORK EXPERIENCE:") == ("Experience", "")
+    assert _heading_section("• Academic Projects") == ("Projects", "")
+    assert _heading_section("Skills: Python, SQL") == ("Skills", "Python, SQL")
+    assert _heading_section("Hobbies & Interests") == ("Other", "")
+    assert _heading_section("used technical stack") == (None, "")
+
+
+def test_realistic_resume_spans():
+    segments = segment_resume(RESUME)
+
+    experience = segments.span("Experience")
+    assert "Technical Lead" in experience
+    assert "Full Stack Developer" in experience
+    assert "billing platform" in experience and "React dashboards" in experience
+    assert "Master of Science" not in experience
+
+    education = segments.span("Education")
+    assert "Master of Science" in education and "Bachelor of Technology" in education
+
+    skills = segments.span("Skills")
+    assert "Languages: Python, Java, Go" in skills
+    assert "Tools: Docker, Kubernetes, Terraform, AWS" in skills
+    assert "billing platform" not in skills
+
+    assert "rate limiter" in segments.span("Projects")
+    assert "hackathon" in segments.span("Achievements")
+    # Summary text belongs to no evaluated section
+    assert all("8 years of experience" not in span for span in segments.spans.values())
+
+
+def test_segmentation_can_be_turned_off(monkeypatch):
+    monkeypatch.setattr(resume_segmenter, "RESUME_SEGMENTATION", False)
+    segments = segment_resume(RESUME)
+    assert segments.spans == {}
+    assert segments.span("Skills") == RESUME
@@ -0,0 +1,41 @@
+import numpy as np
+from utils.vector_store import VectorStore
+
+
+def unit(dim, hot):
+    vector = np.zeros(dim, dtype=np.float32)
+    vector[hot] = 1.0
+    return vector
+
+
+def test_append_after_torn_id_line(tmp_path):
+    store = VectorStore(str(tmp_path), 4)
+    store.append(["a"], ["ha"], [unit(4, 0)])
+
+    # A writer died after its vector row and half of its id line
+    with open(store.vectors_path, "ab") as out:
+        out.write(unit(4, 1).tobytes())
+    with open(store.ids_path, "ab") as ids:
+        ids.write(b'["b", "h')
+
+    store.append(["c"], ["hc"], [unit(4, 2)])
+    reopened = VectorStore(str(tmp_path), 4)
+    assert reopened.info()["rows"] == 2
+    assert reopened.search(unit(4, 2), 1) == [("c", 1.0)]
+    assert reopened.stale(["a", "b", "c"], ["ha", "hb", "hc"]) == [1]
+
+
+def test_refresh_skips_corrupt_line(tmp_path):
+    store = VectorStore(str(tmp_path), 4)
+    store.append(["a"], ["ha"], [unit(4, 0)])
+    # A corrupt line that still owns a vector row
+    with open(store.vectors_path, "ab") as out:
+        out.write(unit(4, 1).tobytes())
+    with open(store.ids_path, "ab") as ids:
+        ids.write(b'["b", "h["x"\n')
+    store.append(["c"], ["hc"], [unit(4, 2)])
+
+    reopened = VectorStore(str(tmp_path), 4)
+    assert len(reopened) == 2
+    assert reopened.search(unit(4, 2), 1) == [("c", 1.0)]
+    assert [key for key, _ in reopened.search(unit(4, 0), 5)] == ["a", "c"]
@@ -0,0 +1,165 @@
+import os
+import json
+import time
+import sqlite3
+import tempfile
+import threading
+
+# Default directory for the on-disk caches (App Engine only allows writes to /tmp)
+CACHE_DIR = os.environ.get("MITRA_CACHE_DIR", os.path.join(tempfile.gettempdir(), "mitra_cache"))
+# Combined size of the on-disk caches. App Engine's /tmp is instance RAM, so
+# this has to fit next to the app itself (768 MB on an F2 instance). Shares:
+# HTTP bodies 40%, PDF text 25%, LLM responses 15%; the rest is left for the
+# resume index and vector store.
+CACHE_BUDGET_BYTES = int(os.environ.get("CACHE_BUDGET_BYTES", str(256 * 1024 * 1024)))
+
+
+def cache_budget(env_name: str, share: float) -> int:
+    """Byte cap of one cache: env_name when set, else its share of CACHE_BUDGET_BYTES."""
+    return int(os.environ.get(env_name, str(int(CACHE_BUDGET_BYTES * share))))
+
+
+class SQLiteConnections:
+    """
+    Per-thread SQLite connections to one database file.
+
+    Connections are never shared between threads and never inherited across
+    fork(), so the same object can live at module level in gunicorn workers
+    and process pools. The schema script runs once per new connection.
+    """
+
+    def __init__(self, path: str, schema: str):
+        self.path = path
+        self.schema = schema
+        self._local = threading.local()
+
+    def get(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(self.schema)
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        return conn
+
+
+class DiskCache:
+    """
+    Size-bounded LRU key/value store backed by SQLite.
+
+    The database runs in WAL mode, so several gunicorn workers on the same host
+    can share one cache file. Any storage error is logged and
+    treated as a cache miss so callers always fall back to recomputing.
+    """
+
+    def __init__(self, path: str, max_bytes: int, default_ttl: float = None):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self._connections = SQLiteConnections(path, """
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL,
+                accessed REAL NOT NULL, expires REAL);
+            CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed);
+        """)
+        self._stats_lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0, "errors": 0}
+
+    def _connect(self):
+        return self._connections.get()
+
+    def _count(self, name, amount=1):
+        with self._stats_lock:
+            self._stats[name] += amount
+
+    def get(self, key: str):
+        """Return the stored bytes for key, or None when missing or expired."""
+        try:
+            conn = self._connect()
+            row = conn.execute("SELECT value, expires FROM entries WHERE key = ?", (key,)).fetchone()
+            now = time.time()
+            if row is None or (row[1] is not None and row[1] < now):
+                if row is not None:
+                    conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                self._count("misses")
+                return None
+            conn.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, key))
+            self._count("hits")
+            return bytes(row[0])
+        except sqlite3.Error as e:
+            print(f"DiskCache read error ({self.path}): {e}")
+            self._count("errors")
+            self._count("misses")
+            return None
+
+    def set(self, key: str, value: bytes, ttl: float = None):
+        """Store bytes under key and evict least recently used entries over the size limit."""
+        ttl = self.default_ttl if ttl is None else ttl
+        now = time.time()
+        expires = now + ttl if ttl else None
+        try:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO entries (key, value, size, accessed, expires) VALUES (?, ?, ?, ?, ?)",
+                (key, sqlite3.Binary(value), len(value), now, expires),
+            )
+            self._count("writes")
+            self._evict(conn)
+        except sqlite3.Error as e:
+            print(f"DiskCache write error ({self.path}): {e}")
+            self._count("errors")
+
+    def delete(self, key: str):
+        try:
+            self._connect().execute("DELETE FROM entries WHERE key = ?", (key,))
+        except sqlite3.Error as e:
+            print(f"DiskCache delete error ({self.path}): {e}")
+            self._count("errors")
+
+    def _evict(self, conn):
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM entries WHERE expires IS NOT NULL AND expires < ?", (time.time(),))
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            evicted = 0
+            for key, size in conn.execute("SELECT key, size FROM entries ORDER BY accessed").fetchall():
+                if total <= self.max_bytes:
+                    break
+                conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                total -= size
+                evicted += 1
+            conn.execute("COMMIT")
+        except sqlite3.Error:
+            conn.execute("ROLLBACK")
+            raise
+        self._count("evictions", evicted)
+
+    def get_json(self, key: str):
+        value = self.get(key)
+        return json.loads(value.decode("utf-8")) if value is not None else None
+
+    def set_json(self, key: str, value, ttl: float = None):
+        self.set(key, json.dumps(value).encode("utf-8"), ttl=ttl)
+
+    def info(self):
+        """Per-process counters plus the shared on-disk size."""
+        with self._stats_lock:
+            info = dict(self._stats)
+        try:
+            entries, size = self._connect().execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()
+            info.update({"entries": entries, "bytes": size})
+        except sqlite3.Error:
+            pass
+        info["max_bytes"] = self.max_bytes
+        return info
@@ -0,0 +1,270 @@
+import os
+import re
+import zlib
+import hashlib
+import threading
+from itertools import chain
+from collections import OrderedDict
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+
+# Text embeddings for the semantic_match score. Backends turn a list of
+# cleaned texts (resume_scorer.clean_text) into an (n, dim) float32 array of
+# unit vectors, so cosine similarity is a dot product.
+#
+# Backends:
+#   hashed                - default; signed feature hashing of words, word
+#                           stems and bigrams (FeatureHasher). Pure numpy, no
+#                           model, no network
+#   lsa                   - latent semantic analysis fitted on a local corpus
+#                           (EMBEDDING_CORPUS_PATH, one document per paragraph)
+#   sentence-transformers - EMBEDDING_MODEL from the sentence-transformers
+#                           package (downloads the model on first use)
+#   none                  - semantic scoring off
+EMBEDDING_BACKEND = os.environ.get("EMBEDDING_BACKEND", "hashed")
+EMBEDDING_DIM = int(os.environ.get("EMBEDDING_DIM", "512"))
+EMBEDDING_CORPUS_PATH = os.environ.get("EMBEDDING_CORPUS_PATH", "")
+EMBEDDING_MODEL = os.environ.get("EMBEDDING_MODEL", "all-MiniLM-L6-v2")
+# Vectors kept in memory, keyed by a hash of the text
+EMBEDDING_CACHE_SIZE = int(os.environ.get("EMBEDDING_CACHE_SIZE", "4096"))
+
+_STEM_LENGTH = 5
+_MAX_MEMO = 200000
+_LOW_BITS = np.uint64(0xFFFFFFFF)
+# Odd 64-bit multipliers for mixing two word hashes into a bigram hash
+_MIX_A = np.uint64(0x9E3779B97F4A7C15)
+_MIX_B = np.uint64(0xC2B2AE3D27D4EB4F)
+
+_BACKENDS = {}
+
+
+def register_embedding_backend(name: str, factory):
+    """Register a backend factory: factory() -> object with name, dim and encode(texts)."""
+    _BACKENDS[name] = factory
+
+
+def available_embedding_backends():
+    return sorted(_BACKENDS) + ["none"]
+
+
+def _normalize_rows(matrix):
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return matrix
+
+
+class FeatureHasher:
+    """
+    Signed feature hashing of words (minus stop words), 5-letter word stems
+    and word bigrams into n_features columns: a sparse random projection of
+    the bag of features. The stems let "developer", "developed" and
+    "development" meet; the bigrams keep a little word order.
+
+    Words are hashed with crc32, so the columns are stable across processes
+    and restarts, and memoized; stems and bigrams are derived from the word
+    hashes with numpy, for the whole batch at once.
+    """
+
+    def __init__(self, n_features: int):
+        self.n_features = n_features
+        self._memo = {}
+
+    def _word_code(self, word):
+        # Low 32 bits: the word's hash (0 for a stop word); high 32 bits: its stem's
+        if word in ENGLISH_STOP_WORDS:
+            code = 0
+        else:
+            code = zlib.crc32(word.encode("utf-8"))
+            if len(word) > _STEM_LENGTH:
+                code |= zlib.crc32(("~" + word[:_STEM_LENGTH]).encode("utf-8")) << 32
+        if len(self._memo) >= _MAX_MEMO:
+            self._memo.clear()
+        self._memo[word] = code
+        return code
+
+    def _codes(self, text):
+        # clean_text() output: single spaces, only "+%$." besides letters and
+        # digits, so "node.js" and "c++" stay whole; sentence-final dots go
+        words = text.replace(". ", " ").rstrip(".").split()
+        codes = list(map(self._memo.get, words))
+        if None in codes:
+            codes = [code if code is not None else self._word_code(word) for code, word in zip(codes, words)]
+        return codes
+
+    def _hashed(self, texts):
+        """(row, 32-bit hash) of every feature occurrence in texts."""
+        rows = [self._codes(text) for text in texts]
+        codes = np.fromiter(chain.from_iterable(rows), dtype=np.uint64)
+        docs = np.repeat(np.arange(len(texts), dtype=np.int64), [len(row) for row in rows])
+        kept = codes != 0
+        codes, docs = codes[kept], docs[kept]
+
+        words = codes & _LOW_BITS
+        stems = codes >> np.uint64(32)
+        has_stem = stems != 0
+        # Bigrams of adjacent kept words of the same text, mixed down to 32 bits
+        same_doc = docs[1:] == docs[:-1]
+        bigrams = ((words[:-1] * _MIX_A) ^ (words[1:] * _MIX_B)) >> np.uint64(32)
+
+        hashes = np.concatenate([words, stems[has_stem], bigrams[same_doc]])
+        owners = np.concatenate([docs, docs[has_stem], docs[1:][same_doc]])
+        return owners, hashes
+
+    def _signed_columns(self, hashes):
+        # The hashes fit in 32 bits; int64 arithmetic is faster than uint64
+        hashes = hashes.astype(np.int64)
+        return hashes % self.n_features, np.where(hashes >= 0x80000000, 1.0, -1.0)
+
+    def transform(self, texts):
+        """CSR matrix (len(texts), n_features) of damped signed feature counts."""
+        owners, hashes = self._hashed(texts)
+        columns, signs = self._signed_columns(hashes)
+        # Duplicates (repeated and colliding features) add up
+        matrix = sparse.csr_matrix((signs.astype(np.float32), (owners, columns)), shape=(len(texts), self.n_features))
+        matrix.data = _damp(matrix.data)
+        return matrix
+
+    def transform_dense(self, texts):
+        """transform() as a dense float32 array, without sorting; for small n_features."""
+        owners, hashes = self._hashed(texts)
+        columns, signs = self._signed_columns(hashes)
+        counts = np.bincount(owners * self.n_features + columns, weights=signs, minlength=len(texts) * self.n_features)
+        return _damp(counts.reshape(len(texts), self.n_features)).astype(np.float32)
+
+
+def _damp(counts):
+    # Sublinear scaling (like 1 + log tf) so a repeated word can't dominate
+    return np.sign(counts) * np.log1p(np.abs(counts))
+
+
+class HashedEmbeddingBackend:
+    """Feature hashing straight into dim columns; similar vocabularies give similar vectors."""
+
+    def __init__(self, dim: int = EMBEDDING_DIM):
+        self.name = f"hashed-{dim}"
+        self.dim = dim
+        self.hasher = FeatureHasher(dim)
+
+    def encode(self, texts):
+        return _normalize_rows(self.hasher.transform_dense(texts))
+
+
+class LSAEmbeddingBackend:
+    """
+    TF-IDF weighted hashed features projected onto the top dim singular
+    vectors of a local corpus, so terms that co-occur in the corpus (e.g.
+    "django" and "flask") end up close even when a resume and a JD share none.
+    """
+
+    def __init__(self, corpus_path: str = EMBEDDING_CORPUS_PATH, dim: int = EMBEDDING_DIM, n_features: int = 2 ** 18):
+        from sklearn.decomposition import TruncatedSVD
+        # Loaded while utils.resume_scorer is imported, after clean_text is defined
+        from utils.resume_scorer import clean_text
+
+        if not corpus_path or not os.path.exists(corpus_path):
+            raise ValueError("The lsa embedding backend needs EMBEDDING_CORPUS_PATH to name a text file")
+        with open(corpus_path, "rb") as corpus:
+            raw = corpus.read()
+        documents = [clean_text(doc) for doc in re.split(r"\n\s*\n", raw.decode("utf-8")) if doc.strip()]
+        if len(documents) <= dim:
+            raise ValueError(f"The LSA corpus has {len(documents)} documents; more than {dim} are needed")
+
+        self.hasher = FeatureHasher(n_features)
+        counts = self.hasher.transform(documents)
+        df = np.bincount(counts.indices, minlength=n_features)
+        self.idf = (np.log((1 + len(documents)) / (1 + df)) + 1).astype(np.float32)
+
+        svd = TruncatedSVD(n_components=dim, random_state=0)
+        svd.fit(counts.multiply(self.idf).tocsr())
+        self.components = svd.components_.T.astype(np.float32)
+        self.dim = dim
+        self.name = f"lsa-{dim}-{hashlib.sha256(raw).hexdigest()[:12]}"
+
+    def encode(self, texts):
+        features = self.hasher.transform(texts).multiply(self.idf).tocsr()
+        return _normalize_rows(features @ self.components)
+
+
+class SentenceTransformerBackend:
+    def __init__(self, model_name: str = EMBEDDING_MODEL):
+        from sentence_transformers import SentenceTransformer
+
+        self.model = SentenceTransformer(model_name, device="cpu")
+        self.dim = self.model.get_sentence_embedding_dimension()
+        self.name = f"st-{model_name}"
+
+    def encode(self, texts):
+        return _normalize_rows(self.model.encode(list(texts), batch_size=32, convert_to_numpy=True))
+
+
+register_embedding_backend("hashed", HashedEmbeddingBackend)
+register_embedding_backend("lsa", LSAEmbeddingBackend)
+register_embedding_backend("sentence-transformers", SentenceTransformerBackend)
+
+
+def load_embedding_backend(name: str = EMBEDDING_BACKEND):
+    """Build the named backend; None for "none"."""
+    if name == "none":
+        return None
+    if name not in _BACKENDS:
+        raise ValueError(f"Unknown embedding backend: {name}")
+    return _BACKENDS[name]()
+
+
+class EmbeddingCache:
+    """LRU of text hash -> unit vector in front of a backend; misses are encoded in one batch."""
+
+    def __init__(self, backend, maxsize: int = EMBEDDING_CACHE_SIZE):
+        self.backend = backend
+        self.maxsize = maxsize
+        self._vectors = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0}
+
+    def encode(self, texts):
+        """(len(texts), dim) float32 array of unit vectors."""
+        keys = [hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest() for text in texts]
+        result = np.empty((len(texts), self.backend.dim), dtype=np.float32)
+        missing = {}
+        with self._lock:
+            for i, key in enumerate(keys):
+                vector = self._vectors.get(key)
+                if vector is None:
+                    missing.setdefault(key, []).append(i)
+                    continue
+                self._vectors.move_to_end(key)
+                result[i] = vector
+            self._stats["hits"] += len(keys) - sum(len(rows) for rows in missing.values())
+            self._stats["misses"] += len(missing)
+
+        if missing:
+            # Duplicates within the batch are encoded once
+            encoded = self.backend.encode([texts[rows[0]] for rows in missing.values()])
+            with self._lock:
+                for (key, rows), vector in zip(missing.items(), encoded):
+                    result[rows] = vector
+                    self._vectors[key] = vector
+                    self._vectors.move_to_end(key)
+                while len(self._vectors) > self.maxsize:
+                    self._vectors.popitem(last=False)
+        return result
+
+    def info(self):
+        with self._lock:
+            return {
+                "backend": self.backend.name,
+                "dim": self.backend.dim,
+                "hits": self._stats["hits"],
+                "misses": self._stats["misses"],
+                "size": len(self._vectors),
+                "maxsize": self.maxsize,
+            }
+
+
+def cosine_similarities(vectors, query):
+    """Cosine similarity of unit-vector rows against a unit query vector."""
+    # Row-wise multiply-and-sum rounds the same for one row as for many,
+    # so single and batch scoring agree exactly
+    return (vectors * query).sum(axis=1, dtype=np.float64)
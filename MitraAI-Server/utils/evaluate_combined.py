@@ -0,0 +1,93 @@
+from langchain_core.prompts import PromptTemplate
+from utils.vertexAIclient import get_vertex_client
+from utils.llm_json import parse_json_object
+
+# JSON key in the combined response -> criterion (resume section) name
+CRITERIA_KEYS = {
+    "skills": "Skills",
+    "experience": "Experience",
+    "projects": "Projects",
+    "education": "Education",
+    "achievements": "Achievements",
+}
+
+def _valid_score(value):
+    # Accept integers (or numeric strings) in the 0-100 range only
+    try:
+        score = float(value)
+    except (TypeError, ValueError):
+        return None
+    if score != score or score < 0 or score > 100:
+        return None
+    return int(round(score))
+
+def evaluate_combined(content, jobdescription):
+    """
+    Score all five criteria with a single prompt.
+
+    Returns:
+        {criterion: score} for every criterion with a valid score in the
+        response; missing or invalid criteria are left out so the caller can
+        retry them individually
+    """
+    try:
+        # Get the Vertex AI client
+        vertex_client = get_vertex_client()
+
+        # Define the task
+        task = f"""
+        You are a strict and specialized ATS (Applicant Tracking System) evaluator.
+        Analyze the provided resume content against the provided job description and score each criterion separately.
+
+        Resume content:
+        {content}
+
+        Job description:
+        {jobdescription}
+
+        Criteria:
+        - skills: alignment of the skills section with the required skills.
+        - experience: relevance, level and impact of the roles in the experience section.
+        - projects: relevance, complexity and technologies of the projects section.
+        - education: relevance and level of the degrees, institutions and coursework.
+        - achievements: relevance, impact and quantifiable results of the achievements.
+
+        Instructions:
+        1. Score every criterion with an integer between 0 and 100. A score of 100 indicates a perfect match, and a lower score indicates lesser alignment.
+        2. Respond only in the following exact JSON format:
+        {{
+            "skills": <SCORE>,
+            "experience": <SCORE>,
+            "projects": <SCORE>,
+            "education": <SCORE>,
+            "achievements": <SCORE>
+        }}
+        3. Replace every <SCORE> with the numerical value of that criterion's score.
+        4. Do not include any other text, explanation, or information beyond the JSON.
+        """
+
+        # Create the prompt using LangChain's PromptTemplate
+        prompt_template = PromptTemplate(
+            input_variables=["task"],
+            template="Please perform the following task: {task}",
+        )
+        prompt = prompt_template.format(task=task)
+
+        # Send the prompt to Vertex AI (rate limited, retried, with a deadline)
+        response_text = vertex_client.send_prompts([prompt])[0].unwrap()
+
+        # First JSON object of the reply; scores are validated one by one below
+        # so a reply missing some criteria still yields the others
+        parsed_response = parse_json_object(response_text)
+
+        scores = {}
+        for key, criterion in CRITERIA_KEYS.items():
+            score = _valid_score(parsed_response.get(key))
+            if score is not None:
+                scores[criterion] = score
+        print(f"Combined Scores {scores}")
+        return scores
+
+    except Exception as e:
+        print(f"Error extracting scores from response ({type(e).__name__}): {e}")
+        return {}  # Every criterion is retried individually
@@ -0,0 +1,49 @@
+import json
+from flask import Response, stream_with_context
+from utils.llm_json import JSONObjectScanner
+
+# Streaming responses shared by the controllers: one JSON record per line
+# (NDJSON) or one server-sent event per record, named after record["type"].
+STREAM_FORMATS = {"ndjson": "application/x-ndjson", "sse": "text/event-stream"}
+
+
+def encode_stream_record(record, stream_format):
+    payload = json.dumps(record)
+    if stream_format == "sse":
+        return f"event: {record['type']}\ndata: {payload}\n\n"
+    return payload + "\n"
+
+
+def stream_response(records, stream_format):
+    """Flask response streaming the records yielded by the records generator."""
+    def generate():
+        for record in records:
+            yield encode_stream_record(record, stream_format)
+
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    return Response(stream_with_context(generate()), mimetype=STREAM_FORMATS[stream_format], headers=headers)
+
+
+def stream_llm_json(client, prompt, schema):
+    """
+    Stream an LLM completion that should end up as one JSON object.
+
+    Yields a "token" record per chunk as it arrives. The chunks are scanned
+    incrementally, so the "final" record with the object (validated against
+    schema) goes out as soon as the object closes; whatever the model adds
+    after it is read but not forwarded, so the complete reply still reaches
+    the response cache. Failures yield an "error" record.
+    """
+    scanner = JSONObjectScanner(schema)
+    try:
+        for token in client.stream_tokens(prompt):
+            if scanner.done:
+                continue
+            yield {"type": "token", "text": token}
+            if scanner.feed(token) is not None:
+                yield {"type": "final", "result": scanner.result}
+        if not scanner.done:
+            yield {"type": "final", "result": scanner.close()}
+    except Exception as e:
+        print(f"Error in LLM stream: {e}")
+        yield {"type": "error", "error": str(e), "errorType": type(e).__name__}
@@ -1,8 +1,7 @@
-import requests
-import PyPDF2
 import io
-import re
 import urllib.parse
+from utils.pdf_document import Document
+from utils.http_fetch import fetch_url, DownloadError
 
 def download_pdf_from_firebase(firebase_url: str) -> io.BytesIO:
     """
@@ -15,13 +14,12 @@ def download_pdf_from_firebase(firebase_url: str) -> io.BytesIO:
         BytesIO object containing the PDF data
     """
     try:
-        # Download the file from Firebase URL
-        response = requests.get(firebase_url)
-        response.raise_for_status()  # Raise exception for bad status codes
+        # Download the file from Firebase URL (revalidated against the cached copy)
+        content = fetch_url(firebase_url)
        
         # Convert to BytesIO object
-        return io.BytesIO(response.content)
-    except requests.exceptions.RequestException as e:
+        return io.BytesIO(content)
+    except DownloadError as e:
         raise Exception(f"Error downloading PDF from Firebase: {str(e)}")
 
 def extract_links_from_pdf(pdf_file):
@@ -29,28 +27,8 @@ def extract_links_from_pdf(pdf_file):
     Extract hyperlinks from a PDF file.
     Returns a list of unique URLs found in the PDF.
     """
-    # Create PDF reader object
-    pdf_reader = PyPDF2.PdfReader(pdf_file)
-    links = set()
-   
-    # Iterate through all pages
-    for page in pdf_reader.pages:
-        # Get annotations (which include links)
-        if '/Annots' in page:
-            annotations = page['/Annots']
-            for annotation in annotations:
-                annotation_object = annotation.get_object()
-                if annotation_object.get('/Subtype') == '/Link':
-                    if '/A' in annotation_object and '/URI' in annotation_object['/A']:
-                        links.add(annotation_object['/A']['/URI'])
-       
-        # Also check text content for URLs
-        text = page.extract_text()
-        # Simple regex for URL detection
-        urls = re.findall(r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+', text)
-        links.update(urls)
-   
-    return list(links)
+    # Link annotations and URLs in the text come from the same single parse as the text
+    return list(Document.from_file(pdf_file).links)
 
 def extract_links(firebase_url: str):
     """
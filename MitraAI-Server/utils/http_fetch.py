@@ -0,0 +1,99 @@
+import os
+import threading
+import requests
+from utils.disk_cache import DiskCache, CACHE_DIR, cache_budget
+
+# Resume downloads are revalidated with ETag / Last-Modified instead of being
+# fetched in full every time, and URLs that definitively failed (4xx) are not
+# retried until the negative cache entry expires.
+DOWNLOAD_TIMEOUT = float(os.environ.get("DOWNLOAD_TIMEOUT", "20"))
+NEGATIVE_CACHE_TTL = float(os.environ.get("NEGATIVE_CACHE_TTL", "60"))
+HTTP_CACHE_MAX_BYTES = cache_budget("HTTP_CACHE_MAX_BYTES", 0.4)
+
+_body_cache = DiskCache(os.path.join(CACHE_DIR, "http_bodies.sqlite3"), HTTP_CACHE_MAX_BYTES)
+_negative_cache = DiskCache(
+    os.path.join(CACHE_DIR, "http_negative.sqlite3"), 4 * 1024 * 1024, default_ttl=NEGATIVE_CACHE_TTL
+)
+
+_local = threading.local()
+_stats_lock = threading.Lock()
+_stats = {"hits": 0, "revalidations": 0, "misses": 0, "negative_hits": 0, "errors": 0}
+# Client errors that a retry can fix
+_TRANSIENT_STATUSES = (408, 429)
+
+
+class DownloadError(Exception):
+    pass
+
+
+def _count(name):
+    with _stats_lock:
+        _stats[name] += 1
+
+
+def _session():
+    # One pooled session per thread so repeated fetches reuse connections
+    session = getattr(_local, "session", None)
+    if session is None:
+        session = requests.Session()
+        _local.session = session
+    return session
+
+
+def _is_definitive(error):
+    # Timeouts, connection resets and 5xx are worth retrying right away; a
+    # 404 / 410 (or any other client error) will fail the same way again
+    response = getattr(error, "response", None)
+    if not isinstance(error, requests.exceptions.HTTPError) or response is None:
+        return False
+    return 400 <= response.status_code < 500 and response.status_code not in _TRANSIENT_STATUSES
+
+
+def fetch_url(url: str, timeout: float = None) -> bytes:
+    """
+    Download url, revalidating a cached copy with a conditional GET when possible.
+
+    Raises:
+        DownloadError: when the URL fails, or returned a 4xx within NEGATIVE_CACHE_TTL
+    """
+    failure = _negative_cache.get_json(url)
+    if failure is not None:
+        _count("negative_hits")
+        raise DownloadError(f"{failure} (cached failure)")
+
+    meta = _body_cache.get_json(f"meta:{url}")
+    body = _body_cache.get(f"body:{url}") if meta is not None else None
+
+    headers = {}
+    if body is not None:
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        _count("revalidations")
+
+    try:
+        response = _session().get(url, headers=headers, timeout=timeout or DOWNLOAD_TIMEOUT)
+        if response.status_code == 304 and body is not None:
+            _count("hits")
+            return body
+        response.raise_for_status()
+    except requests.exceptions.RequestException as e:
+        _count("errors")
+        if _is_definitive(e):
+            _negative_cache.set_json(url, str(e))
+        raise DownloadError(str(e))
+
+    _count("misses")
+    content = response.content
+    etag = response.headers.get("ETag")
+    last_modified = response.headers.get("Last-Modified")
+    if etag or last_modified:
+        _body_cache.set(f"body:{url}", content)
+        _body_cache.set_json(f"meta:{url}", {"etag": etag, "last_modified": last_modified})
+    return content
+
+
+def fetch_stats():
+    with _stats_lock:
+        return dict(_stats)
@@ -0,0 +1,141 @@
+import os
+import json
+import time
+import uuid
+import sqlite3
+from utils.disk_cache import CACHE_DIR, SQLiteConnections
+
+# Job state is shared by the worker processes of one instance and survives
+# their restarts, but not the instance's: CACHE_DIR is instance-local (on App
+# Engine, in-memory /tmp). app.yaml therefore caps the service at one
+# instance; point SHORTLIST_JOBS_PATH at storage every instance mounts before
+# raising that limit.
+SHORTLIST_JOBS_PATH = os.environ.get("SHORTLIST_JOBS_PATH", os.path.join(CACHE_DIR, "shortlist_jobs.sqlite3"))
+
+
+class JobStore:
+    """
+    Durable state for background shortlist jobs.
+
+    Every processed resume is written as its own row as soon as it finishes,
+    so a job picked up again after a worker restart only processes the
+    resumes that have no row yet. Ownership is a lease: the worker that
+    claimed a job refreshes its heartbeat with every checkpoint and while it
+    works, and a running job whose heartbeat is older than the stale timeout
+    can be claimed by another worker.
+    """
+
+    def __init__(self, path: str = SHORTLIST_JOBS_PATH):
+        self._connections = SQLiteConnections(path, """
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id TEXT PRIMARY KEY, mode TEXT NOT NULL, payload TEXT NOT NULL,
+                status TEXT NOT NULL, total INTEGER NOT NULL, error TEXT,
+                owner TEXT, heartbeat REAL NOT NULL, created REAL NOT NULL, updated REAL NOT NULL);
+            CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, heartbeat);
+            CREATE TABLE IF NOT EXISTS job_results (
+                job_id TEXT NOT NULL, idx INTEGER NOT NULL, name TEXT, url TEXT,
+                score INTEGER, status TEXT NOT NULL,
+                PRIMARY KEY (job_id, idx)) WITHOUT ROWID;
+        """)
+
+    def _connect(self):
+        return self._connections.get()
+
+    def create(self, mode: str, payload: dict, total: int) -> str:
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        self._connect().execute(
+            "INSERT INTO jobs (job_id, mode, payload, status, total, heartbeat, created, updated)"
+            " VALUES (?, ?, ?, 'queued', ?, ?, ?, ?)",
+            (job_id, mode, json.dumps(payload), total, now, now, now),
+        )
+        return job_id
+
+    def get(self, job_id: str):
+        row = self._connect().execute(
+            "SELECT job_id, mode, payload, status, total, error, owner, created, updated FROM jobs WHERE job_id = ?",
+            (job_id,),
+        ).fetchone()
+        if row is None:
+            return None
+        keys = ("job_id", "mode", "payload", "status", "total", "error", "owner", "created", "updated")
+        job = dict(zip(keys, row))
+        job["payload"] = json.loads(job["payload"])
+        return job
+
+    def claim(self, job_id: str, owner: str, stale_after: float) -> bool:
+        """
+        Take ownership of a queued job, or of a running job whose owner stopped
+        heartbeating. A job that is running with a live lease is never claimed,
+        not even by its own owner.
+        """
+        now = time.time()
+        cursor = self._connect().execute(
+            "UPDATE jobs SET status = 'running', owner = ?, heartbeat = ?, updated = ?"
+            " WHERE job_id = ? AND (status = 'queued' OR (status = 'running' AND heartbeat < ?))",
+            (owner, now, now, job_id, now - stale_after),
+        )
+        return cursor.rowcount == 1
+
+    def heartbeat(self, job_id: str, owner: str) -> bool:
+        """Refresh the owner's lease; False when the job was taken over or finished."""
+        now = time.time()
+        cursor = self._connect().execute(
+            "UPDATE jobs SET heartbeat = ? WHERE job_id = ? AND owner = ? AND status = 'running'",
+            (now, job_id, owner),
+        )
+        return cursor.rowcount == 1
+
+    def record_result(self, job_id: str, owner: str, index: int, name, url, score, status: str) -> bool:
+        """
+        Checkpoint one processed resume and refresh the owner's lease.
+
+        Returns False (and writes nothing) when owner no longer holds the job.
+        """
+        conn = self._connect()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            cursor = conn.execute(
+                "UPDATE jobs SET heartbeat = ?, updated = ? WHERE job_id = ? AND owner = ? AND status = 'running'",
+                (now, now, job_id, owner),
+            )
+            if cursor.rowcount != 1:
+                conn.execute("ROLLBACK")
+                return False
+            conn.execute(
+                "INSERT OR REPLACE INTO job_results (job_id, idx, name, url, score, status) VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, index, name, url, score, status),
+            )
+            conn.execute("COMMIT")
+            return True
+        except sqlite3.Error:
+            conn.execute("ROLLBACK")
+            raise
+
+    def results(self, job_id: str):
+        rows = self._connect().execute(
+            "SELECT idx, name, url, score, status FROM job_results WHERE job_id = ? ORDER BY idx", (job_id,)
+        ).fetchall()
+        return [dict(zip(("index", "name", "url", "score", "status"), row)) for row in rows]
+
+    def finish(self, job_id: str, owner: str, status: str, error: str = None):
+        now = time.time()
+        self._connect().execute(
+            "UPDATE jobs SET status = ?, error = ?, heartbeat = ?, updated = ?"
+            " WHERE job_id = ? AND owner = ? AND status = 'running'",
+            (status, error, now, now, job_id, owner),
+        )
+
+    def resumable(self, stale_after: float, include_queued: bool = False):
+        """
+        Running jobs whose owner stopped heartbeating, plus (include_queued)
+        every queued job. Claiming is atomic, so a queued job submitted by
+        several processes still runs once.
+        """
+        rows = self._connect().execute(
+            "SELECT job_id FROM jobs WHERE (status = 'running' AND heartbeat < ?)"
+            " OR (status = 'queued' AND ?) ORDER BY created",
+            (time.time() - stale_after, 1 if include_queued else 0),
+        ).fetchall()
+        return [row[0] for row in rows]
@@ -0,0 +1,107 @@
+import os
+import re
+import hashlib
+import threading
+from utils.disk_cache import DiskCache, CACHE_DIR, cache_budget
+from utils.llm_pool import current_call_context
+from utils.llm_dispatch import BatchPromptMixin
+from utils.singleflight import singleflight
+
+# Responses of the LLM client are cached on disk, keyed by the model name and
+# a hash of the whitespace-normalized prompt, so re-evaluating the same resume
+# against the same JD (or regenerating questions for the same role) does not
+# pay model latency again. Send "X-LLM-Cache: bypass" to force fresh answers
+# for one request; they still refresh the cache.
+LLM_CACHE_ENABLED = os.environ.get("LLM_CACHE_ENABLED", "1") not in ("0", "false", "False")
+LLM_CACHE_TTL = float(os.environ.get("LLM_CACHE_TTL", str(7 * 24 * 3600)))
+LLM_CACHE_MAX_BYTES = cache_budget("LLM_CACHE_MAX_BYTES", 0.15)
+
+_llm_cache = DiskCache(
+    os.path.join(CACHE_DIR, "llm_responses.sqlite3"), LLM_CACHE_MAX_BYTES, default_ttl=LLM_CACHE_TTL
+)
+
+# Concurrent misses for the same prompt share one model call
+_prompt_flight = singleflight("llm_prompts")
+
+_stats_lock = threading.Lock()
+_endpoint_stats = {}
+
+
+def normalize_prompt(prompt: str) -> str:
+    # Indentation and line wrapping of the prompt templates don't change the answer
+    return re.sub(r"\s+", " ", prompt).strip()
+
+
+def prompt_cache_key(model_name: str, prompt: str) -> str:
+    digest = hashlib.sha256(normalize_prompt(prompt).encode("utf-8")).hexdigest()
+    return f"{model_name}:{digest}"
+
+
+def _count(endpoint, name):
+    with _stats_lock:
+        stats = _endpoint_stats.setdefault(endpoint, {"hits": 0, "misses": 0, "bypassed": 0})
+        stats[name] += 1
+
+
+class CachedLLMClient(BatchPromptMixin):
+    """Wraps an LLM client (Vertex AI or mock) with the shared response cache."""
+
+    def __init__(self, client, cache: DiskCache = None):
+        self.client = client
+        self.cache = cache or _llm_cache
+
+    def __getattr__(self, name):
+        # Everything but the prompt methods goes straight to the wrapped client
+        return getattr(self.client, name)
+
+    def send_prompt(self, prompt: str) -> str:
+        endpoint, bypass = current_call_context()
+        key = prompt_cache_key(getattr(self.client, "model_name", ""), prompt)
+
+        if not bypass:
+            cached = self.cache.get(key)
+            if cached is not None:
+                _count(endpoint, "hits")
+                return cached.decode("utf-8")
+
+        _count(endpoint, "bypassed" if bypass else "misses")
+        return _prompt_flight.do(key, self._send_and_store, key, prompt)
+
+    def stream_prompt(self, prompt: str):
+        endpoint, bypass = current_call_context()
+        key = prompt_cache_key(getattr(self.client, "model_name", ""), prompt)
+
+        if not bypass:
+            cached = self.cache.get(key)
+            if cached is not None:
+                _count(endpoint, "hits")
+                yield cached.decode("utf-8")
+                return
+
+        _count(endpoint, "bypassed" if bypass else "misses")
+        parts = []
+        for token in self.client.stream_prompt(prompt):
+            parts.append(token)
+            yield token
+        # Only a stream that ran to the end is a complete response
+        self.cache.set(key, "".join(parts).encode("utf-8"))
+
+    def _send_and_store(self, key: str, prompt: str) -> str:
+        response = self.client.send_prompt(prompt)
+        if isinstance(response, str):
+            self.cache.set(key, response.encode("utf-8"))
+        return response
+
+
+def cached_client(client):
+    """Wrap a client with the response cache unless LLM_CACHE_ENABLED is off."""
+    return CachedLLMClient(client) if LLM_CACHE_ENABLED else client
+
+
+def llm_cache_info():
+    with _stats_lock:
+        endpoints = {}
+        for endpoint, stats in _endpoint_stats.items():
+            lookups = stats["hits"] + stats["misses"]
+            endpoints[endpoint] = dict(stats, hit_rate=round(stats["hits"] / lookups, 3) if lookups else 0.0)
+    return {"enabled": LLM_CACHE_ENABLED, "storage": _llm_cache.info(), "endpoints": endpoints}
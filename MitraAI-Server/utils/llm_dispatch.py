@@ -0,0 +1,242 @@
+import os
+import time
+import random
+import asyncio
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from utils.llm_pool import submit_llm_call, in_llm_worker
+
+# Batched prompt dispatch shared by every LLM client: prompts run concurrently
+# on the shared LLM pool, each call waits for a token from a process-wide
+# token bucket, failures are retried with jittered exponential backoff and
+# every prompt has a deadline covering its retries. The deadline starts when
+# the call starts on the pool; time queued behind LLM_MAX_IN_FLIGHT is
+# bounded separately by LLM_QUEUE_TIMEOUT.
+LLM_RATE_LIMIT = float(os.environ.get("LLM_RATE_LIMIT", "20"))  # calls per second, 0 = unlimited
+LLM_RATE_BURST = int(os.environ.get("LLM_RATE_BURST", "20"))
+LLM_MAX_RETRIES = int(os.environ.get("LLM_MAX_RETRIES", "3"))
+LLM_BACKOFF_BASE = float(os.environ.get("LLM_BACKOFF_BASE", "0.5"))
+LLM_BACKOFF_MAX = float(os.environ.get("LLM_BACKOFF_MAX", "8"))
+LLM_CALL_DEADLINE = float(os.environ.get("LLM_CALL_DEADLINE", "120"))
+LLM_QUEUE_TIMEOUT = float(os.environ.get("LLM_QUEUE_TIMEOUT", "600"))
+
+
+class LLMDeadlineExceeded(TimeoutError):
+    pass
+
+
+class TokenBucket:
+    """Thread-safe token bucket; rate <= 0 disables limiting."""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, deadline: float = None) -> bool:
+        """Take one token, waiting until the deadline at most."""
+        if self.rate <= 0:
+            return True
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return True
+                wait = (1 - self._tokens) / self.rate
+            if deadline is not None and now + wait > deadline:
+                return False
+            time.sleep(wait)
+
+
+_rate_limiter = TokenBucket(LLM_RATE_LIMIT, LLM_RATE_BURST)
+
+
+class PromptResult:
+    """Outcome of one prompt: the response text or the error that ended it."""
+
+    def __init__(self, text: str = None, error: Exception = None, attempts: int = 0):
+        self.text = text
+        self.error = error
+        self.attempts = attempts
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def unwrap(self) -> str:
+        """Return the text, raising the error of a failed prompt."""
+        if self.error is not None:
+            raise self.error
+        return self.text
+
+
+def send_with_retries(send_prompt, prompt: str, deadline: float) -> PromptResult:
+    """Call send_prompt(prompt) under the rate limit, retrying until the deadline."""
+    attempts = 0
+    while True:
+        if not _rate_limiter.acquire(deadline):
+            return PromptResult(error=LLMDeadlineExceeded("Rate limited until the LLM call deadline"), attempts=attempts)
+
+        attempts += 1
+        try:
+            return PromptResult(text=send_prompt(prompt), attempts=attempts)
+        except Exception as e:
+            if attempts > LLM_MAX_RETRIES:
+                return PromptResult(error=e, attempts=attempts)
+
+            # Full jitter keeps concurrent retries from hitting the model in lockstep
+            delay = random.uniform(0, min(LLM_BACKOFF_MAX, LLM_BACKOFF_BASE * 2 ** (attempts - 1)))
+            if time.monotonic() + delay > deadline:
+                return PromptResult(error=e, attempts=attempts)
+            print(f"LLM call failed ({e}), retry {attempts}/{LLM_MAX_RETRIES} in {delay:.2f}s")
+            time.sleep(delay)
+
+
+def stream_with_retries(stream_prompt, prompt: str, deadline: float):
+    """
+    Yield the tokens of stream_prompt(prompt) under the rate limit.
+
+    Failures are retried like send_with_retries until the first token arrives;
+    after that the caller has seen output and the error is raised as is.
+    """
+    attempts = 0
+    while True:
+        if not _rate_limiter.acquire(deadline):
+            raise LLMDeadlineExceeded("Rate limited until the LLM call deadline")
+
+        attempts += 1
+        tokens = iter(stream_prompt(prompt))
+        try:
+            first = next(tokens, None)
+        except Exception as e:
+            delay = random.uniform(0, min(LLM_BACKOFF_MAX, LLM_BACKOFF_BASE * 2 ** (attempts - 1)))
+            if attempts > LLM_MAX_RETRIES or time.monotonic() + delay > deadline:
+                raise
+            print(f"LLM stream failed ({e}), retry {attempts}/{LLM_MAX_RETRIES} in {delay:.2f}s")
+            time.sleep(delay)
+            continue
+        break
+
+    if first is None:
+        return
+    yield first
+    for token in tokens:
+        if time.monotonic() > deadline:
+            tokens.close()
+            raise LLMDeadlineExceeded("LLM stream deadline exceeded")
+        yield token
+
+
+class PendingPrompt:
+    """
+    A submitted prompt; result() never raises.
+
+    The call's deadline (started + budget) is only set once the call starts
+    on the pool. A prompt still queued after LLM_QUEUE_TIMEOUT is cancelled.
+    """
+
+    def __init__(self, budget: float):
+        self.budget = budget
+        self.submitted = time.monotonic()
+        self.started = None
+        self.future = None
+
+    @property
+    def deadline(self):
+        return None if self.started is None else self.started + self.budget
+
+    def run(self, send_prompt, prompt: str) -> PromptResult:
+        self.started = time.monotonic()
+        return send_with_retries(send_prompt, prompt, self.deadline)
+
+    def _timeout(self):
+        if self.started is None:
+            return max(0, self.submitted + LLM_QUEUE_TIMEOUT - time.monotonic())
+        return max(0, self.deadline - time.monotonic())
+
+    def _expired(self):
+        """Error result once the wait is over, None when the call started meanwhile."""
+        if self.started is None and self.future.cancel():
+            return PromptResult(error=LLMDeadlineExceeded(f"LLM call still queued after {LLM_QUEUE_TIMEOUT}s"))
+        # cancel() fails once the call is running, a moment before run() sets started
+        started = self.started if self.started is not None else time.monotonic()
+        if time.monotonic() >= started + self.budget:
+            # A hung call keeps its worker, but the caller moves on
+            return PromptResult(error=LLMDeadlineExceeded("LLM call deadline exceeded"))
+        return None
+
+    def result(self) -> PromptResult:
+        while True:
+            try:
+                return self.future.result(timeout=self._timeout())
+            except FutureTimeout:
+                expired = self._expired()
+                if expired is not None:
+                    return expired
+            except Exception as e:
+                return PromptResult(error=e)
+
+    async def result_async(self) -> PromptResult:
+        waiter = asyncio.wrap_future(self.future)
+        while True:
+            try:
+                # shield: a timed out wait must not cancel the call itself
+                return await asyncio.wait_for(asyncio.shield(waiter), timeout=self._timeout())
+            except asyncio.TimeoutError:
+                expired = self._expired()
+                if expired is not None:
+                    return expired
+            except Exception as e:
+                return PromptResult(error=e)
+
+
+class BatchPromptMixin:
+    """send_prompts / send_prompts_async / stream_tokens for clients that implement send_prompt."""
+
+    def stream_prompt(self, prompt: str):
+        # Clients without native streaming deliver the whole response as one chunk
+        yield self.send_prompt(prompt)
+
+    def stream_tokens(self, prompt: str, timeout: float = None):
+        """Stream the response of one prompt with rate limiting, retries and a deadline."""
+        deadline = time.monotonic() + (LLM_CALL_DEADLINE if timeout is None else timeout)
+        return stream_with_retries(self.stream_prompt, prompt, deadline)
+
+    def submit_prompts(self, prompts, timeout: float = None):
+        """
+        Queue every prompt on the shared LLM pool; returns PendingPrompts in
+        input order. timeout (LLM_CALL_DEADLINE) is each call's own budget,
+        counted from when the call starts.
+        """
+        budget = LLM_CALL_DEADLINE if timeout is None else timeout
+        pending = []
+        for prompt in prompts:
+            item = PendingPrompt(budget)
+            if in_llm_worker():
+                # Already on the pool: waiting on it from here could deadlock
+                item.future = Future()
+                item.future.set_result(item.run(self.send_prompt, prompt))
+            else:
+                item.future = submit_llm_call(item.run, self.send_prompt, prompt)
+            pending.append(item)
+        return pending
+
+    def send_prompts(self, prompts, timeout: float = None):
+        """
+        Send prompts concurrently with rate limiting, retries and a deadline.
+
+        Returns:
+            List of PromptResult in the same order as prompts; a failed prompt
+            carries its error instead of raising
+        """
+        return [pending.result() for pending in self.submit_prompts(prompts, timeout)]
+
+    async def send_prompts_async(self, prompts, timeout: float = None):
+        """asyncio variant of send_prompts (the calls still run on the LLM pool)."""
+        pending = self.submit_prompts(prompts, timeout)
+        return list(await asyncio.gather(*(item.result_async() for item in pending)))
@@ -0,0 +1,205 @@
+import re
+import json
+
+# Structured (JSON) replies of the LLM controllers. The first balanced {...}
+# object (with a schema: the first one that satisfies it) is located in one
+# pass over the text: code fences, prose around the object and further
+# objects after it are ignored, and braces inside strings don't count.
+# JSONObjectScanner does the same on a stream of chunks.
+
+# Significant characters outside and inside JSON strings; everything else is
+# skipped by the regex engine instead of a Python loop
+_STRUCTURE_CHARS = re.compile(r'[{}"]')
+_STRING_CHARS = re.compile(r'["\\]')
+
+
+class LLMResponseError(ValueError):
+    """The model reply could not be turned into the expected JSON object."""
+
+
+class NoJSONFoundError(LLMResponseError):
+    pass
+
+
+class MalformedJSONError(LLMResponseError):
+    pass
+
+
+class SchemaError(LLMResponseError):
+    def __init__(self, message, field=None):
+        super().__init__(message)
+        self.field = field
+
+
+# Schemas: field -> required type (or tuple of types)
+SCORE_SCHEMA = {"score": (int, float)}
+MOCK_QUESTIONS_SCHEMA = {"technical_questions": list, "behavioral_questions": list}
+INTERVIEW_FEEDBACK_SCHEMA = {"summary": str, "feedback": str}
+
+
+def validate(obj, schema):
+    """Check obj against a schema; returns obj or raises SchemaError."""
+    if not isinstance(obj, dict):
+        raise SchemaError(f"Expected a JSON object, got {type(obj).__name__}")
+    for field, expected in schema.items():
+        if field not in obj:
+            raise SchemaError(f"Response is missing the '{field}' field.", field)
+        value = obj[field]
+        # JSON true/false must not pass for a number
+        if not isinstance(value, expected) or (isinstance(value, bool) and bool not in _as_tuple(expected)):
+            raise SchemaError(f"Field '{field}' should be {_type_names(expected)}, got {type(value).__name__}.", field)
+    return obj
+
+
+def _as_tuple(expected):
+    return expected if isinstance(expected, tuple) else (expected,)
+
+
+def _type_names(expected):
+    return " or ".join(t.__name__ for t in _as_tuple(expected))
+
+
+class JSONObjectScanner:
+    """
+    Incremental finder of the first balanced JSON object.
+
+    feed() chunks as they arrive; it returns the parsed object once the first
+    complete one has been seen (and keeps returning it), None until then.
+    With a schema, objects that fail validation (e.g. "{}" in the prose of
+    the reply) are skipped like undecodable ones. Every character is
+    examined once however the text is split.
+    """
+
+    def __init__(self, schema=None):
+        self.schema = schema
+        self._buffer = []     # text from the current candidate's "{" on
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._candidates = 0
+        self._last_error = None
+        self._schema_error = None
+        self.result = None
+
+    @property
+    def done(self):
+        return self.result is not None
+
+    def feed(self, chunk: str):
+        if self.result is not None or not chunk:
+            return self.result
+
+        pos = 0
+        if self._depth == 0:
+            pos = chunk.find("{")
+            if pos < 0:
+                return None
+
+        start = pos
+        while pos < len(chunk):
+            if self._escaped:
+                self._escaped = False
+                pos += 1
+                continue
+
+            if self._in_string:
+                match = _STRING_CHARS.search(chunk, pos)
+                if match is None:
+                    break
+                pos = match.end()
+                if match.group() == "\\":
+                    self._escaped = True
+                else:
+                    self._in_string = False
+                continue
+
+            if self._depth == 0:
+                # Between candidates: only the next "{" matters
+                pos = chunk.find("{", pos)
+                if pos < 0:
+                    return None
+                start = pos
+
+            match = _STRUCTURE_CHARS.search(chunk, pos)
+            if match is None:
+                break
+            pos = match.end()
+            char = match.group()
+            if char == '"':
+                self._in_string = True
+            elif char == "{":
+                self._depth += 1
+            else:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._buffer.append(chunk[start:pos])
+                    if self._decode():
+                        return self.result
+                    start = pos
+
+        if self._depth > 0:
+            self._buffer.append(chunk[start:])
+        return None
+
+    def _decode(self):
+        text = "".join(self._buffer)
+        self._buffer = []
+        self._candidates += 1
+        try:
+            obj = json.loads(text)
+        except ValueError as e:
+            # e.g. "{placeholder}" in prose before the real object
+            self._last_error = e
+            return False
+        if self.schema is not None:
+            try:
+                validate(obj, self.schema)
+            except SchemaError as e:
+                self._schema_error = e
+                return False
+        self.result = obj
+        return True
+
+    def close(self):
+        """The parsed object; raises if the text held none."""
+        if self.result is not None:
+            return self.result
+        if self._depth > 0:
+            raise MalformedJSONError("The JSON object in the response is incomplete.")
+        if self._schema_error is not None:
+            raise self._schema_error
+        if self._candidates:
+            raise MalformedJSONError(f"No valid JSON object in the response: {self._last_error}")
+        raise NoJSONFoundError("Valid JSON was not found in the response.")
+
+
+_decoder = json.JSONDecoder()
+
+
+def parse_json_object(response_text: str, schema=None):
+    """
+    First balanced JSON object in response_text; with a schema, the first one
+    that validates against it (SchemaError when objects were found but none did).
+    """
+    start = response_text.find("{")
+    try:
+        # Common case: the first "{" opens the object, which the C decoder
+        # reads in one pass, ignoring anything after it
+        obj = _decoder.raw_decode(response_text, start)[0] if start >= 0 else None
+    except ValueError:
+        obj = None
+    if obj is not None and schema is not None:
+        try:
+            validate(obj, schema)
+        except SchemaError:
+            obj = None  # Not the answer; look further along
+    if obj is None:
+        scanner = JSONObjectScanner(schema)
+        scanner.feed(response_text)
+        obj = scanner.close()
+    return obj
+
+
+def parse_score(response_text: str):
+    """The "score" of a single-criterion evaluator reply."""
+    return parse_json_object(response_text, SCORE_SCHEMA)["score"]
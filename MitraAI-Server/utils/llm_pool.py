@@ -0,0 +1,72 @@
+import os
+import threading
+import contextvars
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app, request, has_app_context, has_request_context
+
+# Every LLM call fanned out by a request goes through this one executor, so
+# LLM_MAX_IN_FLIGHT bounds the concurrent calls per process no matter how many
+# requests or resumes are being evaluated at once.
+LLM_MAX_IN_FLIGHT = int(os.environ.get("LLM_MAX_IN_FLIGHT", "16"))
+
+# Per-request opt-out of the LLM response cache (see utils/llm_cache.py)
+LLM_CACHE_BYPASS_HEADER = "X-LLM-Cache"
+
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+_worker = threading.local()
+
+# (endpoint, bypass) of the request an LLM call is made for, carried into
+# worker threads that have no request context of their own
+_call_context = contextvars.ContextVar("llm_call_context", default=None)
+
+
+def current_call_context():
+    """Return (endpoint, bypass_cache) for LLM calls made from the current context."""
+    if has_request_context():
+        bypass = request.headers.get(LLM_CACHE_BYPASS_HEADER, "").lower() in ("bypass", "no-cache", "refresh")
+        return request.endpoint or "unknown", bypass
+    return _call_context.get() or ("background", False)
+
+
+@contextmanager
+def llm_call_context(context):
+    """Attribute LLM calls in this block to a (endpoint, bypass_cache) context."""
+    token = _call_context.set(context)
+    try:
+        yield
+    finally:
+        _call_context.reset(token)
+
+
+def _get_executor():
+    global _executor, _executor_pid
+    with _executor_lock:
+        if _executor is None or _executor_pid != os.getpid():
+            _executor = ThreadPoolExecutor(max_workers=max(1, LLM_MAX_IN_FLIGHT), thread_name_prefix="llm")
+            _executor_pid = os.getpid()
+        return _executor
+
+
+def in_llm_worker() -> bool:
+    """True on an LLM pool thread (blocking on the pool from there can deadlock)."""
+    return getattr(_worker, "active", False)
+
+
+def _run_in_app_context(app, call_context, function, args):
+    # get_vertex_client() reads the client from the app config, and the LLM
+    # cache attributes the call to the request that submitted it
+    _worker.active = True
+    with llm_call_context(call_context):
+        if app is None:
+            return function(*args)
+        with app.app_context():
+            return function(*args)
+
+
+def submit_llm_call(function, *args):
+    """Run function(*args) on the shared LLM executor, inside the caller's app context if any."""
+    app = current_app._get_current_object() if has_app_context() else None
+    return _get_executor().submit(_run_in_app_context, app, current_call_context(), function, args)
@@ -0,0 +1,120 @@
+import os
+import re
+import math
+import time
+import random
+import threading
+from contextlib import contextmanager
+
+# Simulated model backend behind MockVertexAIClient (and utils/mock_llm_server.py)
+# so concurrency, retry and timeout behaviour can be load tested without GCP.
+# All knobs default to "off", which keeps the mock instant and error free.
+MOCK_LLM_LATENCY = os.environ.get("MOCK_LLM_LATENCY", "fixed")  # fixed | lognormal | heavy
+MOCK_LLM_LATENCY_MS = float(os.environ.get("MOCK_LLM_LATENCY_MS", "0"))  # fixed value / median
+MOCK_LLM_LATENCY_SIGMA = float(os.environ.get("MOCK_LLM_LATENCY_SIGMA", "0.5"))  # lognormal spread
+MOCK_LLM_PARETO_ALPHA = float(os.environ.get("MOCK_LLM_PARETO_ALPHA", "1.5"))  # heavy tail index
+MOCK_LLM_TOKENS_PER_SECOND = float(os.environ.get("MOCK_LLM_TOKENS_PER_SECOND", "0"))  # 0 = instant
+MOCK_LLM_ERROR_RATE = float(os.environ.get("MOCK_LLM_ERROR_RATE", "0"))
+MOCK_LLM_RATE_LIMIT_RATE = float(os.environ.get("MOCK_LLM_RATE_LIMIT_RATE", "0"))
+MOCK_LLM_MAX_CONCURRENCY = int(os.environ.get("MOCK_LLM_MAX_CONCURRENCY", "0"))  # 0 = unlimited
+MOCK_LLM_SEED = os.environ.get("MOCK_LLM_SEED")
+
+
+class MockLLMError(Exception):
+    """Injected server error (HTTP 503 on the mock server)."""
+    status = 503
+
+
+class MockRateLimitError(MockLLMError):
+    """Injected rate limit or concurrency ceiling hit (HTTP 429 on the mock server)."""
+    status = 429
+
+
+def split_tokens(text: str):
+    # Words with their trailing whitespace are a close enough stand-in for model tokens
+    return re.findall(r"\S+\s*|\s+", text)
+
+
+class SimulatedBackend:
+    """Latency, streaming speed, failure and capacity model of a hosted LLM."""
+
+    def __init__(self, latency=MOCK_LLM_LATENCY, latency_ms=MOCK_LLM_LATENCY_MS, sigma=MOCK_LLM_LATENCY_SIGMA,
+                 alpha=MOCK_LLM_PARETO_ALPHA, tokens_per_second=MOCK_LLM_TOKENS_PER_SECOND,
+                 error_rate=MOCK_LLM_ERROR_RATE, rate_limit_rate=MOCK_LLM_RATE_LIMIT_RATE,
+                 max_concurrency=MOCK_LLM_MAX_CONCURRENCY, seed=MOCK_LLM_SEED):
+        if latency not in ("fixed", "lognormal", "heavy"):
+            raise ValueError(f"Unknown mock latency distribution: {latency}")
+        self.latency = latency
+        self.latency_ms = latency_ms
+        self.sigma = sigma
+        self.alpha = alpha
+        self.tokens_per_second = tokens_per_second
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.max_concurrency = max_concurrency
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._active = 0
+        self._stats = {"calls": 0, "errors": 0, "rate_limited": 0, "rejected": 0, "peak_concurrency": 0}
+
+    def sample_latency(self) -> float:
+        """Time to first token in seconds."""
+        if self.latency_ms <= 0:
+            return 0.0
+        with self._lock:
+            if self.latency == "lognormal":
+                sample = self._random.lognormvariate(math.log(self.latency_ms), self.sigma)
+            elif self.latency == "heavy":
+                # Pareto scaled so that latency_ms stays the median
+                sample = self.latency_ms / 2 ** (1 / self.alpha) * self._random.paretovariate(self.alpha)
+            else:
+                sample = self.latency_ms
+        return sample / 1000
+
+    @contextmanager
+    def _slot(self):
+        with self._lock:
+            self._stats["calls"] += 1
+            if self.max_concurrency and self._active >= self.max_concurrency:
+                self._stats["rejected"] += 1
+                raise MockRateLimitError(f"Mock LLM concurrency ceiling of {self.max_concurrency} reached")
+
+            roll = self._random.random()
+            if roll < self.rate_limit_rate:
+                self._stats["rate_limited"] += 1
+                raise MockRateLimitError("Injected mock LLM rate limit (429)")
+            if roll < self.rate_limit_rate + self.error_rate:
+                self._stats["errors"] += 1
+                raise MockLLMError("Injected mock LLM server error (503)")
+
+            self._active += 1
+            self._stats["peak_concurrency"] = max(self._stats["peak_concurrency"], self._active)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._active -= 1
+
+    def _token_delay(self) -> float:
+        return 1 / self.tokens_per_second if self.tokens_per_second > 0 else 0.0
+
+    def generate(self, text: str) -> str:
+        """Return text after the simulated latency and generation time."""
+        with self._slot():
+            time.sleep(self.sample_latency() + self._token_delay() * len(split_tokens(text)))
+            return text
+
+    def stream(self, text: str):
+        """Yield text token by token at tokens_per_second after the first-token latency."""
+        with self._slot():
+            time.sleep(self.sample_latency())
+            delay = self._token_delay()
+            for token in split_tokens(text):
+                if delay:
+                    time.sleep(delay)
+                yield token
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats, active=self._active)
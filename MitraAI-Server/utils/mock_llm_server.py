@@ -0,0 +1,117 @@
+"""
+Tiny local HTTP server in front of the simulated mock LLM.
+
+Usage (from MitraAI-Server/):
+    MOCK_LLM_LATENCY=lognormal MOCK_LLM_LATENCY_MS=800 MOCK_LLM_TOKENS_PER_SECOND=60 \
+        python -m utils.mock_llm_server [--host 127.0.0.1] [--port 8089]
+
+Then start the app with MOCK_LLM_URL=http://127.0.0.1:8089. The MOCK_LLM_*
+settings of utils/mock_llm.py apply here, in the server process.
+
+    POST /v1/generate  {"prompt": ...}  ->  {"text": ...}
+    POST /v1/stream    {"prompt": ...}  ->  NDJSON lines {"token": ...}, then {"done": true}
+    GET  /v1/stats                      ->  backend counters
+Injected failures answer 429 (rate limit / concurrency ceiling) or 503.
+"""
+import json
+import argparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from utils.mock_llm import MockLLMError
+from utils.vertexAIclient import MockVertexAIClient
+
+
+class MockLLMHandler(BaseHTTPRequestHandler):
+    client = None  # set by make_server
+    protocol_version = "HTTP/1.0"  # streamed bodies end when the connection closes
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_prompt(self):
+        length = int(self.headers.get("Content-Length", 0))
+        return json.loads(self.rfile.read(length) or b"{}").get("prompt", "")
+
+    def do_GET(self):
+        if self.path == "/v1/stats":
+            self._send_json(200, self.client.backend.stats())
+        else:
+            self._send_json(404, {"error": "Not found"})
+
+    def do_POST(self):
+        try:
+            prompt = self._read_prompt()
+        except ValueError:
+            self._send_json(400, {"error": "Body must be JSON with a prompt"})
+            return
+
+        if self.path == "/v1/generate":
+            try:
+                self._send_json(200, {"text": self.client.send_prompt(prompt)})
+            except MockLLMError as e:
+                self._send_json(e.status, {"error": str(e)})
+        elif self.path == "/v1/stream":
+            tokens = self.client.stream_prompt(prompt)
+            try:
+                # Admission (and so any injected failure) happens on the first token
+                first = next(tokens, None)
+            except MockLLMError as e:
+                self._send_json(e.status, {"error": str(e)})
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.end_headers()
+            try:
+                if first is not None:
+                    self._write_event({"token": first})
+                    for token in tokens:
+                        self._write_event({"token": token})
+                self._write_event({"done": True})
+            except (BrokenPipeError, ConnectionResetError):
+                tokens.close()
+        else:
+            self._send_json(404, {"error": "Not found"})
+
+    def _write_event(self, event):
+        self.wfile.write(json.dumps(event).encode("utf-8") + b"\n")
+        self.wfile.flush()
+
+
+def make_server(host="127.0.0.1", port=8089, client=None):
+    handler = type("BoundMockLLMHandler", (MockLLMHandler,), {"client": client or MockVertexAIClient("mock-server")})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port)
+    backend = server.RequestHandlerClass.client.backend
+    print(
+        f"Mock LLM server on http://{args.host}:{args.port} "
+        f"(latency={backend.latency} {backend.latency_ms}ms, {backend.tokens_per_second or 'instant'} tokens/s, "
+        f"error_rate={backend.error_rate}, rate_limit_rate={backend.rate_limit_rate}, "
+        f"max_concurrency={backend.max_concurrency or 'unlimited'})"
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+import io
+import re
+import ctypes
+
+# Text extraction backends. Every backend extracts pages [start, stop) of a
+# PDF and returns (page_count, [page_text, ...], [link, ...], metadata) so the
+# process pool in utils/pdf_engine.py can run any of them on page ranges.
+#
+# Tiers:
+#   fast   - plain text in reading order, no layout analysis (pdfium)
+#   layout - pdfplumber's layout-aware text, the historical behaviour
+
+URL_REGEX = r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+'
+
+_BACKENDS = {}
+TIER_BACKENDS = {}
+
+
+def register_backend(name: str, extract_pages, tier: str = None):
+    """Register an extraction backend, optionally as the default for a tier."""
+    _BACKENDS[name] = extract_pages
+    if tier and tier not in TIER_BACKENDS:
+        TIER_BACKENDS[tier] = name
+
+
+def get_backend(name: str):
+    if name not in _BACKENDS:
+        raise ValueError(f"Unknown PDF extraction backend: {name}")
+    return _BACKENDS[name]
+
+
+def available_backends():
+    return sorted(_BACKENDS)
+
+
+def _text_links(text):
+    return re.findall(URL_REGEX, text)
+
+
+def _clean_metadata(metadata):
+    # Document info values may be bytes, dates or nested objects; keep plain strings
+    return {key: str(value) for key, value in (metadata or {}).items() if isinstance(value, str) and value}
+
+
+def pdfplumber_pages(pdf_bytes: bytes, start: int, stop: int):
+    # Imported on first use: with the fast tier most processes never need it
+    import pdfplumber
+
+    texts = []
+    links = set()
+    with pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
+        page_count = len(pdf.pages)
+        for page in pdf.pages[start:stop]:
+            page_text = page.extract_text() or ""
+            texts.append(page_text)
+            for link in page.hyperlinks:
+                if link.get("uri"):
+                    links.add(link["uri"])
+            links.update(_text_links(page_text))
+        metadata = _clean_metadata(pdf.metadata) if start == 0 else {}
+    return page_count, texts, sorted(links), metadata
+
+
+register_backend("pdfplumber", pdfplumber_pages, tier="layout")
+
+
+try:
+    import pypdfium2
+    import pypdfium2.raw as pdfium_c
+
+    def _pdfium_page_links(document, page):
+        links = []
+        position = ctypes.c_int(0)
+        link = pdfium_c.FPDF_LINK()
+        while pdfium_c.FPDFLink_Enumerate(page.raw, ctypes.byref(position), ctypes.byref(link)):
+            action = pdfium_c.FPDFLink_GetAction(link)
+            if not action or pdfium_c.FPDFAction_GetType(action) != pdfium_c.PDFACTION_URI:
+                continue
+            size = pdfium_c.FPDFAction_GetURIPath(document.raw, action, None, 0)
+            if size <= 0:
+                continue
+            buffer = ctypes.create_string_buffer(size)
+            pdfium_c.FPDFAction_GetURIPath(document.raw, action, buffer, size)
+            links.append(buffer.value.decode("utf-8", "replace"))
+        return links
+
+    def pdfium_pages(pdf_bytes: bytes, start: int, stop: int):
+        texts = []
+        links = set()
+        document = pypdfium2.PdfDocument(pdf_bytes)
+        try:
+            page_count = len(document)
+            for number in range(start, min(stop, page_count)):
+                page = document[number]
+                textpage = page.get_textpage()
+                page_text = textpage.get_text_range().replace("\r\n", "\n").replace("\r", "\n")
+                textpage.close()
+                texts.append(page_text)
+                links.update(_pdfium_page_links(document, page))
+                links.update(_text_links(page_text))
+                page.close()
+            metadata = _clean_metadata(document.get_metadata_dict()) if start == 0 else {}
+        finally:
+            document.close()
+        return page_count, texts, sorted(links), metadata
+
+    register_backend("pdfium", pdfium_pages, tier="fast")
+except ImportError:
+    print("Warning: pypdfium2 not found. Fast PDF extraction tier disabled.")
+
+
+def looks_garbled(text: str, pages: int) -> bool:
+    """Heuristic check that a fast-tier extraction is unusable for ATS scoring."""
+    stripped = text.strip()
+    if not stripped:
+        return True
+
+    # Scanned or image-only pages produce next to no text
+    if len(stripped) < 20 * max(1, pages):
+        return True
+
+    # Broken font encodings show up as replacement characters or glyph ids
+    if stripped.count("�") + stripped.count("(cid:") * 5 > len(stripped) * 0.02:
+        return True
+
+    readable = sum(1 for c in stripped if c.isalnum() or c.isspace() or c in ".,;:!?'\"()[]-/&%$@+#*")
+    return readable / len(stripped) < 0.85
@@ -0,0 +1,63 @@
+from utils.pdf_extraction import extract_pdf, pdf_digest
+
+
+class Document:
+    """
+    An in-memory PDF, parsed at most once.
+
+    Built straight from the downloaded or uploaded bytes (no temp files). The
+    first access to any of text, pages, links or metadata runs a single
+    extraction through the shared cache / process pool; everything else is
+    served from that one result.
+    """
+
+    def __init__(self, data):
+        # bytes are kept as-is; other buffers are frozen once so they can be
+        # hashed for the cache and sent to the parse workers
+        self._data = data if isinstance(data, bytes) else bytes(memoryview(data))
+        self._parsed = None
+        self._digest = None
+
+    @classmethod
+    def from_file(cls, file):
+        """Build a Document from an open binary file (e.g. a Flask upload)."""
+        return cls(file.read())
+
+    def _result(self):
+        if self._parsed is None:
+            self._parsed = extract_pdf(self._data)
+        return self._parsed
+
+    @property
+    def data(self) -> bytes:
+        return self._data
+
+    @property
+    def digest(self) -> str:
+        if self._digest is None:
+            self._digest = pdf_digest(self._data)
+        return self._digest
+
+    @property
+    def text(self) -> str:
+        return self._result()["text"]
+
+    @property
+    def pages(self) -> list:
+        return self._result()["pages"]
+
+    @property
+    def page_count(self) -> int:
+        return self._result()["page_count"]
+
+    @property
+    def links(self) -> list:
+        return self._result()["links"]
+
+    @property
+    def metadata(self) -> dict:
+        return self._result().get("metadata", {})
+
+    @property
+    def truncated(self) -> bool:
+        return self._result()["truncated"]
@@ -0,0 +1,207 @@
+import os
+import time
+import signal
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, CancelledError
+from concurrent.futures.process import BrokenProcessPool
+from utils.pdf_backends import get_backend
+
+# PDF parsing (pdfplumber is pure Python) happens in worker processes. Long PDFs
+# are split into page ranges that are parsed in parallel, documents longer
+# than PDF_MAX_PAGES are truncated and a document that is still parsing after
+# PDF_PARSE_TIMEOUT seconds is abandoned with whatever pages finished.
+PDF_WORKERS = int(os.environ.get("PDF_WORKERS", str(os.cpu_count() or 1)))
+PDF_MAX_PAGES = int(os.environ.get("PDF_MAX_PAGES", "20"))
+PDF_PAGES_PER_TASK = int(os.environ.get("PDF_PAGES_PER_TASK", "4"))
+PDF_PARSE_TIMEOUT = float(os.environ.get("PDF_PARSE_TIMEOUT", "30"))
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+
+def parse_page_range(pdf_bytes: bytes, start: int, stop: int, backend: str = "pdfplumber"):
+    """
+    Extract text and links from pages [start, stop) of a PDF with one backend.
+
+    Returns:
+        (page_count, [page_text, ...], [link, ...], metadata); metadata is
+        only read for the range starting at page 0
+    """
+    return get_backend(backend)(pdf_bytes, start, stop)
+
+
+def _report_pid(pids):
+    # Pool initializer: tell the parent which processes belong to the pool
+    pids.put(os.getpid())
+
+
+class ParsePool(ProcessPoolExecutor):
+    """
+    ProcessPoolExecutor that knows its worker pids, so a pool stuck on a
+    pathological document can be killed.
+    """
+
+    def __init__(self, max_workers):
+        self._pid_queue = multiprocessing.SimpleQueue()
+        self._worker_pids = set()
+        super().__init__(max_workers=max_workers, initializer=_report_pid, initargs=(self._pid_queue,))
+
+    def worker_pids(self):
+        while not self._pid_queue.empty():
+            self._worker_pids.add(self._pid_queue.get())
+        return set(self._worker_pids)
+
+    def terminate(self):
+        """
+        Cancel the queued tasks and kill the workers. The executor's manager
+        thread then fails the tasks they were running with BrokenProcessPool.
+        """
+        pids = self.worker_pids()
+        self.shutdown(wait=False, cancel_futures=True)
+        for pid in pids:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except OSError:
+                pass  # Already gone
+
+
+def _wait(futures, timeout):
+    """
+    concurrent.futures.wait() for all futures, except that it also returns for
+    tasks cancelled by shutdown(cancel_futures=True): those are cancelled
+    without notifying wait()'s waiters, but done callbacks do run.
+    """
+    remaining = [len(futures)]
+    lock = threading.Lock()
+    finished = threading.Event()
+
+    def on_done(_):
+        with lock:
+            remaining[0] -= 1
+            if remaining[0] == 0:
+                finished.set()
+
+    for future in futures:
+        future.add_done_callback(on_done)
+    finished.wait(timeout)
+    done = {future for future in futures if future.done()}
+    return done, {future for future in futures if future not in done}
+
+
+def _get_pool():
+    global _pool, _pool_pid
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid():
+            _pool = ParsePool(max(1, PDF_WORKERS))
+            _pool_pid = os.getpid()
+        return _pool
+
+
+def _recycle_pool(pool):
+    """
+    Kill a pool whose workers are stuck on a pathological document.
+
+    A ProcessPoolExecutor can't lose one worker without breaking, so the
+    whole pool goes; documents other threads were parsing on it are retried
+    on the fresh pool by parse_document().
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.terminate()
+
+
+def _pool_replaced(pool):
+    with _pool_lock:
+        return _pool is not pool
+
+
+def shutdown_pool():
+    """Stop this process's parse workers (they are recreated on next use)."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _assemble(page_count, chunks, max_pages, timed_out, backend):
+    texts = []
+    links = set()
+    for chunk in chunks:
+        if chunk is None:
+            break  # Keep only the contiguous prefix of finished pages
+        texts.extend(chunk[1])
+        links.update(chunk[2])
+    return {
+        "text": "".join(texts),
+        "pages": texts,
+        "page_count": page_count,
+        "links": sorted(links),
+        "metadata": chunks[0][3] if chunks[0] is not None else {},
+        "truncated": page_count > max_pages or timed_out,
+        "timed_out": timed_out,
+        "backend": backend,
+    }
+
+
+def parse_document(pdf_bytes: bytes, timeout: float = None, max_pages: int = None,
+                   backend: str = "pdfplumber") -> dict:
+    """
+    Parse a PDF on the process pool.
+
+    Args:
+        pdf_bytes: Raw PDF content
+        timeout: Wall-clock budget for the whole document (PDF_PARSE_TIMEOUT)
+        max_pages: Only the first max_pages pages are parsed (PDF_MAX_PAGES)
+        backend: Registered extraction backend (see utils/pdf_backends.py)
+
+    Returns:
+        Dict with text, pages (per-page text), page_count, links, metadata,
+        truncated / timed_out flags and backend
+    """
+    timeout = PDF_PARSE_TIMEOUT if timeout is None else timeout
+    max_pages = PDF_MAX_PAGES if max_pages is None else max_pages
+
+    if PDF_WORKERS <= 0:
+        chunk = parse_page_range(pdf_bytes, 0, max_pages, backend)
+        return _assemble(chunk[0], [chunk], max_pages, False, backend)
+
+    for attempt in range(2):
+        pool = _get_pool()
+        try:
+            return _parse_on_pool(pool, pdf_bytes, timeout, max_pages, backend)
+        except (RuntimeError, CancelledError) as e:
+            # Another document's timeout recycled the pool under us: its
+            # futures are cancelled or broken and submit() raises
+            # RuntimeError after shutdown. Retry once on the fresh pool.
+            recycled = isinstance(e, (BrokenProcessPool, CancelledError)) or _pool_replaced(pool)
+            if attempt == 1 or not recycled:
+                raise
+
+
+def _parse_on_pool(pool, pdf_bytes, timeout, max_pages, backend):
+    deadline = time.monotonic() + timeout
+
+    # The first range also reports the page count, so short resumes need one task
+    first = pool.submit(parse_page_range, pdf_bytes, 0, min(PDF_PAGES_PER_TASK, max_pages), backend)
+    done, _ = _wait([first], max(0, deadline - time.monotonic()))
+    if not done:
+        _recycle_pool(pool)
+        return _assemble(0, [None], max_pages, True, backend)
+
+    page_count = first.result()[0]
+    futures = [first]
+    for start in range(PDF_PAGES_PER_TASK, min(page_count, max_pages), PDF_PAGES_PER_TASK):
+        stop = min(start + PDF_PAGES_PER_TASK, max_pages)
+        futures.append(pool.submit(parse_page_range, pdf_bytes, start, stop, backend))
+
+    done, not_done = _wait(futures, max(0, deadline - time.monotonic()))
+    if not_done:
+        print(f"PDF parse timed out after {timeout}s ({len(not_done)} page ranges unfinished)")
+        _recycle_pool(pool)
+    chunks = [future.result() if future in done else None for future in futures]
+    return _assemble(page_count, chunks, max_pages, bool(not_done), backend)
@@ -0,0 +1,71 @@
+import os
+import hashlib
+from utils.disk_cache import DiskCache, CACHE_DIR, cache_budget
+from utils.pdf_engine import parse_document, PDF_MAX_PAGES
+from utils.pdf_backends import TIER_BACKENDS, looks_garbled
+
+# Extracted text is keyed by the SHA-256 of the PDF bytes, so the same resume
+# submitted through any endpoint is only ever parsed once per host.
+PDF_CACHE_DIR = os.environ.get("PDF_CACHE_DIR", CACHE_DIR)
+PDF_CACHE_MAX_BYTES = cache_budget("PDF_CACHE_MAX_BYTES", 0.25)
+# How long the partial result of a timed out parse is served
+PDF_TIMEOUT_TTL = float(os.environ.get("PDF_TIMEOUT_TTL", "300"))
+
+# "fast", "layout", or "auto" (fast tier, falling back to layout when the
+# fast text comes back empty or garbled)
+PDF_EXTRACTION_TIER = os.environ.get("PDF_EXTRACTION_TIER", "auto")
+
+_pdf_cache = DiskCache(os.path.join(PDF_CACHE_DIR, "pdf_text.sqlite3"), PDF_CACHE_MAX_BYTES)
+
+
+def pdf_digest(pdf_bytes: bytes) -> str:
+    return hashlib.sha256(pdf_bytes).hexdigest()
+
+
+def extract_document(pdf_bytes: bytes, tier: str = None) -> dict:
+    """
+    Extract a PDF with the backend(s) of the requested tier, without caching.
+
+    Returns:
+        parse_document() output; "backend" names the backend that produced it
+    """
+    tier = tier or PDF_EXTRACTION_TIER
+    if tier == "auto":
+        if "fast" in TIER_BACKENDS:
+            result = parse_document(pdf_bytes, backend=TIER_BACKENDS["fast"])
+            pages = min(result["page_count"], PDF_MAX_PAGES)
+            if not result["timed_out"] and not looks_garbled(result["text"], pages):
+                return result
+        tier = "layout"
+
+    if tier not in TIER_BACKENDS:
+        raise ValueError(f"Unknown PDF extraction tier: {tier}")
+    return parse_document(pdf_bytes, backend=TIER_BACKENDS[tier])
+
+
+def extract_pdf(pdf_bytes: bytes) -> dict:
+    """
+    Return the text, per-page text, page count, links and metadata of a PDF.
+
+    Served from the shared cache when these bytes were seen before, otherwise
+    extracted with the PDF_EXTRACTION_TIER backends on the process pool.
+    """
+    # Different tiers produce different text, so the tier is part of the key
+    key = f"{PDF_EXTRACTION_TIER}:{pdf_digest(pdf_bytes)}"
+    cached = _pdf_cache.get_json(key)
+    if cached is not None and "pages" in cached:
+        # The full text is just the joined pages, so only the pages are stored
+        cached["text"] = "".join(cached["pages"])
+        return cached
+
+    result = extract_document(pdf_bytes)
+    # A timed out parse may succeed on a quieter worker, so its partial text is
+    # only kept briefly; long enough that resubmitting a pathological PDF does
+    # not recycle the parse pool (and every parse in flight on it) again
+    ttl = PDF_TIMEOUT_TTL if result["timed_out"] else None
+    _pdf_cache.set_json(key, {k: v for k, v in result.items() if k != "text"}, ttl=ttl)
+    return result
+
+
+def pdf_cache_info():
+    return _pdf_cache.info()
@@ -0,0 +1,214 @@
+import os
+import math
+import heapq
+import sqlite3
+import hashlib
+import threading
+from utils.disk_cache import CACHE_DIR, SQLiteConnections
+from utils.resume_scorer import clean_text, get_job_profile, term_counts
+
+RESUME_INDEX_PATH = os.environ.get("RESUME_INDEX_PATH", os.path.join(CACHE_DIR, "resume_index.v2.sqlite3"))
+# Oldest resumes are dropped beyond this many: the index lives in /tmp and
+# takes about 10 KB per resume, so 5000 fit the 20% of CACHE_BUDGET_BYTES left
+# over by the byte-capped caches
+RESUME_INDEX_MAX_DOCS = int(os.environ.get("RESUME_INDEX_MAX_DOCS", "5000"))
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+class ResumeIndex:
+    """
+    Persistent inverted index over resume tokens with BM25 retrieval.
+
+    Tokens are the clean_text() output run through the same analyzer as the
+    TF-IDF scorer. Postings are clustered by term, so a query only reads the
+    postings of the JD's terms and never touches documents that share none of
+    them; MaxScore pruning keeps common terms from scanning the whole pool.
+    Documents are keyed by a caller supplied key (the resume URL) and can be
+    added and replaced incrementally; only their postings are stored, and
+    the oldest documents are evicted beyond max_docs.
+    """
+
+    def __init__(self, path: str = RESUME_INDEX_PATH, max_docs: int = RESUME_INDEX_MAX_DOCS):
+        self.path = path
+        self.max_docs = max_docs
+        self._connections = SQLiteConnections(path, """
+            CREATE TABLE IF NOT EXISTS docs (
+                doc_id INTEGER PRIMARY KEY, key TEXT UNIQUE NOT NULL,
+                text_hash TEXT NOT NULL, length INTEGER NOT NULL);
+            CREATE TABLE IF NOT EXISTS postings (
+                term TEXT NOT NULL, doc_id INTEGER NOT NULL, tf INTEGER NOT NULL,
+                PRIMARY KEY (term, doc_id)) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS postings_doc ON postings (doc_id);
+            CREATE TABLE IF NOT EXISTS terms (term TEXT PRIMARY KEY, df INTEGER NOT NULL) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS stats (name TEXT PRIMARY KEY, value INTEGER NOT NULL);
+            INSERT OR IGNORE INTO stats VALUES ('doc_count', 0), ('total_length', 0);
+        """)
+
+    def _connect(self):
+        return self._connections.get()
+
+    def _remove_doc(self, conn, doc_id, length):
+        terms = [row[0] for row in conn.execute("SELECT term FROM postings WHERE doc_id = ?", (doc_id,))]
+        conn.executemany("UPDATE terms SET df = df - 1 WHERE term = ?", [(t,) for t in terms])
+        conn.execute("DELETE FROM terms WHERE df <= 0")
+        conn.execute("DELETE FROM postings WHERE doc_id = ?", (doc_id,))
+        conn.execute("DELETE FROM docs WHERE doc_id = ?", (doc_id,))
+        conn.execute("UPDATE stats SET value = value - 1 WHERE name = 'doc_count'")
+        conn.execute("UPDATE stats SET value = value - ? WHERE name = 'total_length'", (length,))
+
+    def _evict(self, conn):
+        doc_count = conn.execute("SELECT value FROM stats WHERE name = 'doc_count'").fetchone()[0]
+        excess = doc_count - max(1, self.max_docs)
+        if excess > 0:
+            # Oldest first: a new or re-indexed resume gets the highest doc_id
+            rows = conn.execute("SELECT doc_id, length FROM docs ORDER BY doc_id LIMIT ?", (excess,)).fetchall()
+            for doc_id, length in rows:
+                self._remove_doc(conn, doc_id, length)
+
+    def add(self, key: str, text: str) -> bool:
+        """Index (or re-index) a resume. Returns False when the stored text is unchanged."""
+        text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        conn = self._connect()
+        row = conn.execute("SELECT doc_id, text_hash, length FROM docs WHERE key = ?", (key,)).fetchone()
+        if row is not None and row[1] == text_hash:
+            return False
+
+        doc_terms = term_counts(clean_text(text))
+        length = sum(doc_terms.values())
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Re-read under the write lock, another worker may have indexed it meanwhile
+            row = conn.execute("SELECT doc_id, text_hash, length FROM docs WHERE key = ?", (key,)).fetchone()
+            if row is not None and row[1] == text_hash:
+                conn.execute("COMMIT")
+                return False
+            if row is not None:
+                self._remove_doc(conn, row[0], row[2])
+            cursor = conn.execute(
+                "INSERT INTO docs (key, text_hash, length) VALUES (?, ?, ?)",
+                (key, text_hash, length),
+            )
+            doc_id = cursor.lastrowid
+            conn.executemany(
+                "INSERT INTO postings (term, doc_id, tf) VALUES (?, ?, ?)",
+                [(term, doc_id, tf) for term, tf in doc_terms.items()],
+            )
+            conn.executemany(
+                "INSERT INTO terms (term, df) VALUES (?, 1) ON CONFLICT(term) DO UPDATE SET df = df + 1",
+                [(term,) for term in doc_terms],
+            )
+            conn.execute("UPDATE stats SET value = value + 1 WHERE name = 'doc_count'")
+            conn.execute("UPDATE stats SET value = value + ? WHERE name = 'total_length'", (length,))
+            self._evict(conn)
+            conn.execute("COMMIT")
+        except sqlite3.Error:
+            conn.execute("ROLLBACK")
+            raise
+        return True
+
+    def _postings_for(self, conn, term, doc_ids):
+        # Point lookups on the (term, doc_id) primary key instead of a full postings scan
+        doc_ids = list(doc_ids)
+        rows = []
+        for start in range(0, len(doc_ids), 500):
+            chunk = doc_ids[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows.extend(conn.execute(
+                "SELECT p.doc_id, p.tf, d.length FROM postings p JOIN docs d ON d.doc_id = p.doc_id"
+                f" WHERE p.term = ? AND p.doc_id IN ({placeholders})",
+                [term] + chunk,
+            ))
+        return rows
+
+    def __len__(self):
+        return self._connect().execute("SELECT value FROM stats WHERE name = 'doc_count'").fetchone()[0]
+
+    def query(self, job_text, top_n: int, keys=None):
+        """
+        Retrieve the top_n documents for a JD by BM25.
+
+        Args:
+            job_text: Job description (DEFAULT_JD when empty)
+            top_n: Number of candidates to return
+            keys: Optional collection of document keys to restrict the search to
+
+        Returns:
+            List of (key, bm25_score) pairs, best first
+        """
+        conn = self._connect()
+        stats = dict(conn.execute("SELECT name, value FROM stats").fetchall())
+        doc_count = stats["doc_count"]
+        if doc_count == 0 or top_n <= 0:
+            return []
+        avg_length = stats["total_length"] / doc_count
+
+        allowed = None
+        if keys is not None:
+            allowed = set()
+            key_list = list(keys)
+            # Resolve keys in chunks to stay under SQLite's variable limit
+            for start in range(0, len(key_list), 500):
+                chunk = key_list[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                allowed.update(row[0] for row in conn.execute(
+                    f"SELECT doc_id FROM docs WHERE key IN ({placeholders})", chunk))
+
+        # Rarest terms first, with the best possible BM25 contribution of each
+        query_terms = []
+        for term, query_tf in get_job_profile(job_text).term_counts.items():
+            row = conn.execute("SELECT df FROM terms WHERE term = ?", (term,)).fetchone()
+            if row is None:
+                continue
+            idf = math.log(1 + (doc_count - row[0] + 0.5) / (row[0] + 0.5))
+            query_terms.append((term, query_tf, row[0], idf, query_tf * idf * (BM25_K1 + 1)))
+        query_terms.sort(key=lambda item: item[3], reverse=True)
+
+        remaining_bound = sum(item[4] for item in query_terms)
+        scores = {}
+        for term, query_tf, df, idf, bound in query_terms:
+            # MaxScore pruning: once the top_n-th partial score beats everything the
+            # remaining terms could add, unseen documents can no longer make the cut
+            # and common terms only refine the documents already accumulated.
+            targets = allowed
+            if len(scores) >= top_n and heapq.nlargest(top_n, scores.values())[-1] > remaining_bound:
+                targets = set(scores)
+            remaining_bound -= bound
+
+            if targets is not None and len(targets) < df:
+                rows = self._postings_for(conn, term, targets)
+            else:
+                rows = conn.execute(
+                    "SELECT p.doc_id, p.tf, d.length FROM postings p JOIN docs d ON d.doc_id = p.doc_id WHERE p.term = ?",
+                    (term,),
+                )
+
+            for doc_id, tf, length in rows:
+                if targets is not None and doc_id not in targets:
+                    continue
+                weight = tf * (BM25_K1 + 1) / (tf + BM25_K1 * (1 - BM25_B + BM25_B * length / avg_length))
+                scores[doc_id] = scores.get(doc_id, 0.0) + query_tf * idf * weight
+
+        best = heapq.nlargest(top_n, scores.items(), key=lambda item: item[1])
+        if not best:
+            return []
+
+        placeholders = ",".join("?" * len(best))
+        key_by_id = dict(conn.execute(
+            f"SELECT doc_id, key FROM docs WHERE doc_id IN ({placeholders})", [doc_id for doc_id, _ in best]))
+        return [(key_by_id[doc_id], score) for doc_id, score in best]
+
+
+_resume_index = None
+_resume_index_lock = threading.Lock()
+
+
+def get_resume_index() -> ResumeIndex:
+    global _resume_index
+    with _resume_index_lock:
+        if _resume_index is None:
+            _resume_index = ResumeIndex()
+        return _resume_index
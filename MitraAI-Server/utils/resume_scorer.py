@@ -1,6 +1,13 @@
 import re
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+import os
+import hashlib
+import threading
+from collections import Counter, OrderedDict
+import numpy as np
+from sklearn.feature_extraction.text import CountVectorizer
+from utils.text_analyzer import TextAnalyzer
+from utils.embeddings import load_embedding_backend, EmbeddingCache, cosine_similarities
+from utils.startup import register_preload
 
 # Standard Generic JD (Full Stack / Software Engineer focus)
 DEFAULT_JD = """
@@ -55,7 +62,10 @@ def is_valid_resume(text_lower: str) -> bool:
     
     # Check for non-resume indicators (like question papers)
     non_resume_score = sum(1 for kw in NON_RESUME_INDICATORS if kw in text_lower)
-    
+
+    return _is_resume_like(resume_score, non_resume_score)
+
+def _is_resume_like(resume_score: int, non_resume_score: int) -> bool:
     # Heuristic: If it has more "question paper" words than "resume" words, it's likely not a resume.
     # Also requires a minimum number of resume keywords to be considered valid.
     if non_resume_score > 2 and non_resume_score >= resume_score:
@@ -66,49 +76,143 @@ def is_valid_resume(text_lower: str) -> bool:
         
     return True
 
-# Embedding Model Initialization
+# All validation indicators, section keywords and metrics in one compiled scanner
+_TEXT_ANALYZER = TextAnalyzer(
+    {"resume_indicators": RESUME_INDICATORS, "non_resume_indicators": NON_RESUME_INDICATORS, **SECTIONS},
+    METRICS_REGEX,
+)
+
+def analyze_text(text_lower: str):
+    """
+    is_valid_resume, analyze_structure and analyze_impact in a single pass.
+
+    Returns:
+        (is_valid, found_sections, missing_sections, impact_count)
+    """
+    counts, impact_count = _TEXT_ANALYZER.analyze(text_lower)
+    is_valid = _is_resume_like(counts["resume_indicators"], counts["non_resume_indicators"])
+    found_sections = [section for section in SECTIONS if counts[section]]
+    missing_sections = [section for section in SECTIONS if not counts[section]]
+    return is_valid, found_sections, missing_sections, impact_count
+
+# Embedding Model Initialization (backends in utils/embeddings.py; the
+# default needs no model download, EMBEDDING_BACKEND=none turns it off)
 try:
-    # from sentence_transformers import SentenceTransformer, util
-    # semantic_model = SentenceTransformer('all-MiniLM-L6-v2')
-    HAS_EMBEDDINGS = False # Forced disable due to DLL environment error
-except ImportError:
+    semantic_backend = load_embedding_backend()
+    HAS_EMBEDDINGS = semantic_backend is not None
+    semantic_encoder = EmbeddingCache(semantic_backend) if HAS_EMBEDDINGS else None
+except ImportError as e:
     HAS_EMBEDDINGS = False
-    print("Warning: sentence-transformers not found. Semantic scoring disabled.")
+    semantic_encoder = None
+    print(f"Warning: {e}. Semantic scoring disabled.")
 except Exception as e:
     HAS_EMBEDDINGS = False
+    semantic_encoder = None
     print(f"Warning: Failed to load embedding model: {e}")
 
+# Tokenizer shared by every TF-IDF comparison (same settings as the vectorizer)
+_TERM_ANALYZER = CountVectorizer(stop_words="english").build_analyzer()
+
+
+def term_counts(cleaned_text: str) -> Counter:
+    """Token counts of cleaned text as seen by the TF-IDF vectorizer."""
+    return Counter(_TERM_ANALYZER(cleaned_text))
+
+
+JOB_PROFILE_CACHE_SIZE = int(os.environ.get("JOB_PROFILE_CACHE_SIZE", "128"))
+
+
+class JobProfile:
+    """Everything the scorers need from a job description, computed once."""
+
+    def __init__(self, job_text: str):
+        self.raw_text = job_text
+        self.content_hash = hashlib.sha256(job_text.encode("utf-8")).hexdigest()
+        self.cleaned = clean_text(job_text)
+
+        # Keyword coverage vocabulary
+        self.keywords = sorted(set(w for w in self.cleaned.split() if len(w) > 3))
+        self.job_words = frozenset(self.keywords)
+
+        # Vectorized representation used for the TF-IDF similarity
+        self.term_counts = term_counts(self.cleaned)
+        self.term_sq_total = float(sum(count * count for count in self.term_counts.values()))
+
+        # Unit vector for the semantic similarity
+        self.embedding = semantic_encoder.encode([self.cleaned])[0] if HAS_EMBEDDINGS else None
+
+
+_profile_cache = OrderedDict()
+_profile_cache_lock = threading.Lock()
+_profile_cache_stats = {"hits": 0, "misses": 0}
+
+
+def get_job_profile(job_text=None) -> JobProfile:
+    """Return the compiled profile for a JD, falling back to DEFAULT_JD."""
+    if not job_text or not job_text.strip():
+        job_text = DEFAULT_JD
+
+    key = hashlib.sha256(job_text.encode("utf-8")).hexdigest()
+    with _profile_cache_lock:
+        profile = _profile_cache.get(key)
+        if profile is not None:
+            _profile_cache.move_to_end(key)
+            _profile_cache_stats["hits"] += 1
+            return profile
+        _profile_cache_stats["misses"] += 1
+
+    # Build outside the lock; a concurrent duplicate build is harmless
+    profile = JobProfile(job_text)
+    with _profile_cache_lock:
+        _profile_cache[key] = profile
+        _profile_cache.move_to_end(key)
+        while len(_profile_cache) > JOB_PROFILE_CACHE_SIZE:
+            _profile_cache.popitem(last=False)
+    return profile
+
+
+def job_profile_cache_info():
+    with _profile_cache_lock:
+        return {
+            "hits": _profile_cache_stats["hits"],
+            "misses": _profile_cache_stats["misses"],
+            "size": len(_profile_cache),
+            "maxsize": JOB_PROFILE_CACHE_SIZE,
+        }
+
+
+# Built at warm-up (before fork under preload, see utils/startup.py) rather
+# than at import: the profile of the fallback JD every request without a job
+# description uses, so the first one is a cache hit
+register_preload("default JD profile", get_job_profile)
+
+
 def score_resume(resume_text: str, job_text: str = None):
     cleaned_resume = clean_text(resume_text)
-    
+
+    # Validity, sections and metrics come from one scan of the cleaned text
+    is_valid, found_sections, missing_sections, impact_count = analyze_text(cleaned_resume)
+
     # 0. Validity Check
-    if not is_valid_resume(cleaned_resume):
+    if not is_valid:
         return {
             "error": "Invalid Document Type",
             "message": "The uploaded document does not appear to be a resume. It resembles a question paper or other non-resume document."
         }
 
-    # Use default JD if none provided
-    if not job_text or not job_text.strip():
-        job_text = DEFAULT_JD
-
-    cleaned_job = clean_text(job_text)
+    # Compiled JD (falls back to DEFAULT_JD when none provided)
+    profile = get_job_profile(job_text)
+    cleaned_job = profile.cleaned
     
     # 1. Structural Analysis
-    found_sections, missing_sections = analyze_structure(cleaned_resume)
     structure_score = (len(found_sections) / len(SECTIONS)) * 20 # Max 20 points
     
     # 2. Impact Analysis (Quantifiable metrics)
-    impact_count = analyze_impact(cleaned_resume)
     impact_score = min(20, impact_count * 4) # Max 20 points
     
     # 3. Content Similarity (TF-IDF)
     try:
-        vectorizer = TfidfVectorizer(stop_words="english")
-        tfidf_matrix = vectorizer.fit_transform([cleaned_job, cleaned_resume])
-        similarity = cosine_similarity(
-            tfidf_matrix[0:1], tfidf_matrix[1:2]
-        )[0][0]
+        similarity = tfidf_similarities([cleaned_resume], profile)[0]
         keyword_similarity_score = float(similarity) * 100
     except:
         keyword_similarity_score = 0
@@ -117,19 +221,13 @@ def score_resume(resume_text: str, job_text: str = None):
     semantic_similarity_score = 0
     if HAS_EMBEDDINGS:
         try:
-            # Encode sentences to get their embeddings
-            embedding_resume = semantic_model.encode(cleaned_resume, convert_to_tensor=True)
-            embedding_job = semantic_model.encode(cleaned_job, convert_to_tensor=True)
-            
-            # Compute cosine similarity
-            semantic_sim = util.pytorch_cos_sim(embedding_resume, embedding_job).item()
-            semantic_similarity_score = max(0, float(semantic_sim) * 100)
+            semantic_similarity_score = float(semantic_similarities([cleaned_resume], profile)[0])
         except Exception as e:
             print(f"Error calculating semantic similarity: {e}")
             semantic_similarity_score = 0
 
     # 5. Keyword Coverage (Exact Matches)
-    job_words = set([w for w in cleaned_job.split() if len(w) > 3])
+    job_words = profile.job_words
     resume_words = set(cleaned_resume.split())
     
     if len(job_words) == 0:
@@ -182,3 +280,188 @@ def score_resume(resume_text: str, job_text: str = None):
         "matched_keywords": sorted(list(job_words & resume_words)),
         "missing_keywords": sorted(list(job_words - resume_words))[:8]
     }
+
+
+def _pairwise_tfidf_similarity(resume_counts, job_counts, job_sq_total):
+    """
+    Cosine similarity of every resume row against the JD counts, as if a
+    fresh TfidfVectorizer had been fitted on each [job, resume] pair.
+
+    With only two documents the smoothed idf is 1 for terms present in both
+    and 1 + ln(3/2) for terms present in one, so the pairwise fit can be
+    expressed with sparse-times-dense products over a single count matrix.
+    """
+    unique_idf_sq = (np.log(3.0 / 2.0) + 1.0) ** 2
+    in_job = job_counts > 0
+
+    # Only shared terms contribute to the dot product and their idf is 1
+    dot = resume_counts @ job_counts
+
+    # Resume norm: shared terms weigh 1, resume-only terms weigh the unique idf
+    resume_norm_sq = resume_counts.multiply(resume_counts) @ np.where(in_job, 1.0, unique_idf_sq)
+
+    # JD norm depends on which of its terms the resume shares
+    shared_job_sq = (resume_counts > 0).astype(np.float64) @ (job_counts ** 2)
+    job_norm_sq = unique_idf_sq * job_sq_total - (unique_idf_sq - 1.0) * shared_job_sq
+
+    denom = np.sqrt(resume_norm_sq * job_norm_sq)
+    similarity = np.zeros_like(denom)
+    np.divide(dot, denom, out=similarity, where=denom > 0)
+    return similarity
+
+
+def tfidf_similarities(cleaned_resumes, profile: JobProfile):
+    """
+    TF-IDF cosine similarity of each cleaned resume against a JD profile.
+
+    Equivalent to fitting TfidfVectorizer(stop_words="english") on every
+    [job, resume] pair, but all resumes share one sparse count matrix.
+    Raises ValueError when there is no vocabulary to compare.
+    """
+    vectorizer = CountVectorizer(stop_words="english")
+    resume_counts = vectorizer.fit_transform(cleaned_resumes).astype(np.float64)
+
+    # JD terms outside the resume vocabulary only matter for the JD norm
+    job_counts = np.zeros(len(vectorizer.vocabulary_))
+    for term, count in profile.term_counts.items():
+        index = vectorizer.vocabulary_.get(term)
+        if index is not None:
+            job_counts[index] = count
+
+    return _pairwise_tfidf_similarity(resume_counts, job_counts, profile.term_sq_total)
+
+
+def semantic_similarities(cleaned_resumes, profile: JobProfile):
+    """Embedding cosine similarity (0-100, negatives clipped) of each cleaned resume against a JD profile."""
+    vectors = semantic_encoder.encode(cleaned_resumes)
+    return np.maximum(0.0, cosine_similarities(vectors, profile.embedding)) * 100
+
+
+def semantic_cache_info():
+    return semantic_encoder.info() if HAS_EMBEDDINGS else {"backend": None}
+
+
+def score_resume_batch(resume_texts, job_text: str = None):
+    """
+    Score many resumes against one job description.
+
+    Produces the same result as calling score_resume() on every resume, but
+    the JD profile is resolved once, the resumes are embedded in one batch and
+    the TF-IDF similarity, keyword coverage and weighted score are computed as
+    arrays for the whole batch.
+
+    Returns:
+        List of score_resume() style dicts, aligned with resume_texts
+    """
+    results = [None] * len(resume_texts)
+    if not resume_texts:
+        return results
+
+    # Compiled JD (falls back to DEFAULT_JD when none provided)
+    profile = get_job_profile(job_text)
+
+    # 0. Validity Check
+    valid_indices = []
+    valid_resumes = []
+    section_hits = []
+    impact_counts = []
+    for i, resume_text in enumerate(resume_texts):
+        cleaned_resume = clean_text(resume_text)
+        is_valid, found_sections, missing_sections, impact_count = analyze_text(cleaned_resume)
+        if not is_valid:
+            results[i] = {
+                "error": "Invalid Document Type",
+                "message": "The uploaded document does not appear to be a resume. It resembles a question paper or other non-resume document."
+            }
+            continue
+        valid_indices.append(i)
+        valid_resumes.append(cleaned_resume)
+        section_hits.append((found_sections, missing_sections))
+        impact_counts.append(impact_count)
+
+    if not valid_resumes:
+        return results
+
+    n = len(valid_resumes)
+
+    # 1. Structural Analysis & 2. Impact Analysis (from the validity scan)
+    structure_scores = np.array([(len(found) / len(SECTIONS)) * 20 for found, _ in section_hits])
+    impact_scores = np.array([min(20, count * 4) for count in impact_counts])
+
+    # 3. Content Similarity (TF-IDF) over one sparse count matrix
+    try:
+        keyword_similarity_scores = tfidf_similarities(valid_resumes, profile) * 100
+    except ValueError:
+        keyword_similarity_scores = np.zeros(n)
+
+    # 4. Semantic Similarity (Embeddings), all resumes encoded in one batch
+    semantic_similarity_scores = np.zeros(n)
+    if HAS_EMBEDDINGS:
+        try:
+            semantic_similarity_scores = semantic_similarities(valid_resumes, profile)
+        except Exception as e:
+            print(f"Error calculating semantic similarity: {e}")
+
+    # 5. Keyword Coverage (Exact Matches) as a binary resume x keyword matrix
+    job_keywords = profile.keywords
+    if job_keywords:
+        coverage_vectorizer = CountVectorizer(
+            vocabulary=job_keywords, tokenizer=str.split, token_pattern=None, lowercase=False, binary=True
+        )
+        keyword_hits = coverage_vectorizer.transform(valid_resumes).tocsr()
+        coverage_scores = (np.asarray(keyword_hits.sum(axis=1)).ravel() / len(job_keywords)) * 100
+    else:
+        keyword_hits = None
+        coverage_scores = np.zeros(n)
+
+    # Weighted Final Score Calculation (same weights as score_resume)
+    final_scores = (
+        (semantic_similarity_scores * 0.3) +
+        (keyword_similarity_scores * 0.2) +
+        (coverage_scores * 0.15) +
+        structure_scores +
+        impact_scores
+    )
+    fallback_scores = (
+        (keyword_similarity_scores * 0.45) +
+        (coverage_scores * 0.20) +
+        structure_scores +
+        impact_scores
+    )
+    if not HAS_EMBEDDINGS:
+        final_scores = fallback_scores
+    else:
+        final_scores = np.where(semantic_similarity_scores == 0, fallback_scores, final_scores)
+
+    # Boost for decent non-empty resumes
+    lengths = np.array([len(text) for text in valid_resumes])
+    final_scores = np.where((lengths > 200) & (final_scores < 40), final_scores + 15, final_scores)
+    final_scores = np.minimum(98, final_scores)
+
+    for k, i in enumerate(valid_indices):
+        if keyword_hits is not None:
+            row = keyword_hits.getrow(k)
+            hit_columns = set(row.indices[row.data > 0])
+        else:
+            hit_columns = set()
+        matched = [kw for c, kw in enumerate(job_keywords) if c in hit_columns]
+        missing = [kw for c, kw in enumerate(job_keywords) if c not in hit_columns]
+        found_sections, missing_sections = section_hits[k]
+
+        results[i] = {
+            "final_score": int(final_scores[k]),
+            "breakdown": {
+                "semantic_match": int(semantic_similarity_scores[k]),
+                "keyword_match": int(keyword_similarity_scores[k]),
+                "coverage": int(coverage_scores[k]),
+                "structure": int(structure_scores[k]),
+                "impact": int(impact_scores[k])
+            },
+            "found_sections": found_sections,
+            "missing_sections": missing_sections,
+            "impact_count": impact_counts[k],
+            "matched_keywords": matched,
+            "missing_keywords": missing[:8]
+        }
+
+    return results
@@ -0,0 +1,167 @@
+import os
+import re
+from utils.resume_scorer import SECTIONS
+
+# Splits extracted resume text into the sections the multi-agent evaluators
+# look at, so each evaluator prompt carries its own section instead of the
+# whole resume. Headings are whole lines matching a known heading phrase, or
+# short title-like lines ending with one of the SECTIONS keywords used by the
+# ATS scorer; common sections such as summary or contact only end a span.
+
+SEGMENT_HEADINGS = {
+    **SECTIONS,
+    "Achievements": ["achievements", "awards", "honors", "honours", "accomplishments"],
+}
+EVALUATOR_SECTIONS = ("Skills", "Experience", "Projects", "Education", "Achievements")
+
+# Whole-line headings. A line is only a heading when all of it (minus
+# bullets, "#" and a trailing ":") is one of these phrases or passes the
+# stricter keyword rule in _heading_section.
+HEADING_PHRASES = {
+    "Education": [
+        "education", "academics", "academic background", "academic details", "academic qualifications",
+        "educational background", "educational qualifications", "education and training", "qualifications",
+    ],
+    "Experience": [
+        "experience", "work experience", "professional experience", "relevant experience", "employment",
+        "employment history", "work history", "career history", "internships", "internship experience",
+        "experience and internships", "work experience and internships",
+    ],
+    "Skills": [
+        "skills", "technical skills", "key skills", "core skills", "skill set", "skillset", "technologies",
+        "tech stack", "technical proficiencies", "proficiencies", "competencies", "core competencies",
+        "skills and tools", "tools and technologies", "skills and technologies",
+    ],
+    "Projects": [
+        "projects", "personal projects", "academic projects", "key projects", "selected projects",
+        "major projects", "project experience", "portfolio", "side projects",
+    ],
+    "Achievements": [
+        "achievements", "awards", "honors", "honours", "accomplishments", "awards and achievements",
+        "honors and awards", "awards and honors", "achievements and awards", "key achievements",
+    ],
+    # Headings that end a span without starting an evaluated one
+    "Other": [
+        "summary", "professional summary", "career summary", "objective", "career objective", "profile",
+        "professional profile", "about me", "contact", "contact information", "contact details",
+        "personal details", "personal information", "certifications", "certificates", "licenses and certifications",
+        "courses", "languages", "interests", "hobbies", "hobbies and interests", "references", "publications",
+        "volunteer", "volunteering", "volunteer experience", "extracurricular activities", "activities",
+        "leadership", "positions of responsibility",
+    ],
+}
+
+# Resume segmentation on/off (off: every evaluator gets the full text)
+RESUME_SEGMENTATION = os.environ.get("RESUME_SEGMENTATION", "1") not in ("0", "false", "False")
+# A span shorter than this is treated as missing and the evaluator gets the full text
+SEGMENT_MIN_CHARS = int(os.environ.get("RESUME_SEGMENT_MIN_CHARS", "40"))
+HEADING_MAX_WORDS = 4
+
+_PHRASE_SECTIONS = {phrase: section for section, phrases in HEADING_PHRASES.items() for phrase in phrases}
+# Keyword rule: the heading has to end with a section keyword ("Academic
+# Projects", "PROFESSIONAL EXPERIENCE"), so job titles such as "Technical
+# Lead" or "Full Stack Developer" and degrees such as "Master of Science" don't count
+_KEYWORD_PATTERNS = [
+    (section, re.compile(r"\b(?:%s)$" % "|".join(re.escape(kw) for kw in keywords)))
+    for section, keywords in SEGMENT_HEADINGS.items()
+]
+_MINOR_WORDS = {"and", "&", "of", "the", "for", "in"}
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough LLM token count (about four characters per token)."""
+    return (len(text) + 3) // 4
+
+
+def _normalize_heading(text: str) -> str:
+    text = text.strip().strip("-*•#|").strip().lower().replace("&", " and ")
+    return " ".join(text.split())
+
+
+def _looks_like_heading(text: str) -> bool:
+    # Title Case or UPPER CASE, as headings are written
+    words = [w for w in text.split() if w.lower() not in _MINOR_WORDS]
+    return bool(words) and (text.isupper() or all(w[0].isupper() for w in words if w[0].isalpha()))
+
+
+def _heading_section(line: str):
+    """
+    Return (section, inline_content) when the line is a section heading.
+
+    "Other" marks headings that end a span without starting an evaluated one.
+    A "label: value" line is a heading only when the label is an evaluated
+    section's heading phrase ("Skills: Python, SQL"), so lines such as
+    "Languages: Python, Java" inside a Skills section stay in it.
+    """
+    label, colon, inline = line.partition(":")
+    inline = inline.strip()
+    heading = _normalize_heading(label)
+    if not heading:
+        return None, ""
+
+    section = _PHRASE_SECTIONS.get(heading)
+    if section:
+        if inline and section == "Other":
+            return None, ""
+        return section, inline
+
+    # Keyword rule: a short title-like line on its own
+    raw = label.strip().strip("-*•#|").strip()
+    if (inline or "," in raw or any(char.isdigit() for char in raw)
+            or len(heading.split()) > HEADING_MAX_WORDS or not _looks_like_heading(raw)):
+        return None, ""
+    for section, pattern in _KEYWORD_PATTERNS:
+        if pattern.search(heading):
+            return section, ""
+    return None, ""
+
+
+class ResumeSegments:
+    """Per-section spans of one resume, with a fallback to the full text."""
+
+    def __init__(self, text: str, spans: dict):
+        self.text = text
+        self.spans = spans
+
+    def span(self, section: str) -> str:
+        """Text for one evaluator; the full resume when the section was not found."""
+        span = self.spans.get(section, "")
+        return span if len(span) >= SEGMENT_MIN_CHARS else self.text
+
+    def token_report(self) -> dict:
+        """Prompt tokens for the evaluators with full text vs segmented spans."""
+        full = estimate_tokens(self.text) * len(EVALUATOR_SECTIONS)
+        segmented = sum(estimate_tokens(self.span(section)) for section in EVALUATOR_SECTIONS)
+        return {
+            "full_tokens": full,
+            "segmented_tokens": segmented,
+            "reduction": round(1 - segmented / full, 3) if full else 0.0,
+            "sections_found": [s for s in EVALUATOR_SECTIONS if len(self.spans.get(s, "")) >= SEGMENT_MIN_CHARS],
+        }
+
+
+def segment_resume(text: str) -> ResumeSegments:
+    """
+    Split resume text into Education/Experience/Skills/Projects/Achievements spans.
+
+    Lines before the first heading and under unrelated headings (summary,
+    contact, ...) are not assigned to any evaluated section. With
+    RESUME_SEGMENTATION=0 no spans are produced, so every evaluator gets the
+    full text.
+    """
+    if not RESUME_SEGMENTATION:
+        return ResumeSegments(text, {})
+
+    spans = {}
+    current = None
+    for line in (text or "").splitlines():
+        section, inline = _heading_section(line)
+        if section:
+            current = section
+            line = inline
+            if not line:
+                continue
+        if current and current != "Other":
+            spans.setdefault(current, []).append(line)
+
+    return ResumeSegments(text, {section: "\n".join(lines).strip() for section, lines in spans.items()})
@@ -0,0 +1,74 @@
+import os
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+# Stage sizes for the shortlist pipeline. Downloads are network bound and can
+# overlap freely. The parse stage only dispatches: the PDF work itself runs on
+# the process pool in utils/pdf_engine.py, so it is not serialized by the GIL.
+IO_WORKERS = int(os.environ.get("SHORTLIST_IO_WORKERS", "16"))
+CPU_WORKERS = int(os.environ.get("SHORTLIST_CPU_WORKERS", str(os.cpu_count() or 1)))
+
+
+def _valid_entries(resumes):
+    entries = []
+    for index, resume in enumerate(resumes):
+        name = resume.get("name")
+        url = resume.get("resumeURL")
+        if not name or not url:
+            continue  # Skip invalid entries
+        entries.append((index, name, url))
+    return entries
+
+
+def iter_extracted_resumes(resumes, download, extract):
+    """
+    Run download -> extract for every resume entry as a two stage pipeline.
+
+    Args:
+        resumes: List of {"name", "resumeURL"} dicts from the request
+        download: Callable(url) -> bytes or None
+        extract: Callable(bytes) -> str, run on the bounded parse stage
+
+    Yields:
+        (index, name, url, content) tuples in completion order. Entries that
+        cannot be downloaded or yield no text are skipped.
+    """
+    entries = _valid_entries(resumes)
+    if not entries:
+        return
+
+    with ThreadPoolExecutor(max_workers=max(1, IO_WORKERS)) as io_pool, \
+            ThreadPoolExecutor(max_workers=max(1, CPU_WORKERS)) as parse_pool:
+        downloads = {io_pool.submit(download, url): (index, name, url) for index, name, url in entries}
+        parses = {}
+        pending = set(downloads)
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future in downloads:
+                    entry = downloads.pop(future)
+                    pdf_bytes = future.result()
+                    if not pdf_bytes:
+                        continue  # Skip if the file couldn't be downloaded
+
+                    # Hand the bytes to the parse stage as soon as they arrive
+                    parse_future = parse_pool.submit(extract, pdf_bytes)
+                    parses[parse_future] = entry
+                    pending.add(parse_future)
+                else:
+                    index, name, url = parses.pop(future)
+                    try:
+                        content = future.result()
+                    except Exception as e:
+                        print(f"Error extracting content from PDF: {e}")
+                        content = ""
+
+                    if not content:
+                        continue  # Skip if no content could be extracted
+
+                    yield index, name, url, content
+
+
+def extract_resumes(resumes, download, extract):
+    """Run the pipeline to completion and return results in request order."""
+    return sorted(iter_extracted_resumes(resumes, download, extract), key=lambda item: item[0])
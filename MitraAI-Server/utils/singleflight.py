@@ -0,0 +1,94 @@
+import json
+import hashlib
+import threading
+
+# Request coalescing: concurrent calls with the same key share one execution
+# and its result (or exception) instead of all doing the same work. Nothing is
+# kept after the call finishes; that is what the caches are for.
+
+
+def content_key(*parts) -> str:
+    """Stable key for JSON-serializable request content."""
+    payload = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Deduplicates concurrent calls per key; see do()."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._leaders = 0
+        self._coalesced = 0
+
+    def do(self, key, function, *args, **kwargs):
+        """
+        Run function(*args, **kwargs) unless a call with the same key is already
+        in flight, in which case wait for that call and return its result.
+
+        The returned object is shared by every coalesced caller, so treat it as
+        read-only. An exception of the leading call is raised in all of them.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self._leaders += 1
+            else:
+                self._coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = function(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def info(self):
+        with self._lock:
+            total = self._leaders + self._coalesced
+            return {
+                "executed": self._leaders,
+                "coalesced": self._coalesced,
+                "in_flight": len(self._calls),
+                "coalesced_rate": round(self._coalesced / total, 3) if total else 0.0,
+            }
+
+
+_groups = {}
+_groups_lock = threading.Lock()
+
+
+def singleflight(name: str) -> SingleFlight:
+    """Return the process-wide SingleFlight group called name."""
+    with _groups_lock:
+        group = _groups.get(name)
+        if group is None:
+            group = _groups[name] = SingleFlight(name)
+        return group
+
+
+def singleflight_info():
+    with _groups_lock:
+        groups = list(_groups.values())
+    return {group.name: group.info() for group in groups}
@@ -0,0 +1,199 @@
+import gc
+import os
+import sys
+import time
+import threading
+import importlib
+from contextlib import contextmanager
+
+# Cold-start helpers. Controllers are imported by their first request instead
+# of at app creation (scikit-learn, langchain and pdfplumber come in through
+# them), so an instance can answer light requests right after it boots.
+LAZY_IMPORTS = os.environ.get("LAZY_IMPORTS", "1") not in ("0", "false", "False")
+# Print import time, RSS growth and pulled-in packages of every startup phase
+# and lazy import
+STARTUP_PROFILE = os.environ.get("STARTUP_PROFILE", "0") in ("1", "true", "True")
+# Import every lazy controller in a background thread this many seconds after
+# the app is created (negative = no warm-up)
+STARTUP_WARMUP_DELAY = float(os.environ.get("STARTUP_WARMUP_DELAY", "-1"))
+# Preload-and-fork (gunicorn --preload, see gunicorn.conf.py): create_app()
+# imports every controller and builds the read-only scoring state in the
+# master, then freezes it so workers share the pages copy-on-write
+PRELOAD_SHARED_STATE = os.environ.get("PRELOAD_SHARED_STATE", "0") in ("1", "true", "True")
+
+_profile_lock = threading.Lock()
+_profile = []
+_lazy_views = []
+_preload_hooks = []
+_warm_lock = threading.Lock()
+_warmed = False
+_ready = threading.Event()
+
+
+def rss_mb():
+    """Resident set size of this process in MB (0 where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        return 0.0
+
+
+def process_age():
+    """Seconds since this process started (None where /proc is unavailable)."""
+    try:
+        with open("/proc/self/stat") as stat:
+            started = int(stat.read().rsplit(")", 1)[1].split()[19]) / os.sysconf("SC_CLK_TCK")
+        with open("/proc/uptime") as uptime:
+            return float(uptime.read().split()[0]) - started
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _top_level_packages(names):
+    # Third-party packages only; the standard library is not what makes a cold start slow
+    stdlib = getattr(sys, "stdlib_module_names", ())
+    packages = {name.split(".")[0] for name in names}
+    return sorted(p for p in packages if p not in stdlib and not p.startswith("_") and p not in ("app", "utils"))
+
+
+@contextmanager
+def profile_phase(label):
+    """Record the time, RSS growth and newly imported packages of a block."""
+    if not STARTUP_PROFILE:
+        yield
+        return
+
+    modules_before = set(sys.modules)
+    rss_before = rss_mb()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record = {
+            "phase": label,
+            "ms": round((time.perf_counter() - start) * 1000, 1),
+            "rss_mb": round(rss_mb() - rss_before, 1),
+            "modules": len(sys.modules) - len(modules_before),
+            "packages": _top_level_packages(set(sys.modules) - modules_before),
+        }
+        with _profile_lock:
+            _profile.append(record)
+        print(f"[startup] {label}: {record['ms']} ms, +{record['rss_mb']} MB RSS, "
+              f"{record['modules']} modules ({', '.join(record['packages'][:8]) or 'no new packages'})")
+
+
+def profiled_import(module_name):
+    if module_name in sys.modules:
+        return sys.modules[module_name]
+    with profile_phase(f"import {module_name}"):
+        return importlib.import_module(module_name)
+
+
+def startup_report():
+    """The profile so far, slowest phase first."""
+    with _profile_lock:
+        phases = sorted(_profile, key=lambda record: record["ms"], reverse=True)
+    age = process_age()
+    return {
+        "process_age_s": round(age, 2) if age is not None else None,
+        "rss_mb": round(rss_mb(), 1),
+        "modules": len(sys.modules),
+        "phases": phases,
+    }
+
+
+def lazy_view(module_name, name):
+    """
+    View function that imports module_name on its first call and then
+    forwards to module_name.name. The endpoint keeps the view's name.
+    """
+    view = None
+
+    def load():
+        nonlocal view
+        if view is None:
+            # The import lock makes concurrent first requests wait for one import
+            view = getattr(profiled_import(module_name), name)
+        return view
+
+    def lazy(*args, **kwargs):
+        return (view or load())(*args, **kwargs)
+
+    lazy.__name__ = name
+    lazy.load = load
+    _lazy_views.append(lazy)
+    if not LAZY_IMPORTS:
+        load()
+    return lazy
+
+
+def register_preload(label, function):
+    """
+    Register a builder of read-only state worth sharing between workers.
+
+    Modules register at import time; the builders run after the controllers
+    are imported, in the master under preload and in each worker otherwise.
+    Builders must not start threads or pools or open SQLite connections.
+    """
+    _preload_hooks.append((label, function))
+
+
+def warm_up():
+    """Import every lazy view's controller and build the registered shared state, once."""
+    global _warmed
+    with _warm_lock:
+        if _warmed:
+            return
+        with profile_phase("warm-up"):
+            for view in list(_lazy_views):
+                try:
+                    view.load()
+                except Exception as e:
+                    print(f"Warm-up of {view.__name__} failed: {e}")
+            for label, function in list(_preload_hooks):
+                try:
+                    with profile_phase(f"build {label}"):
+                        function()
+                except Exception as e:
+                    print(f"Building {label} failed: {e}")
+        _warmed = True
+        _ready.set()
+    if STARTUP_PROFILE:
+        report = startup_report()
+        print(f"[startup] warm-up done: process age {report['process_age_s']} s, {report['rss_mb']} MB RSS")
+
+
+def preload_shared_state():
+    """Warm up in the gunicorn master and move the result out of the GC's reach before fork."""
+    warm_up()
+    # Collected and frozen objects are never touched by the workers' GC
+    # passes, so their pages stay shared instead of being copied on write
+    gc.collect()
+    gc.freeze()
+    print(f"Preloaded shared state: {gc.get_freeze_count()} objects frozen, {rss_mb():.0f} MB RSS in the master")
+
+
+def start_warmup(delay=None):
+    """
+    Run warm_up() in a daemon thread after delay seconds (STARTUP_WARMUP_DELAY
+    by default). Without a warm-up there is nothing to wait for and the
+    instance is ready immediately.
+    """
+    delay = STARTUP_WARMUP_DELAY if delay is None else delay
+    if delay < 0:
+        _ready.set()
+        return None
+
+    def run():
+        time.sleep(delay)
+        warm_up()
+
+    thread = threading.Thread(target=run, name="startup-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+def is_ready():
+    """False while a scheduled warm-up (or preload) has not finished."""
+    return _ready.is_set()
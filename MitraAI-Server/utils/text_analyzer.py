@@ -0,0 +1,131 @@
+import re
+
+# Single-pass scanner for the ATS heuristics in utils/resume_scorer.py.
+#
+# Validation indicators, section keywords and impact metrics are compiled into
+# one regex whose top-level alternatives all start with a literal character,
+# so the regex engine skips positions that cannot start any pattern in C.
+# Keywords only consume their first character (the rest is a lookahead), so
+# overlapping keywords are still seen; metric matches consume their text
+# exactly like re.findall(METRICS_REGEX, ...) does.
+
+DIGITS = "0123456789"
+
+
+def keyword_trie_regex(words) -> str:
+    """Regex alternation of words factored into a prefix trie (longest match first)."""
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:%s)" % "|".join(branches)
+        return "(?:%s)?" % body if "" in node else body
+
+    return build(trie)
+
+
+def _metric_branches(metrics_regex: str) -> dict:
+    """
+    Split a flat "(alt|alt|...)" metrics regex into {first_char: [rest, ...]}.
+
+    Supported alternatives start with \\d+, an escaped character or a plain
+    character, which covers METRICS_REGEX.
+    """
+    body = metrics_regex
+    if body.startswith("(") and body.endswith(")"):
+        body = body[1:-1]
+
+    branches = {}
+    for alternative in body.split("|"):
+        if alternative.startswith(r"\d+"):
+            for digit in DIGITS:
+                branches.setdefault(digit, []).append(r"\d*" + alternative[3:])
+        elif alternative.startswith("\\") and not alternative[1].isalnum():
+            branches.setdefault(alternative[1], []).append(alternative[2:])
+        elif alternative and (alternative[0].isalnum() or alternative[0] == " "):
+            branches.setdefault(alternative[0], []).append(alternative[1:])
+        else:
+            raise ValueError(f"Unsupported metrics alternative: {alternative}")
+    return branches
+
+
+class TextAnalyzer:
+    """
+    Counts keyword groups and metric matches in cleaned text in one pass.
+
+    Args:
+        keyword_groups: {group_name: [keyword, ...]}; a keyword counts once
+            per list entry when it occurs anywhere in the text (substring match)
+        metrics_regex: Metrics pattern whose re.findall() count is reported
+    """
+
+    def __init__(self, keyword_groups: dict, metrics_regex: str):
+        self.keyword_groups = {name: list(words) for name, words in keyword_groups.items()}
+        keywords = sorted(set(word for words in self.keyword_groups.values() for word in words))
+
+        # The scan reports the longest keyword at each position; shorter
+        # keywords that are its prefixes occur there too
+        self._prefixes = {word: [other for other in keywords if word.startswith(other)] for word in keywords}
+
+        keyword_rests = {}
+        for word in keywords:
+            keyword_rests.setdefault(word[0], []).append(word[1:])
+        metric_rests = _metric_branches(metrics_regex)
+
+        # Metrics come first within a character so they win a shared start,
+        # as they would in a plain findall
+        branches = []
+        for char in sorted(set(keyword_rests) | set(metric_rests)):
+            parts = list(metric_rests.get(char, []))
+            if char in keyword_rests:
+                parts.append("(?=(%s))" % keyword_trie_regex(keyword_rests[char]))
+            branches.append(re.escape(char) + (parts[0] if len(parts) == 1 else "(?:%s)" % "|".join(parts)))
+        self._scanner = re.compile("|".join(branches))
+
+        # Keywords that start inside a consumed metric are picked up by a
+        # bounded search over the metric's span
+        self._keyword_search = re.compile("|".join(
+            re.escape(char) + "(?=(%s))" % keyword_trie_regex(rests) for char, rests in sorted(keyword_rests.items())
+        )).search
+        self._max_keyword_len = max((len(word) for word in keywords), default=0)
+
+    def scan(self, cleaned_text: str):
+        """Return (set of keywords present, number of metric matches)."""
+        found = set()
+        metric_count = 0
+        prefixes = self._prefixes
+
+        for match in self._scanner.finditer(cleaned_text):
+            group = match.lastindex
+            if group is not None:
+                found.update(prefixes[cleaned_text[match.start()] + match.group(group)])
+                continue
+
+            metric_count += 1
+            position, end = match.start(), match.end()
+            limit = end + self._max_keyword_len
+            while True:
+                keyword = self._keyword_search(cleaned_text, position, limit)
+                if keyword is None or keyword.start() >= end:
+                    break
+                position = keyword.start()
+                found.update(prefixes[cleaned_text[position] + keyword.group(keyword.lastindex)])
+                position += 1
+
+        return found, metric_count
+
+    def analyze(self, cleaned_text: str):
+        """Return ({group_name: keywords present}, number of metric matches)."""
+        found, metric_count = self.scan(cleaned_text)
+        counts = {
+            name: sum(1 for word in words if word in found)
+            for name, words in self.keyword_groups.items()
+        }
+        return counts, metric_count
@@ -0,0 +1,228 @@
+import os
+import json
+import hashlib
+import threading
+from contextlib import contextmanager
+import numpy as np
+from utils.disk_cache import CACHE_DIR
+from utils import resume_scorer
+from utils.resume_scorer import clean_text
+
+try:
+    import fcntl
+except ImportError:  # Windows: single-process development servers only
+    fcntl = None
+
+# One directory per embedding backend, since vectors of different backends don't mix
+RESUME_VECTORS_DIR = os.environ.get("RESUME_VECTORS_DIR", os.path.join(CACHE_DIR, "resume_vectors"))
+
+
+class VectorStore:
+    """
+    Append-only matrix of float32 unit vectors on disk with an id sidecar.
+
+    vectors.f32 holds the rows back to back and is read through a read-only
+    np.memmap, so every process using the store (gunicorn workers included)
+    shares one copy of it in the page cache. ids.jsonl has one [key,
+    text_hash] line per row. Re-adding a key with new text appends a row and
+    the newest row of a key wins; unchanged texts are skipped. Appends from
+    several processes are serialized with an flock and picked up by the
+    others on their next read.
+    """
+
+    def __init__(self, directory: str, dim: int):
+        self.directory = directory
+        self.dim = dim
+        self.vectors_path = os.path.join(directory, "vectors.f32")
+        self.ids_path = os.path.join(directory, "ids.jsonl")
+        self.lock_path = os.path.join(directory, "lock")
+        self._lock = threading.RLock()
+        self._keys = []            # row -> key
+        self._latest = {}          # key -> (row, text_hash)
+        self._ids_offset = 0       # bytes of ids.jsonl already read
+        self._matrix = np.empty((0, dim), dtype=np.float32)
+        self._live = np.zeros(0, dtype=bool)
+        os.makedirs(directory, exist_ok=True)
+
+    @contextmanager
+    def _file_lock(self):
+        if fcntl is None:
+            yield
+            return
+        with open(self.lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def refresh(self):
+        """Pick up rows appended since the last read (by any process)."""
+        with self._lock:
+            try:
+                size = os.path.getsize(self.ids_path)
+            except OSError:
+                return
+            if size <= self._ids_offset:
+                return
+
+            with open(self.ids_path, "rb") as ids:
+                ids.seek(self._ids_offset)
+                data = ids.read(size - self._ids_offset)
+            # Only complete lines; a half-written one is read next time
+            data = data[:data.rfind(b"\n") + 1]
+            if not data:
+                return
+            self._ids_offset += len(data)
+
+            first_new = len(self._keys)
+            for key, text_hash in _parse_ids(data):
+                if key is not None:
+                    previous = self._latest.get(key)
+                    self._latest[key] = (len(self._keys), text_hash)
+                    if previous is not None and previous[0] < first_new:
+                        self._live[previous[0]] = False
+                self._keys.append(key)
+
+            # Vectors are written before their ids, so these rows are complete
+            rows = len(self._keys)
+            self._matrix = np.asarray(np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(rows, self.dim)))
+            live = np.zeros(rows, dtype=bool)
+            live[:first_new] = self._live
+            # A new row is live unless a later new row replaced it
+            live[first_new:] = [key is not None and self._latest[key][0] == row
+                                 for row, key in enumerate(self._keys[first_new:], first_new)]
+            self._live = live
+
+    def __len__(self):
+        self.refresh()
+        with self._lock:
+            return len(self._latest)
+
+    def stale(self, keys, text_hashes):
+        """Positions of the (key, text_hash) pairs that are missing or out of date."""
+        self.refresh()
+        with self._lock:
+            return [i for i, (key, text_hash) in enumerate(zip(keys, text_hashes))
+                    if self._latest.get(key, (None, None))[1] != text_hash]
+
+    def append(self, keys, text_hashes, vectors):
+        """Append one row per key; the matrix file is only ever extended."""
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32).reshape(len(keys), self.dim)
+        if not len(keys):
+            return
+        with self._lock, self._file_lock():
+            self.refresh()
+            # Drop torn tails left by a writer that died mid-append: rows past
+            # the last complete id line and a half-written id line
+            with open(self.vectors_path, "ab") as out:
+                out.truncate(len(self._keys) * self.dim * 4)
+                out.write(vectors.tobytes())
+            if os.path.exists(self.ids_path):
+                with open(self.ids_path, "r+b") as ids:
+                    ids.truncate(self._ids_offset)
+            lines = "".join(json.dumps([key, text_hash]) + "\n" for key, text_hash in zip(keys, text_hashes))
+            with open(self.ids_path, "ab") as ids:
+                ids.write(lines.encode("utf-8"))
+            self.refresh()
+
+    def search(self, query, k: int, keys=None):
+        """
+        Top k rows by dot product with query (cosine for unit vectors).
+
+        Args:
+            query: Vector of length dim
+            k: Number of results
+            keys: Optional collection of keys to restrict the search to
+
+        Returns:
+            List of (key, score) pairs, best first
+        """
+        self.refresh()
+        with self._lock:
+            matrix, row_keys = self._matrix, self._keys
+            if keys is not None:
+                rows = np.array(sorted(self._latest[key][0] for key in set(keys) if key in self._latest), dtype=np.int64)
+            else:
+                rows = np.flatnonzero(self._live)
+        if k <= 0 or not len(rows):
+            return []
+
+        query = np.asarray(query, dtype=np.float32)
+        if len(rows) * 4 >= len(matrix):
+            # One matrix-vector product over all memory-mapped rows
+            scores = (matrix @ query)[rows]
+        else:
+            # A small subset: gather its rows first
+            scores = matrix[rows] @ query
+
+        k = min(k, len(rows))
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best], kind="stable")]
+        return [(row_keys[rows[i]], float(scores[i])) for i in best]
+
+    def info(self):
+        self.refresh()
+        with self._lock:
+            rows = len(self._keys)
+            return {
+                "dim": self.dim,
+                "rows": rows,
+                "live": len(self._latest),
+                "bytes": rows * self.dim * 4,
+            }
+
+
+def _parse_ids(data: bytes):
+    """[key, text_hash] pairs of complete sidecar lines; (None, None) for a corrupt line."""
+    try:
+        # All lines in one decoder call: one JSON array of pairs
+        return json.loads(b"[" + data[:-1].replace(b"\n", b",") + b"]")
+    except ValueError:
+        pass
+    entries = []
+    for line in data.splitlines():
+        try:
+            key, text_hash = json.loads(line)
+            entries.append((key, text_hash))
+        except (ValueError, TypeError):
+            # Keeps the row numbering; the row is never returned
+            print(f"Skipping corrupt vector store id line: {line[:80]!r}")
+            entries.append((None, None))
+    return entries
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+_resume_vectors = None
+_resume_vectors_lock = threading.Lock()
+
+
+def get_resume_vectors():
+    """The resume store for the current embedding backend (None when semantic scoring is off)."""
+    global _resume_vectors
+    if not resume_scorer.HAS_EMBEDDINGS:
+        return None
+    with _resume_vectors_lock:
+        if _resume_vectors is None:
+            backend = resume_scorer.semantic_backend
+            _resume_vectors = VectorStore(os.path.join(RESUME_VECTORS_DIR, backend.name), backend.dim)
+        return _resume_vectors
+
+
+def index_resumes(store: VectorStore, items):
+    """
+    Add (key, resume_text) pairs to the store, encoding only new or changed
+    texts, in one batch.
+    """
+    # A key listed twice is stored once, with its last text
+    items = list(dict(items).items())
+    keys = [key for key, _ in items]
+    hashes = [text_hash(text) for _, text in items]
+    stale = store.stale(keys, hashes)
+    if stale:
+        vectors = resume_scorer.semantic_encoder.encode([clean_text(items[i][1]) for i in stale])
+        store.append([keys[i] for i in stale], [hashes[i] for i in stale], vectors)
+    return len(stale)
@@ -1,21 +1,42 @@
 import os
 import json
-from google.oauth2 import service_account
 # from langchain_google_vertexai import VertexAI
 from flask import current_app
+from utils.llm_cache import cached_client
+from utils.llm_dispatch import BatchPromptMixin
+from utils.mock_llm import SimulatedBackend, MockLLMError, MockRateLimitError
 
-class MockVertexAIClient:
-    def __init__(self, model_name: str):
+# Point the fallback client at a running utils/mock_llm_server.py instead of the
+# in-process mock, e.g. MOCK_LLM_URL=http://127.0.0.1:8089
+MOCK_LLM_URL = os.environ.get("MOCK_LLM_URL")
+MOCK_LLM_HTTP_TIMEOUT = float(os.environ.get("MOCK_LLM_HTTP_TIMEOUT", "300"))
+
+class MockVertexAIClient(BatchPromptMixin):
+    def __init__(self, model_name: str, backend: SimulatedBackend = None):
         self.model_name = model_name
+        # Latency, streaming and failure injection (MOCK_LLM_* settings, off by default)
+        self.backend = backend or SimulatedBackend()
         print(f"Initialized MockVertexAIClient with model: {model_name}")
 
     def send_prompt(self, prompt: str) -> str:
         """Return a mock response."""
         print(f"MockVertexAI received prompt of length: {len(prompt)}")
+        return self.backend.generate(self.canned_response(prompt))
+
+    def stream_prompt(self, prompt: str):
+        """Yield the mock response token by token at MOCK_LLM_TOKENS_PER_SECOND."""
+        print(f"MockVertexAI streaming prompt of length: {len(prompt)}")
+        return self.backend.stream(self.canned_response(prompt))
+
+    def canned_response(self, prompt: str) -> str:
         # Check if the prompt asks for JSON score (heuristic)
         if "ATS_SCORE" in prompt:
              return '```json\n{\n    "score": 85\n}\n```'
         
+        # Combined multi-criteria evaluation (utils/evaluate_combined.py)
+        if '"achievements": <SCORE>' in prompt:
+             return '```json\n{\n    "skills": 85,\n    "experience": 85,\n    "projects": 85,\n    "education": 85,\n    "achievements": 85\n}\n```'
+
         if "technical_questions" in prompt:
             return '''```json
 {
@@ -85,6 +106,46 @@ class MockVertexAIClient:
 
         return "This is a mock response from Mitra AI (Vertex AI not configured). Please configure GCP credentials to get real AI responses."
 
+
+class RemoteMockLLMClient(BatchPromptMixin):
+    """Client for utils/mock_llm_server.py; 429/503 answers raise like the in-process mock."""
+
+    def __init__(self, base_url: str, model_name: str):
+        # Only this client needs requests; keep it off the startup path
+        import requests
+
+        self.base_url = base_url.rstrip("/")
+        self.model_name = model_name
+        self.session = requests.Session()
+        print(f"Initialized RemoteMockLLMClient for {self.base_url} with model: {model_name}")
+
+    def _post(self, path: str, prompt: str, stream: bool = False):
+        response = self.session.post(
+            f"{self.base_url}{path}",
+            json={"model": self.model_name, "prompt": prompt},
+            timeout=MOCK_LLM_HTTP_TIMEOUT,
+            stream=stream,
+        )
+        if response.status_code == 429:
+            raise MockRateLimitError(response.json().get("error", "Mock LLM server rate limited the call"))
+        if response.status_code != 200:
+            raise MockLLMError(f"Mock LLM server returned {response.status_code}: {response.text[:200]}")
+        return response
+
+    def send_prompt(self, prompt: str) -> str:
+        return self._post("/v1/generate", prompt).json()["text"]
+
+    def stream_prompt(self, prompt: str):
+        with self._post("/v1/stream", prompt, stream=True) as response:
+            for line in response.iter_lines():
+                if line:
+                    event = json.loads(line)
+                    if "error" in event:
+                        raise MockLLMError(event["error"])
+                    if event.get("done"):
+                        return
+                    yield event["token"]
+
 def init_vertex_ai(app, model_name: str, credentials):
     """Initialize the Vertex AI client and store it in the Flask app context."""
     try:
@@ -96,8 +157,12 @@ def init_vertex_ai(app, model_name: str, credentials):
         raise ValueError("Forced Mock Enabled")
     except Exception as e:
         print(f"Error during Vertex AI client initialization: {str(e)}")
-        print("Falling back to MockVertexAIClient...")
-        app.config['VERTEX_CLIENT'] = MockVertexAIClient(model_name)
+        if MOCK_LLM_URL:
+            print(f"Falling back to mock LLM server at {MOCK_LLM_URL}...")
+            app.config['VERTEX_CLIENT'] = cached_client(RemoteMockLLMClient(MOCK_LLM_URL, model_name))
+        else:
+            print("Falling back to MockVertexAIClient...")
+            app.config['VERTEX_CLIENT'] = cached_client(MockVertexAIClient(model_name))
 
 
 def get_vertex_client():
@@ -108,6 +173,9 @@ def get_vertex_client():
     return client
 
 def start_vertex(app):
+    # google-auth is only needed here, not on every import of this module
+    from google.oauth2 import service_account
+
     service_account_path = "./gcp_cred.json"
 
     # Set the GOOGLE_APPLICATION_CREDENTIALS environment variable